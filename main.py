@@ -1,51 +1,306 @@
-from tabulate import tabulate  # type: ignore
+import argparse
+import cProfile
+import os
+import signal
+import sys
+from typing import List, Union
 
-from src.cli import parse_arguments, validate_arguments
+from src.cache import ParsedCache
+from src.cli import (
+    parse_arguments,
+    parse_index_arguments,
+    parse_serve_arguments,
+    validate_arguments,
+)
+from src.columnar import ColumnarData
 from src.data_reader import DataReader
-from src.report_type import generate_report
+from src.engines import get_engine
+from src.filters import RowFilter
+from src.incremental import run_incremental
+from src.index import IndexedDataReader, answer_from_index, index_path, write_index
+from src.output import Renderer, create_renderer
+from src.planner import run_reports
+from src.profiling import NullProfiler, Profiler
+from src.rejects import RejectLog
+from src.report_type import generate_report, required_fields
+from src.reports.base import EconomicData, ReportOptions
+from src.spill import SpillingAggregator
+from src.streaming import ReportOutcome
 
 
-def main() -> None:
+def print_outcomes(
+    outcomes: List[ReportOutcome], renderer: Renderer, profiler: Profiler
+) -> None:
+    for ReportClass, outcome in outcomes:
+        if isinstance(outcome, Exception):
+            renderer.message(
+                f"Ошибка при генерации отчёта {ReportClass.__name__}: {outcome}"
+            )
+            continue
+        if not outcome:
+            renderer.message(f"Отчёт {ReportClass.__name__} не содержит данных.")
+            continue
+        with profiler.stage(f"render:{ReportClass.__name__}"):
+            renderer.write(ReportClass, outcome)
 
-    args = parse_arguments()
-    validate_arguments(args)
 
-    data_reader = DataReader()
+def run(args: argparse.Namespace, profiler: Profiler) -> None:
     try:
-        data = data_reader.read_all_files(file_paths=args.files)
-    except Exception as e:
-        print(f"Ошибка при чтении файлов: {e}")
+        renderer = create_renderer(args.output, args.output_file)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка вывода: {e}")
         return
+    with renderer:
+        try:
+            reject_log = RejectLog(args.reject_file if args.on_error == "log" else None)
+        except OSError as e:
+            renderer.message(f"Ошибка записи отброшенных строк: {e}")
+            return
+        try:
+            generate(args, renderer, profiler, reject_log)
+        finally:
+            reject_log.close()
+        report_rejects(args, reject_log, renderer, profiler)
 
-    if not data:
-        print("Нет данных для обработки.")
+
+# Итог по отброшенным строкам выводится после отчётов, чтобы не
+# смешиваться с ними в машиночитаемых форматах.
+def report_rejects(
+    args: argparse.Namespace,
+    reject_log: RejectLog,
+    renderer: Renderer,
+    profiler: Profiler,
+) -> None:
+    profiler.count("rows_rejected", reject_log.total)
+    if not reject_log.total:
         return
+    renderer.message(reject_log.summary())
+    if reject_log.path:
+        renderer.message(f"Отброшенные строки записаны в {reject_log.path}")
 
+
+def generate(
+    args: argparse.Namespace,
+    renderer: Renderer,
+    profiler: Profiler,
+    reject_log: RejectLog,
+) -> None:
+    cache = None if args.no_cache else ParsedCache(args.cache_dir, args.cache_size)
     report_classes = generate_report(args.report)
+    if args.parallel_reports and len(set(report_classes)) < 2:
+        renderer.message(
+            "--parallel-reports не действует: запрошен один отчёт, он считается "
+            "в основном процессе."
+        )
+    reader_class = DataReader if args.no_index else IndexedDataReader
+    data_reader = reader_class(
+        workers=args.workers,
+        cache=cache,
+        use_mmap=args.mmap,
+        async_io=args.async_io,
+        concurrency=args.concurrency,
+        fields=required_fields(report_classes),
+        row_filter=RowFilter(args.years, args.countries, args.continents),
+        on_error=args.on_error,
+        reject_log=reject_log,
+    )
+    engine = get_engine(args.engine)
+    options: ReportOptions = {}
+    if args.top:
+        options["top"] = args.top
+    if args.bottom:
+        options["bottom"] = args.bottom
+    if args.approx:
+        options["approx"] = True
+    profiler.count("files", len(args.files))
 
-    for ReportClass in report_classes:
-        report = ReportClass()
+    if not args.no_index and not args.state and not args.approx:
+        with profiler.stage("index"):
+            outcomes = answer_from_index(
+                args.files, report_classes, data_reader.row_filter, options
+            )
+        if outcomes is not None:
+            # Ответ по индексу читает только файлы индексов.
+            profiler.count(
+                "bytes_read", sum(_file_size(index_path(path)) for path in args.files)
+            )
+            print_outcomes(outcomes, renderer, profiler)
+            return
+
+    if args.stream or args.state or args.memory_limit or args.approx:
+        aggregator = None
+        # Строки читаются по мере подачи в отчёты: время делится на этап
+        # read и этапы generate отдельных отчётов.
         try:
-            report_data = report.generate(data)
+            if args.state:
+                outcomes = run_incremental(
+                    data_reader,
+                    args.files,
+                    report_classes,
+                    args.state,
+                    options,
+                    profiler,
+                )
+            else:
+                source = (
+                    data_reader.iter_sample(args.files, args.approx, args.seed)
+                    if args.approx
+                    else data_reader.iter_rows(file_paths=args.files)
+                )
+                rows = profiler.counted(source, "rows_read")
+                if args.memory_limit and not args.approx:
+                    aggregator = SpillingAggregator(args.memory_limit)
+                    outcomes = aggregator.run(rows, report_classes, options, profiler)
+                else:
+                    outcomes = run_reports(
+                        rows, report_classes, profiler=profiler, options=options
+                    )
         except Exception as e:
-            print(f"Ошибка при генерации отчёта {ReportClass.__name__}: {e}")
-            continue
+            renderer.message(f"Ошибка при чтении файлов: {e}")
+            return
+        finally:
+            profiler.count("bytes_read", data_reader.bytes_read)
+        if aggregator is not None:
+            profiler.count("spill_runs", aggregator.runs)
+
+        print_outcomes(outcomes, renderer, profiler)
+        if args.approx:
+            renderer.message(
+                "Приближённый расчёт по выборке: ci95 — полуширина "
+                "95% доверительного интервала для среднего."
+            )
+        return
+
+    data: Union[EconomicData, ColumnarData]
+    try:
+        with profiler.stage("read"):
+            if args.columnar or args.parallel_reports or args.engine != "python":
+                data = data_reader.read_columnar(file_paths=args.files)
+            else:
+                data = data_reader.read_all_files(file_paths=args.files)
+    except Exception as e:
+        renderer.message(f"Ошибка при чтении файлов: {e}")
+        return
+    finally:
+        profiler.count("bytes_read", data_reader.bytes_read)
+
+    if isinstance(data, ColumnarData):
+        profiler.count("rows_read", len(data))
+    else:
+        profiler.count("rows_read", sum(map(len, data.values())))
+
+    if not data:
+        renderer.message("Нет данных для обработки.")
+        return
+
+    outcomes = run_reports(
+        data,
+        report_classes,
+        engine,
+        profiler,
+        parallel=args.parallel_reports,
+        options=options,
+    )
+    print_outcomes(outcomes, renderer, profiler)
 
-        if not report_data:
-            print(f"Отчёт {ReportClass.__name__} не содержит данных.")
-            continue
 
-        print(f"\n--- Отчёт: {ReportClass.__name__.replace('Report', '')} ---")
+def _file_size(file_path: str) -> int:
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+
+def build_indexes(argv: List[str]) -> None:
+    args = parse_index_arguments(argv)
+    for file_path in args.files:
+        try:
+            index = write_index(file_path, args.block_size)
+        except FileNotFoundError:
+            print(f"Файл не найден: {file_path}")
+            continue
+        except Exception as e:
+            print(f"Ошибка при построении индекса {file_path}: {e}")
+            continue
         print(
-            tabulate(
-                report_data,
-                headers="keys",
-                tablefmt="github",
-                floatfmt=".2f",
-                showindex=range(1, len(report_data) + 1),
-            )
+            f"Индекс {index_path(file_path)}: блоков {len(index['blocks'])}, "
+            f"групп {len(index['groups'])}"
         )
 
 
+def serve(argv: List[str]) -> None:
+    # Модуль сервера тянет http.server, который обычному запуску не нужен.
+    from src.server import Dataset, ReportServer, UnixReportServer, Watcher
+
+    args = parse_serve_arguments(argv)
+    dataset = Dataset(args.files, DataReader)
+    try:
+        dataset.load()
+    except FileNotFoundError as e:
+        print(f"Файл не найден: {e.filename}")
+        return
+    except Exception as e:
+        print(f"Ошибка при чтении файлов: {e}")
+        return
+
+    engine = get_engine(args.engine)
+    server: Union[ReportServer, UnixReportServer]
+    if args.socket:
+        if UnixReportServer is None:
+            print("Unix-сокеты не поддерживаются на этой платформе")
+            return
+        server = UnixReportServer(args.socket, dataset, engine, args.verbose)
+        address = args.socket
+    else:
+        server = ReportServer((args.host, args.port), dataset, engine, args.verbose)
+        address = f"http://{args.host}:{server.server_port}"
+
+    watcher = Watcher(dataset, args.poll)
+    if args.poll > 0:
+        watcher.start()
+    print(f"Сервер отчётов: {address}, строк {len(dataset.store)}")
+    # По SIGTERM сервер завершается так же, как по Ctrl+C, с удалением сокета.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+
+
+def main() -> None:
+    if sys.argv[1:2] == ["index"]:
+        build_indexes(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["serve"]:
+        serve(sys.argv[2:])
+        return
+
+    args = parse_arguments()
+    validate_arguments(args)
+
+    if args.profile is None:
+        run(args, NullProfiler())
+        return
+
+    profiler = Profiler()
+    if args.profile == "cprofile":
+        with cProfile.Profile() as stats:
+            run(args, profiler)
+        stats.dump_stats(args.profile_output)
+        print(f"Профиль cProfile сохранён в {args.profile_output}", file=sys.stderr)
+    else:
+        run(args, profiler)
+
+    if args.profile == "json":
+        print(profiler.to_json(), file=sys.stderr)
+    else:
+        print(profiler.summary(), file=sys.stderr)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,146 @@
+import os
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.columnar import CONTINENTS, COUNTRIES, interner
+from src.filters import YearRange
+from src.reports.base import ECONOMIC_FIELDS, EconomicRecord
+
+ARROW_FORMATS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".ipc": "feather",
+}
+
+KEY_FIELDS = ("country", "year")
+
+
+def arrow_format(file_path: str) -> Optional[str]:
+    return ARROW_FORMATS.get(os.path.splitext(file_path)[1].lower())
+
+
+# pyarrow импортируется только при чтении Parquet/Feather: его импорт
+# заметно удлиняет запуск, а для CSV он не нужен.
+@lru_cache(maxsize=None)
+def _pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.compute  # noqa: F401
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:  # pragma: no cover - зависит от окружения
+        return None
+    return pyarrow
+
+
+def _columns(names: Sequence[str], fields: Sequence[str]) -> List[str]:
+    columns = list(dict.fromkeys((*KEY_FIELDS, *fields)))
+    for name in columns:
+        if name not in names:
+            raise KeyError(f"Отсутствует ожидаемый столбец в данных: '{name}'")
+    return columns
+
+
+def _outside(low: Any, high: Any, years: YearRange) -> bool:
+    first, last = years
+    return (first is not None and high < first) or (last is not None and low > last)
+
+
+def _year_mask(batch: Any, years: YearRange) -> Any:
+    pc = _pyarrow().compute
+    first, last = years
+    column = batch.column("year")
+    mask = None
+    if first is not None:
+        mask = pc.greater_equal(column, first)
+    if last is not None:
+        upper = pc.less_equal(column, last)
+        mask = upper if mask is None else pc.and_(mask, upper)
+    return mask
+
+
+def _parquet_batches(
+    file_path: str, fields: Sequence[str], years: Optional[YearRange]
+) -> Iterator[Any]:
+    parquet = _pyarrow().parquet.ParquetFile(file_path)
+    columns = _columns(parquet.schema_arrow.names, fields)
+    year_index = parquet.schema_arrow.get_field_index("year")
+    metadata = parquet.metadata
+
+    for index in range(metadata.num_row_groups):
+        # Группы строк, которые по статистике целиком вне диапазона лет,
+        # пропускаются без чтения.
+        stats = metadata.row_group(index).column(year_index).statistics
+        if years and stats is not None and stats.has_min_max:
+            if _outside(stats.min, stats.max, years):
+                continue
+        yield from parquet.read_row_group(index, columns=columns).to_batches()
+
+
+def _feather_batches(file_path: str, fields: Sequence[str]) -> Iterator[Any]:
+    # IPC-файл отображается в память, поэтому выбор столбцов не копирует данные.
+    pa = _pyarrow()
+    with pa.memory_map(file_path, "r") as source:
+        reader = pa.ipc.open_file(source)
+        columns = _columns(reader.schema.names, fields)
+        for index in range(reader.num_record_batches):
+            yield reader.get_batch(index).select(columns)
+
+
+# Чтение Parquet и Arrow IPC (Feather): читаются только нужные отчётам
+# столбцы, фильтр по годам отбрасывает группы строк по статистике и
+# строки по значению. Результат — те же пары (страна, запись), что и
+# при разборе CSV.
+def scan_arrow(
+    file_path: str,
+    fields: Sequence[str] = ECONOMIC_FIELDS,
+    years: Optional[YearRange] = None,
+) -> Iterator[Tuple[str, EconomicRecord]]:
+    file_format = arrow_format(file_path)
+    if _pyarrow() is None:
+        raise ValueError(f"Для чтения файлов {file_format} требуется пакет pyarrow")
+    if years == (None, None):
+        years = None
+
+    if file_format == "parquet":
+        batches = _parquet_batches(file_path, fields, years)
+    else:
+        batches = _feather_batches(file_path, fields)
+
+    converters: List[Tuple[str, Callable[[Any], Any]]] = [
+        (field, int if field == "population" else float)
+        for field in fields
+        if field not in ("year", "continent")
+    ]
+    for batch in batches:
+        if years:
+            batch = batch.filter(_year_mask(batch, years))
+        yield from _batch_rows(batch.to_pydict(), converters, "continent" in fields)
+
+
+def _batch_rows(
+    columns: Dict[str, List[Any]],
+    converters: List[Tuple[str, Callable[[Any], Any]]],
+    continent: bool,
+) -> Iterator[Tuple[str, EconomicRecord]]:
+    country_name = interner(COUNTRIES)
+    continent_name = interner(CONTINENTS)
+    for index, country in enumerate(columns["country"]):
+        entry: EconomicRecord = {
+            "year": int(columns["year"][index]),
+            "gdp": None,
+            "gdp_growth": None,
+            "inflation": None,
+            "unemployment": None,
+            "population": None,
+            "continent": (
+                continent_name(columns["continent"][index] or "") if continent else ""
+            ),
+        }
+        for field, convert in converters:
+            value = columns[field][index]
+            if value is not None:
+                entry[field] = convert(value)  # type: ignore
+        yield country_name(country), entry
@@ -0,0 +1,266 @@
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Type
+
+from src.data_reader import DataReader
+from src.report_type import AVAILABLE_REPORTS
+from src.reports.base import BaseReport, StreamingReport
+
+CONTINENTS = ["Africa", "Asia", "Europe", "North America", "Oceania", "South America"]
+
+HEADER = "country,year,gdp,gdp_growth,inflation,unemployment,population,continent\n"
+
+WRITE_BATCH = 10_000
+
+MODES = ["memory", "stream"]
+
+
+def generate_csv(
+    file_path: str,
+    rows: int,
+    countries: int = 200,
+    null_rate: float = 0.05,
+    seed: int = 0,
+) -> None:
+    rng = random.Random(seed)
+    names = [f"Country{index:05d}" for index in range(countries)]
+    continents = [CONTINENTS[index % len(CONTINENTS)] for index in range(countries)]
+    base_gdp = [rng.uniform(10, 30000) for _ in range(countries)]
+
+    def optional(value: str) -> str:
+        return "" if rng.random() < null_rate else value
+
+    with open(file_path, "w", encoding="utf-8", newline="") as f:
+        f.write(HEADER)
+        batch: List[str] = []
+        for index in range(rows):
+            code = rng.randrange(countries)
+            values = (
+                names[code],
+                str(1960 + index % 64),
+                optional(f"{base_gdp[code] * rng.uniform(0.8, 1.2):.2f}"),
+                optional(f"{rng.uniform(-5, 10):.1f}"),
+                optional(f"{rng.uniform(-1, 15):.1f}"),
+                optional(f"{rng.uniform(1, 25):.1f}"),
+                optional(str(rng.randrange(100_000, 1_500_000_000))),
+                continents[code],
+            )
+            batch.append(",".join(values) + "\n")
+            if len(batch) == WRITE_BATCH:
+                f.writelines(batch)
+                batch.clear()
+        f.writelines(batch)
+
+
+def _vm_hwm_kb() -> Optional[int]:
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss() -> None:
+    # ru_maxrss — максимум за всю жизнь процесса (и переживает fork/exec),
+    # поэтому замеры после первого наследовали бы его пик. В Linux пик
+    # сбрасывается записью "5" в clear_refs и читается из VmHWM.
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _ru_maxrss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux отдаёт килобайты, macOS — байты.
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return peak / divisor
+
+
+def peak_rss_mb() -> float:
+    # Пиковый RSS процесса с последнего reset_peak_rss. Где пик не
+    # сбрасывается (нет /proc), это пик с запуска процесса — оценка сверху.
+    hwm = _vm_hwm_kb()
+    if hwm is not None:
+        return round(hwm / 1024, 1)
+    return round(_ru_maxrss_mb(), 1)
+
+
+@contextmanager
+def _timer(timings: Dict[str, float], stage: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = round(time.perf_counter() - started, 6)
+
+
+def _render(result: List[Dict[str, Any]]) -> None:
+    try:
+        from tabulate import tabulate  # type: ignore
+    except ImportError:
+        return
+    tabulate(result, headers="keys", tablefmt="github", floatfmt=".2f")
+
+
+def bench_report(
+    name: str,
+    ReportClass: Type[BaseReport],
+    file_path: str,
+    rows: int,
+    mode: str = "memory",
+) -> Dict[str, Any]:
+    # memory — чтение всех строк в словарь и отчёт по нему, как без
+    # --stream; stream — строки из iter_rows сразу подаются в отчёт, как с
+    # --stream, поэтому чтение и агрегация замеряются одним этапом.
+    timings: Dict[str, float] = {}
+    reader = DataReader(fields=ReportClass.fields)
+    reset_peak_rss()
+
+    report = ReportClass()
+    if mode == "stream":
+        assert isinstance(report, StreamingReport)
+        with _timer(timings, "parse+aggregate"):
+            for country, record in reader.iter_rows([file_path]):
+                report.add(country, record)
+        with _timer(timings, "sort"):
+            result = report.finalize()
+    else:
+        with _timer(timings, "parse"):
+            data = reader.read_all_files([file_path])
+        if isinstance(report, StreamingReport):
+            with _timer(timings, "aggregate"):
+                for country, records in data.items():
+                    for record in records:
+                        report.add(country, record)
+            with _timer(timings, "sort"):
+                result = report.finalize()
+        else:
+            with _timer(timings, "aggregate"):
+                result = report.generate(data)
+            timings["sort"] = 0.0
+
+    compute = sum(timings.values())
+    with _timer(timings, "render"):
+        _render(result)
+
+    return {
+        "report": name,
+        "mode": mode,
+        "rows": rows,
+        "rows_per_sec": round(rows / compute) if compute else None,
+        "timings": timings,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_benchmarks(
+    row_counts: List[int],
+    countries: int = 200,
+    null_rate: float = 0.05,
+    seed: int = 0,
+    reports: Optional[List[str]] = None,
+    work_dir: Optional[str] = None,
+    modes: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    results = []
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir:
+        for rows in row_counts:
+            file_path = os.path.join(tmp_dir, f"bench_{rows}.csv")
+            generate_csv(file_path, rows, countries, null_rate, seed)
+            for name in reports or list(AVAILABLE_REPORTS):
+                ReportClass = AVAILABLE_REPORTS[name]
+                for mode in modes or MODES:
+                    # Отчёты без потокового режима замеряются только в памяти.
+                    if mode == "stream" and not issubclass(
+                        ReportClass, StreamingReport
+                    ):
+                        continue
+                    results.append(
+                        bench_report(name, ReportClass, file_path, rows, mode)
+                    )
+            os.remove(file_path)
+
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"countries": countries, "null_rate": null_rate, "seed": seed},
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Замеры производительности чтения и генерации отчётов"
+    )
+    parser.add_argument(
+        "--rows",
+        nargs="+",
+        type=int,
+        default=[10_000, 100_000, 1_000_000],
+        help="Число строк синтетических данных (от 10 тыс. до 100 млн)",
+    )
+    parser.add_argument("--countries", type=int, default=200, help="Число стран")
+    parser.add_argument(
+        "--null-rate", type=float, default=0.05, help="Доля пустых значений"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Зерно генератора")
+    parser.add_argument(
+        "--report",
+        nargs="+",
+        choices=list(AVAILABLE_REPORTS),
+        help="Отчёты для замера (по умолчанию все)",
+    )
+    parser.add_argument(
+        "--mode",
+        nargs="+",
+        choices=MODES,
+        default=MODES,
+        help="Режимы замера: memory — все строки в памяти, stream — как "
+        "с --stream (по умолчанию оба; для сотен миллионов строк — stream)",
+    )
+    parser.add_argument(
+        "--work-dir", help="Каталог для временных CSV (по умолчанию системный)"
+    )
+    parser.add_argument(
+        "--output",
+        default="bench_results.json",
+        help="Файл для сохранения результатов в JSON",
+    )
+    args = parser.parse_args(argv)
+
+    summary = run_benchmarks(
+        args.rows,
+        args.countries,
+        args.null_rate,
+        args.seed,
+        args.report,
+        args.work_dir,
+        args.mode,
+    )
+    for result in summary["results"]:
+        stages = ", ".join(f"{k}={v:.3f}s" for k, v in result["timings"].items())
+        print(
+            f"{result['report']} {result['mode']} rows={result['rows']} "
+            f"rows/s={result['rows_per_sec']} rss={result['peak_rss_mb']}MB {stages}"
+        )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import hashlib
+import os
+import struct
+import tempfile
+from typing import Optional
+
+from src.columnar import ColumnarData
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "data_aggregator")
+
+DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+# Кэш разобранных файлов в бинарном колоночном формате; используется
+# только при колоночном чтении (read_columnar). Ключ учитывает
+# путь, размер, mtime и хэш содержимого; старые записи вытесняются
+# по времени последнего использования (LRU), когда кэш превышает max_size.
+class ParsedCache:
+    def __init__(
+        self, cache_dir: str = DEFAULT_CACHE_DIR, max_size: int = DEFAULT_MAX_SIZE
+    ):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+    def fingerprint(self, file_path: str, variant: str = "") -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            meta = "\0".join(
+                (os.path.abspath(file_path), str(stat.st_size), str(stat.st_mtime_ns))
+            )
+            digest.update(variant.encode("utf-8") + b"\0")
+            digest.update(meta.encode("utf-8"))
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def load(self, key: str) -> Optional[ColumnarData]:
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                store = ColumnarData.from_bytes(f.read())
+            os.utime(path)
+        except (OSError, ValueError, KeyError, struct.error):
+            return None
+        return store
+
+    def store(self, key: str, data: ColumnarData) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data.to_bytes())
+            os.replace(tmp_path, self._entry_path(key))
+            self._evict()
+        except OSError:
+            # Кэш — только ускорение: ошибки записи не должны прерывать отчёт.
+            pass
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.bin")
+
+    def _evict(self) -> None:
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".bin"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            os.remove(path)
+            total -= size
@@ -1,4 +1,61 @@
 import argparse
+from typing import List, Optional, Tuple
+
+from src.cache import DEFAULT_CACHE_DIR
+from src.rejects import ON_ERROR_MODES
+from src.report_type import AVAILABLE_REPORTS
+
+SIZE_UNITS = {"K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            f"Значение должно быть положительным числом: {value}"
+        )
+    return number
+
+
+def fraction(value: str) -> float:
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Неверная доля: {value}")
+    if not 0 < number <= 1:
+        raise argparse.ArgumentTypeError(f"Доля должна быть в (0, 1]: {value}")
+    return number
+
+
+def size_value(value: str) -> int:
+    text = value.strip().upper().removesuffix("B")
+    multiplier = SIZE_UNITS.get(text[-1:], 1)
+    if text[-1:] in SIZE_UNITS:
+        text = text[:-1]
+    try:
+        size = int(float(text) * multiplier)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Неверный размер: {value}")
+    if size < 1:
+        raise argparse.ArgumentTypeError(f"Неверный размер: {value}")
+    return size
+
+
+def year_range(value: str) -> Tuple[Optional[int], Optional[int]]:
+    # Форматы: 2015-2023, 2015 (один год), 2015- и -2023 (открытые границы).
+    first, separator, last = value.strip().partition("-")
+    if not separator:
+        last = first
+    try:
+        start = int(first) if first else None
+        end = int(last) if last else None
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Неверный диапазон лет: {value}")
+    if start is None and end is None:
+        raise argparse.ArgumentTypeError(f"Неверный диапазон лет: {value}")
+    if start is not None and end is not None and start > end:
+        raise argparse.ArgumentTypeError(f"Неверный диапазон лет: {value}")
+    return start, end
 
 
 def parse_arguments():
@@ -9,21 +66,234 @@ def parse_arguments():
         "--files",
         nargs="+",
         required=True,
-        help="Один или несколько CSV-файлов для обработки",
+        help="Один или несколько файлов для обработки (CSV, Parquet, Feather)",
     )
     parser.add_argument(
         "--report",
         nargs="+",
         required=True,
-        choices=["average-gdp"],
+        choices=list(AVAILABLE_REPORTS),
         help="Тип отчёта для генерации",
     )
+    parser.add_argument(
+        "--years",
+        type=year_range,
+        help="Учитывать только строки за годы из диапазона, например 2015-2023, "
+        "2015- или -2023",
+    )
+    parser.add_argument(
+        "--countries",
+        nargs="+",
+        help="Учитывать только строки указанных стран",
+    )
+    parser.add_argument(
+        "--continents",
+        nargs="+",
+        help="Учитывать только строки указанных континентов",
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=1,
+        help="Количество процессов для параллельного чтения файлов",
+    )
+    parser.add_argument(
+        "--async-io",
+        action="store_true",
+        help="Читать много файлов одновременно (asyncio), разбирая их в пуле; "
+        "полезно для множества мелких файлов на сетевой ФС",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=positive_int,
+        default=16,
+        help="Сколько файлов одновременно читается в режиме --async-io",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Считать отчёты за один проход, не загружая данные в память",
+    )
+    parser.add_argument(
+        "--approx",
+        nargs="?",
+        const=0.01,
+        type=fraction,
+        help="Приближённый расчёт по случайной выборке: доля читаемых блоков "
+        "(по умолчанию 0.01); в отчёт добавляется полуширина 95%% "
+        "доверительного интервала",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Начальное значение генератора выборки для --approx",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=size_value,
+        help="Ограничение памяти на накопители отчётов, например 2G: отчёты "
+        "считаются за один проход, как с --stream, а накопители сверх "
+        "ограничения выгружаются во временные файлы; средние могут "
+        "отличаться от --stream в последнем знаке",
+    )
+    parser.add_argument(
+        "--state",
+        help="Файл состояния инкрементального режима: повторный запуск "
+        "читает только строки, дописанные в файлы с прошлого запуска",
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Хранить данные в колоночном виде (типизированные массивы)",
+    )
+    parser.add_argument(
+        "--parallel-reports",
+        action="store_true",
+        help="Считать отчёты параллельно в отдельных процессах; данные "
+        "передаются через разделяемую память без копирования (нужно "
+        "хотя бы два разных отчёта)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["python", "numpy"],
+        default="python",
+        help="Движок расчёта отчётов по колоночным данным "
+        "(numpy без установленного NumPy заменяется на python)",
+    )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="Читать несжатые CSV через mmap, без копирования через буфер файла",
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Не использовать индексы, построенные командой index (средние "
+        "по индексу могут отличаться в последнем знаке)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Не использовать кэш разобранных файлов при колоночном чтении",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help="Каталог кэша разобранных файлов (только для колоночного чтения)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=size_value,
+        default="1G",
+        help="Максимальный размер кэша, например 500M или 2G",
+    )
+    parser.add_argument(
+        "--on-error",
+        choices=ON_ERROR_MODES,
+        default="fail",
+        help="Что делать со строками с ошибками: fail — прервать чтение, "
+        "skip — пропустить, log — пропустить и записать в --reject-file",
+    )
+    parser.add_argument(
+        "--reject-file",
+        default="rejects.csv",
+        help="Файл для отброшенных строк в режиме --on-error log",
+    )
+    parser.add_argument(
+        "--output",
+        choices=["table", "fixed", "csv", "jsonl", "parquet"],
+        default="table",
+        help="Формат вывода отчётов",
+    )
+    parser.add_argument(
+        "--output-file",
+        help="Файл для вывода отчётов (по умолчанию стандартный вывод)",
+    )
+    limit = parser.add_mutually_exclusive_group()
+    limit.add_argument(
+        "--top",
+        type=positive_int,
+        help="Вывести только N первых строк каждого отчёта",
+    )
+    limit.add_argument(
+        "--bottom",
+        type=positive_int,
+        help="Вывести только N последних строк каждого отчёта "
+        "(по возрастанию значения)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="summary",
+        choices=["summary", "json", "cprofile"],
+        help="Вывести время этапов и счётчики (summary, json) "
+        "или сохранить профиль cProfile",
+    )
+    parser.add_argument(
+        "--profile-output",
+        default="profile.pstats",
+        help="Файл для профиля cProfile",
+    )
     return parser.parse_args()
 
 
+def parse_index_arguments(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="main.py index",
+        description="Построение индексов для повторных запросов к CSV-файлам",
+    )
+    parser.add_argument("files", nargs="+", help="CSV-файлы для индексации")
+    parser.add_argument(
+        "--block-size",
+        type=size_value,
+        default="1M",
+        help="Размер блока индекса, например 256K или 4M",
+    )
+    return parser.parse_args(argv)
+
+
+def parse_serve_arguments(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="main.py serve",
+        description="Сервер отчётов: данные читаются один раз и держатся в памяти, "
+        "отчёты запрашиваются по HTTP (GET /reports?report=average-gdp)",
+    )
+    parser.add_argument(
+        "files", nargs="+", help="Файлы с данными (CSV, Parquet, Feather)"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Адрес для HTTP")
+    parser.add_argument(
+        "--port", type=int, default=8000, help="Порт для HTTP (0 — любой свободный)"
+    )
+    parser.add_argument(
+        "--socket",
+        help="Слушать Unix-сокет по этому пути вместо TCP-порта",
+    )
+    parser.add_argument(
+        "--poll",
+        type=float,
+        default=1.0,
+        help="Период проверки файлов на изменения, в секундах (0 — не проверять)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["python", "numpy"],
+        default="python",
+        help="Движок расчёта отчётов",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Писать в журнал каждый запрос"
+    )
+    return parser.parse_args(argv)
+
+
 def validate_arguments(args: argparse.Namespace) -> None:
     if not args.files:
         raise ValueError("Необходимо указать хотя бы один файл")
 
     if not args.report:
         raise ValueError("Необходимо указать тип отчета")
+
+    if getattr(args, "approx", None) and getattr(args, "state", None):
+        raise ValueError("Режим --approx несовместим с --state")
@@ -0,0 +1,234 @@
+import json
+import math
+import struct
+import threading
+from array import array
+from collections import defaultdict
+from itertools import compress
+from typing import (
+    Callable,
+    DefaultDict,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from src.reports.base import EconomicData, EconomicRecord
+
+FLOAT_FIELDS = ("gdp", "gdp_growth", "inflation", "unemployment")
+
+COLUMNS = (
+    "country",
+    "continent",
+    "year",
+    "gdp",
+    "gdp_growth",
+    "inflation",
+    "unemployment",
+    "population",
+)
+
+MAGIC = b"EDC1"
+
+MISSING = math.nan
+
+
+# Новые значения добавляются под общей блокировкой: без неё два потока
+# могли бы выдать двум разным значениям один код. Поиск уже известного
+# значения блокировку не берёт, а код появляется в словаре только после
+# значения, поэтому читатель без блокировки не увидит кода без значения.
+# Блокировка общая на модуль, чтобы таблицы оставались сериализуемыми.
+_ENCODE_LOCK = threading.Lock()
+
+
+class CategoryTable:
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            with _ENCODE_LOCK:
+                code = self.codes.get(value)
+                if code is None:
+                    self.values.append(value)
+                    code = self.codes[value] = len(self.values) - 1
+        return code
+
+    def decode(self, code: int) -> str:
+        return self.values[code]
+
+    def intern(self, value: str) -> str:
+        # Единственный экземпляр строки для значения: записи ссылаются
+        # на него, а не на собственную копию из разобранной строки.
+        code = self.codes.get(value)
+        if code is None:
+            code = self.encode(value)
+        return self.values[code]
+
+
+# Общие на процесс таблицы названий стран и континентов. Через них
+# проходят названия при чтении, поэтому во всех записях одно название —
+# один объект строки с уже посчитанным хэшем.
+COUNTRIES = CategoryTable()
+
+CONTINENTS = CategoryTable()
+
+
+def interner(table: CategoryTable) -> Callable[[str], str]:
+    # Кэш по исходному значению: повторное название не обрезается
+    # заново, а сразу заменяется общей строкой из таблицы.
+    names: Dict[str, str] = {}
+
+    def intern(raw: str) -> str:
+        name = names.get(raw)
+        if name is None:
+            name = names[raw] = table.intern(raw.strip())
+        return name
+
+    return intern
+
+
+# Колоночное хранилище: по одному типизированному массиву на поле.
+# Пропуски в вещественных полях хранятся как NaN, в population — маской.
+class ColumnarData:
+    def __init__(self) -> None:
+        self.countries = CategoryTable()
+        self.continents = CategoryTable()
+        self.country = array("i")
+        self.continent = array("i")
+        self.year = array("q")
+        self.gdp = array("d")
+        self.gdp_growth = array("d")
+        self.inflation = array("d")
+        self.unemployment = array("d")
+        self.population = array("q")
+        self.population_mask = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.country)
+
+    def append(self, country: str, record: EconomicRecord) -> None:
+        self.country.append(self.countries.encode(country))
+        self.continent.append(self.continents.encode(record["continent"]))
+        self.year.append(record["year"])
+        for field in FLOAT_FIELDS:
+            value: Optional[float] = record[field]  # type: ignore[literal-required]
+            getattr(self, field).append(MISSING if value is None else value)
+
+        population = record["population"]
+        self.population.append(0 if population is None else population)
+        self.population_mask.append(population is not None)
+
+    def extend(self, rows: Iterable[Tuple[str, EconomicRecord]]) -> None:
+        for country, record in rows:
+            self.append(country, record)
+
+    def record(self, index: int) -> EconomicRecord:
+        def optional(value: float) -> Optional[float]:
+            return None if math.isnan(value) else value
+
+        return {
+            "year": self.year[index],
+            "gdp": optional(self.gdp[index]),
+            "gdp_growth": optional(self.gdp_growth[index]),
+            "inflation": optional(self.inflation[index]),
+            "unemployment": optional(self.unemployment[index]),
+            "population": (
+                self.population[index] if self.population_mask[index] else None
+            ),
+            "continent": self.continents.decode(self.continent[index]),
+        }
+
+    def iter_rows(self) -> Iterator[Tuple[str, EconomicRecord]]:
+        for index, code in enumerate(self.country):
+            yield self.countries.decode(code), self.record(index)
+
+    def to_records(self) -> EconomicData:
+        data: DefaultDict[str, List[EconomicRecord]] = defaultdict(list)
+        for index, code in enumerate(self.country):
+            data[self.countries.decode(code)].append(self.record(index))
+        return dict(data)
+
+    def merge(self, other: "ColumnarData") -> None:
+        country_codes = [self.countries.encode(v) for v in other.countries.values]
+        continent_codes = [self.continents.encode(v) for v in other.continents.values]
+        self.country.extend(array("i", map(country_codes.__getitem__, other.country)))
+        self.continent.extend(
+            array("i", map(continent_codes.__getitem__, other.continent))
+        )
+        for name in COLUMNS[2:]:
+            getattr(self, name).extend(getattr(other, name))
+        self.population_mask.extend(other.population_mask)
+
+    def select(self, mask: Sequence[bool]) -> "ColumnarData":
+        # Копия с отмеченными строками. Таблицы названий копируются
+        # целиком, поэтому коды строк остаются прежними.
+        store = ColumnarData()
+        for table, source in (
+            (store.countries, self.countries),
+            (store.continents, self.continents),
+        ):
+            table.values = list(source.values)
+            table.codes = dict(source.codes)
+        for name in COLUMNS:
+            getattr(store, name).extend(compress(getattr(self, name), mask))
+        store.population_mask.extend(compress(self.population_mask, mask))
+        return store
+
+    def to_bytes(self) -> bytes:
+        header = json.dumps(
+            {
+                "rows": len(self),
+                "countries": self.countries.values,
+                "continents": self.continents.values,
+            }
+        ).encode("utf-8")
+        parts = [MAGIC, struct.pack("<I", len(header)), header]
+        parts.extend(getattr(self, name).tobytes() for name in COLUMNS)
+        parts.append(bytes(self.population_mask))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> "ColumnarData":
+        if payload[:4] != MAGIC:
+            raise ValueError("Неверный формат колоночных данных")
+
+        (header_size,) = struct.unpack_from("<I", payload, 4)
+        offset = 8 + header_size
+        header = json.loads(payload[8:offset].decode("utf-8"))
+        rows = header["rows"]
+
+        store = cls()
+        for value in header["countries"]:
+            store.countries.encode(value)
+        for value in header["continents"]:
+            store.continents.encode(value)
+
+        view = memoryview(payload)
+        for name in COLUMNS:
+            column = getattr(store, name)
+            end = offset + rows * column.itemsize
+            column.frombytes(view[offset:end])
+            offset = end
+        store.population_mask.extend(view[offset:])
+
+        if len(store.population_mask) != rows:
+            raise ValueError("Колоночные данные повреждены")
+        return store
+
+    @classmethod
+    def from_records(cls, data: EconomicData) -> "ColumnarData":
+        store = cls()
+        for country, records in data.items():
+            for record in records:
+                store.append(country, record)
+        return store
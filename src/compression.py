@@ -0,0 +1,232 @@
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Deque,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - зависит от окружения
+    zstandard = None  # type: ignore[assignment]
+
+# Размер буфера между распаковкой и разбором CSV.
+BUFFER_SIZE = 1024 * 1024
+
+MAGIC_NUMBERS = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+FrameRange = Tuple[int, int]
+
+
+def detect_compression(file_path: str) -> Optional[str]:
+    with open(file_path, "rb") as f:
+        head = f.read(8)
+    for magic, name in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def _zstd_frames(data: Any) -> Optional[List[FrameRange]]:
+    # Границы кадров zstd находятся по заголовкам блоков без распаковки.
+    frames: List[FrameRange] = []
+    offset = 0
+    while offset < len(data):
+        header_end = offset + 4
+        magic = data[offset:header_end]
+        if magic[1:] == b"\x2a\x4d\x18" and magic[0] & 0xF0 == 0x50:
+            # Пропускаемый кадр, например таблица поиска seekable-формата.
+            (length,) = struct.unpack_from("<I", data, offset + 4)
+            offset += 8 + length
+            continue
+        if magic != ZSTD_MAGIC:
+            return None
+
+        start = offset
+        descriptor = data[offset + 4]
+        single_segment = (descriptor >> 5) & 1
+        window_size = 0 if single_segment else 1
+        dictionary_size = (0, 1, 2, 4)[descriptor & 3]
+        content_size = (single_segment, 2, 4, 8)[descriptor >> 6]
+        offset += 5 + window_size + dictionary_size + content_size
+
+        while True:
+            block_end = offset + 3
+            header = int.from_bytes(data[offset:block_end], "little")
+            block_type = (header >> 1) & 3
+            if block_type == 3:
+                return None
+            offset += 3 + (1 if block_type == 1 else header >> 3)
+            if header & 1:
+                break
+        if (descriptor >> 2) & 1:
+            offset += 4
+        frames.append((start, offset))
+    return frames
+
+
+def _bgzf_members(data: Any) -> Optional[List[FrameRange]]:
+    # Только для блочного gzip (BGZF): размер участника записан в
+    # дополнительном поле BC. У обычного gzip границы участников
+    # без распаковки неизвестны.
+    members: List[FrameRange] = []
+    offset = 0
+    while offset < len(data):
+        header_end = offset + 4
+        if data[offset:header_end] != b"\x1f\x8b\x08\x04":
+            return None
+        (extra_size,) = struct.unpack_from("<H", data, offset + 10)
+        extra_start = offset + 12
+        extra_end = extra_start + extra_size
+        extra = data[extra_start:extra_end]
+        block_size = None
+        position = 0
+        while position + 4 <= len(extra):
+            (length,) = struct.unpack_from("<H", extra, position + 2)
+            if extra.startswith(b"BC", position) and length == 2:
+                (block_size,) = struct.unpack_from("<H", extra, position + 4)
+            position += 4 + length
+        if block_size is None:
+            return None
+        members.append((offset, offset + block_size + 1))
+        offset += block_size + 1
+    return members
+
+
+def _decompress_zstd(frame: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompressobj().decompress(frame)
+
+
+def _decompress_gzip(member: bytes) -> bytes:
+    return zlib.decompress(member, 16 + zlib.MAX_WBITS)
+
+
+class _ChunkReader(io.RawIOBase):
+    def __init__(self, chunks: Generator[bytes, None, None]):
+        self.chunks = chunks
+        self.pending = memoryview(b"")
+
+    def close(self) -> None:
+        self.chunks.close()
+        super().close()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self.pending:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                return 0
+            self.pending = memoryview(chunk)
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        return size
+
+
+def _parallel_chunks(
+    data: Any,
+    frames: List[FrameRange],
+    decompress: Callable[[bytes], bytes],
+    workers: int,
+) -> Iterator[bytes]:
+    # Кадры распаковываются в пуле потоков (zlib и zstd отпускают GIL),
+    # а отдаются строго по порядку; вперёд распаковывается не больше
+    # 2 * workers кадров, чтобы не держать в памяти весь файл.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: Deque[Future] = deque()
+        for start, end in frames:
+            pending.append(executor.submit(decompress, data[start:end]))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _frame_ranges(
+    compression: str, data: Any
+) -> Tuple[Optional[List[FrameRange]], Callable[[bytes], bytes]]:
+    if compression == "zstd":
+        return _zstd_frames(data), _decompress_zstd
+    return _bgzf_members(data), _decompress_gzip
+
+
+def _open_parallel(
+    file_path: str, compression: str, workers: int
+) -> Optional[IO[bytes]]:
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        frames, decompress = _frame_ranges(compression, data)
+    except (IndexError, struct.error):
+        frames = None
+    if not frames or len(frames) < 2:
+        data.close()
+        return None
+
+    def chunks() -> Generator[bytes, None, None]:
+        try:
+            yield from _parallel_chunks(data, frames, decompress, workers)
+        finally:
+            data.close()
+
+    return io.BufferedReader(_ChunkReader(chunks()), BUFFER_SIZE)
+
+
+def _open_compressed(file_path: str, compression: str) -> IO[bytes]:
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("Для чтения файлов zstd требуется пакет zstandard")
+
+    workers = os.cpu_count() or 1
+    if compression in ("zstd", "gzip") and workers > 1:
+        stream = _open_parallel(file_path, compression, workers)
+        if stream is not None:
+            return stream
+
+    if compression == "gzip":
+        return io.BufferedReader(gzip.GzipFile(file_path), BUFFER_SIZE)
+    if compression == "bz2":
+        return io.BufferedReader(bz2.BZ2File(file_path), BUFFER_SIZE)
+    if compression == "xz":
+        return io.BufferedReader(lzma.LZMAFile(file_path), BUFFER_SIZE)
+
+    raw = open(file_path, "rb")
+    reader = zstandard.ZstdDecompressor().stream_reader(
+        raw, read_size=BUFFER_SIZE, read_across_frames=True, closefd=True
+    )
+    return io.BufferedReader(reader, BUFFER_SIZE)
+
+
+# Открывает файл как текст, распаковывая его на лету; сжатие
+# определяется по сигнатуре в начале файла, а не по расширению.
+def open_text(file_path: str) -> IO[str]:
+    compression = detect_compression(file_path)
+    if compression is None:
+        return open(file_path, "r", encoding="utf-8")
+    return io.TextIOWrapper(_open_compressed(file_path, compression), encoding="utf-8")
@@ -1,34 +1,660 @@
+import asyncio
 import csv
+import io
+import os
+import random
 from collections import defaultdict
-from typing import DefaultDict, Dict, List, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import chain
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    DefaultDict,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
-from src.reports.base import EconomicRecord
+from src.arrow_reader import arrow_format, scan_arrow
+from src.cache import ParsedCache
+from src.columnar import CONTINENTS, COUNTRIES, ColumnarData
+from src.compression import detect_compression, open_text
+from src.filters import RowFilter
+from src.mmap_reader import scan_lines
+from src.rejects import Reject, RejectLog
+from src.reports.base import ECONOMIC_FIELDS, EconomicData, EconomicRecord
+from src.row_parser import OnReject, TypedRowParser
+
+CHUNK_SIZE = 64 * 1024 * 1024
+
+# Размер блока выборки в режиме --approx.
+SAMPLE_BLOCK = 256 * 1024
+
+# Сколько файлов асинхронный режим читает и разбирает одновременно.
+CONCURRENCY = 16
+
+FileRange = Tuple[str, int, int]
+
+Row = Tuple[str, EconomicRecord]
+
+# Результат обработчика: разобранные данные и отброшенные строки.
+Partial = Tuple[EconomicData, List[Reject]]
+
+# Часть файла, разобранная в процессе пула в колоночный вид.
+ColumnarPartial = Tuple[ColumnarData, List[Reject]]
+
+FIELD_CONVERTERS: Dict[str, Callable[[str], Union[int, float]]] = {
+    "gdp": float,
+    "gdp_growth": float,
+    "inflation": float,
+    "unemployment": float,
+    "population": int,
+}
+
+EMPTY_RECORD: EconomicRecord = {
+    "year": 0,
+    "gdp": None,
+    "gdp_growth": None,
+    "inflation": None,
+    "unemployment": None,
+    "population": None,
+    "continent": "",
+}
+
+
+@contextmanager
+def _file_errors(file_path: str) -> Iterator[None]:
+    try:
+        yield
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Файл не найден: {file_path}")
+    except Exception as e:
+        raise ValueError(f"Ошибка при чтении файла {file_path}: {e}")
+
+
+def _split_file(file_path: str, chunk_size: int) -> List[FileRange]:
+    with open(file_path, "rb") as f:
+        f.readline()
+        start = f.tell()
+        size = os.fstat(f.fileno()).st_size
+
+        ranges: List[FileRange] = []
+        while start < size:
+            if start + chunk_size >= size:
+                end = size
+            else:
+                f.seek(start + chunk_size)
+                f.readline()
+                end = f.tell()
+            ranges.append((file_path, start, end))
+            start = end
+    return ranges
+
+
+def _worker_reader(
+    fields: Sequence[str], row_filter: Optional[RowFilter], on_error: str
+) -> "DataReader":
+    # Отброшенные строки копятся в памяти и возвращаются вместе с данными.
+    return DataReader(
+        fields=fields,
+        row_filter=row_filter,
+        on_error=on_error,
+        reject_log=RejectLog(keep=True),
+    )
+
+
+def _partial(reader: "DataReader") -> Partial:
+    return dict(reader.data), reader.reject_log.entries or []
+
+
+def _parse_range(
+    file_path: str,
+    start: int,
+    end: int,
+    use_mmap: bool = False,
+    fields: Sequence[str] = ECONOMIC_FIELDS,
+    row_filter: Optional[RowFilter] = None,
+    on_error: str = "fail",
+) -> Partial:
+    reader = _worker_reader(fields, row_filter, on_error)
+    if use_mmap:
+        reader._merge_rows(
+            reader._parse_csv(scan_lines(file_path, start, end), file_path)
+        )
+        return _partial(reader)
+
+    with open(file_path, "rb") as f:
+        header = f.readline()
+        f.seek(start)
+        chunk = f.read(end - start)
+
+    text = io.StringIO((header + chunk).decode("utf-8"))
+    # Первая строка текста — заголовок, поэтому номер сдвигается на 1.
+    reader._merge_rows(reader._parse_csv(text, file_path, start=start, shift=-1))
+    return _partial(reader)
+
+
+def _parse_file(
+    file_path: str,
+    fields: Sequence[str],
+    row_filter: Optional[RowFilter] = None,
+    on_error: str = "fail",
+) -> Partial:
+    reader = _worker_reader(fields, row_filter, on_error)
+    reader._read_single_file(file_path)
+    return _partial(reader)
+
+
+def _parse_bytes(
+    file_path: str,
+    content: bytes,
+    fields: Sequence[str],
+    row_filter: Optional[RowFilter] = None,
+    on_error: str = "fail",
+) -> Partial:
+    reader = _worker_reader(fields, row_filter, on_error)
+    text = io.StringIO(content.decode("utf-8"))
+    reader._merge_rows(reader._parse_csv(text, file_path))
+    return _partial(reader)
+
+
+def _to_columnar(parse: Callable[..., Partial], *args: Any) -> ColumnarPartial:
+    # Часть переводится в столбцы ещё в процессе пула: массивы столбцов
+    # передаются между процессами дешевле, чем словари записей.
+    data, rejects = parse(*args)
+    return ColumnarData.from_records(data), rejects
+
+
+def _count_lines(file_path: str, offset: int) -> int:
+    count = 0
+    with open(file_path, "rb") as f:
+        while offset > 0:
+            block = f.read(min(offset, CHUNK_SIZE))
+            if not block:
+                break
+            count += block.count(b"\n")
+            offset -= len(block)
+    return count
+
+
+def _line_counter(file_path: str, start: int, shift: int = 0) -> Callable[[int], int]:
+    # Номер строки в файле для журнала отброшенных строк по номеру строки
+    # в прочитанном тексте. Число строк до начала диапазона считается один
+    # раз и только при первой ошибке.
+    before: List[int] = []
+
+    def line(number: int) -> int:
+        if not before:
+            before.append(_count_lines(file_path, start))
+        return before[0] + number + shift
+
+    return line
+
+
+def _file_size(file_path: str) -> int:
+    # Для счётчика прочитанных байт; об отсутствии файла сообщит чтение.
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+
+def _read_plain(file_path: str) -> Optional[bytes]:
+    if not _is_plain(file_path):
+        return None
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+# Сжатые файлы и Parquet/Feather нельзя делить по байтовым смещениям:
+# они читаются целиком и без mmap.
+def _is_plain(file_path: str) -> bool:
+    return not arrow_format(file_path) and detect_compression(file_path) is None
+
+
+def _read_lines(f: BinaryIO, limit: int) -> Iterator[bytes]:
+    while limit > 0:
+        line = f.readline(limit)
+        if not line:
+            break
+        limit -= len(line)
+        yield line
+
+
+@contextmanager
+def _open_range(
+    file_path: str, start: int, end: int
+) -> Iterator[Tuple[List[str], Iterator[str], int]]:
+    with open(file_path, "rb") as f:
+        header = next(csv.reader([f.readline().decode("utf-8")]))
+        start = max(start, f.tell())
+        f.seek(start)
+        lines = (line.decode("utf-8") for line in _read_lines(f, end - start))
+        yield header, lines, start
+
+
+def _iter_range_rows(file_path: str, start: int, end: int) -> Iterator[Dict[str, str]]:
+    with _open_range(file_path, start, end) as (header, lines, _):
+        yield from csv.DictReader(lines, fieldnames=header)
 
 
 class DataReader:
-    def __init__(self):
+    def __init__(
+        self,
+        workers: int = 1,
+        chunk_size: int = CHUNK_SIZE,
+        cache: Optional[ParsedCache] = None,
+        use_mmap: bool = False,
+        fields: Sequence[str] = ECONOMIC_FIELDS,
+        row_filter: Optional[RowFilter] = None,
+        async_io: bool = False,
+        concurrency: int = CONCURRENCY,
+        on_error: str = "fail",
+        reject_log: Optional[RejectLog] = None,
+    ):
         self.data: DefaultDict[str, List[EconomicRecord]] = defaultdict(list)
+        # Сколько байт входных файлов прочитано: по индексу и в выборке
+        # читается только часть файла, а файлы из кэша не читаются вовсе.
+        self.bytes_read = 0
+        self.workers = workers
+        self.chunk_size = chunk_size
+        # В мягких режимах (skip, log) строки читаются через csv, чтобы
+        # знать номер отброшенной строки; кэш не используется, иначе
+        # повторный запуск не увидел бы отброшенных строк.
+        self.on_error = on_error
+        self.reject_log = reject_log or RejectLog()
+        self.cache = cache if on_error == "fail" else None
+        self.use_mmap = use_mmap and on_error == "fail"
+        self.async_io = async_io
+        self.concurrency = concurrency
+        self.fields = tuple(fields)
+        # Поля вне проекции не проверяются и не преобразуются: числовые
+        # остаются None, continent — пустой строкой.
+        self._projected = set(ECONOMIC_FIELDS) - set(self.fields) - {"year"}
+        self._converters = [
+            (field, FIELD_CONVERTERS[field])
+            for field in self.fields
+            if field in FIELD_CONVERTERS
+        ]
+        # Столбцы, которые читаются из строки. None в них значит, что строка
+        # короче заголовка: такая строка — ошибка, а не пустые значения.
+        self._required = ["country", "year", *(field for field, _ in self._converters)]
+        if "continent" not in self._projected:
+            self._required.append("continent")
+        self.row_filter = row_filter or RowFilter()
+        # Фильтру по континентам нужен столбец continent, даже если
+        # отчётам он не нужен.
+        self._scan_fields = self.fields
+        if self.row_filter.continents and "continent" not in self.fields:
+            self._scan_fields += ("continent",)
 
     def read_all_files(self, file_paths: List[str]) -> Dict[str, List[EconomicRecord]]:
+        if self.async_io:
+            for partial in self._read_async(file_paths):
+                self._merge(partial)
+            return dict(self.data)
+        if self.workers > 1:
+            return self._read_parallel(file_paths)
+
         for file_path in file_paths:
-            try:
+            with _file_errors(file_path):
                 self._read_single_file(file_path)
-            except FileNotFoundError:
-                raise FileNotFoundError(f"Файл не найден: {file_path}")
-            except Exception as e:
-                raise ValueError(f"Ошибка при чтении файла {file_path}: {e}")
         return dict(self.data)
 
+    def iter_rows(self, file_paths: List[str]) -> Iterator[Row]:
+        for file_path in file_paths:
+            with _file_errors(file_path):
+                yield from self._iter_single_file(file_path)
+
+    def iter_sample(
+        self, file_paths: List[str], fraction: float, seed: int = 0
+    ) -> Iterator[Row]:
+        # Блочная выборка: несжатый CSV делится на блоки по границам строк
+        # и читается только случайная доля блоков (не меньше одного), без
+        # чтения остальных. Сжатые файлы и Parquet/Feather читаются целиком,
+        # но в отчёты попадает та же доля случайных строк.
+        rng = random.Random(seed)
+        for file_path in file_paths:
+            with _file_errors(file_path):
+                plain = _is_plain(file_path)
+                ranges = _split_file(file_path, SAMPLE_BLOCK) if plain else []
+            if not plain:
+                with _file_errors(file_path):
+                    for row in self._iter_single_file(file_path):
+                        if rng.random() < fraction:
+                            yield row
+                continue
+
+            count = max(1, round(len(ranges) * fraction))
+            chosen = sorted(rng.sample(range(len(ranges)), min(count, len(ranges))))
+            for index in chosen:
+                yield from self.iter_range(*ranges[index])
+
+    def iter_range(self, file_path: str, start: int, end: int) -> Iterator[Row]:
+        with _file_errors(file_path):
+            if not _is_plain(file_path):
+                raise ValueError(
+                    "инкрементальный режим поддерживает только несжатые CSV-файлы"
+                )
+            self.bytes_read += max(0, end - start)
+            if self.use_mmap:
+                lines = scan_lines(file_path, start, end)
+                yield from self._parse_csv(lines, file_path)
+                return
+
+            with _open_range(file_path, start, end) as (header, lines, start):
+                yield from self._parse_csv(lines, file_path, header, start)
+
+    # Кэш используется только здесь: в нём хранятся колоночные данные, и
+    # при чтении записей или потоковом проходе их пришлось бы целиком
+    # загружать и превращать обратно в словари.
+    def read_columnar(self, file_paths: List[str]) -> ColumnarData:
+        if self.async_io:
+            return self._read_columnar_async(file_paths)
+        if self.workers > 1:
+            return self._read_columnar_parallel(file_paths)
+
+        store = ColumnarData()
+        for file_path in file_paths:
+            with _file_errors(file_path):
+                if self.cache is None:
+                    store.extend(self._iter_single_file(file_path))
+                else:
+                    store.merge(self._read_cached(file_path))
+        return store
+
+    def _cache_lookup(
+        self, file_path: str
+    ) -> Tuple[Optional[ColumnarData], Optional[str]]:
+        if self.cache is None:
+            return None, None
+        # Кэш с урезанным набором столбцов или отфильтрованными строками
+        # хранится под отдельным ключом.
+        variant = ",".join(self.fields)
+        if self.row_filter:
+            variant += ";" + self.row_filter.key()
+        key = self.cache.fingerprint(file_path, variant)
+        return self.cache.load(key), key
+
+    def _read_columnar_async(self, file_paths: List[str]) -> ColumnarData:
+        lookups = []
+        for file_path in file_paths:
+            with _file_errors(file_path):
+                lookups.append(self._cache_lookup(file_path))
+        missing = [
+            file_path
+            for file_path, (cached, _) in zip(file_paths, lookups)
+            if cached is None
+        ]
+        partials = iter(self._read_async(missing))
+
+        store = ColumnarData()
+        for cached, key in lookups:
+            if cached is None:
+                cached = ColumnarData.from_records(next(partials))
+                if self.cache is not None and key is not None:
+                    self.cache.store(key, cached)
+            store.merge(cached)
+        return store
+
+    def _read_cached(self, file_path: str) -> ColumnarData:
+        store, key = self._cache_lookup(file_path)
+        if store is None:
+            store = ColumnarData()
+            store.extend(self._iter_single_file(file_path))
+            if self.cache is not None and key is not None:
+                self.cache.store(key, store)
+        return store
+
+    def _tasks(self, file_path: str) -> List[Tuple[Callable[..., Partial], tuple]]:
+        # Несжатый CSV делится на части по границам строк, остальные
+        # файлы разбираются целиком одной задачей.
+        self.bytes_read += _file_size(file_path)
+        if not _is_plain(file_path):
+            return [
+                (_parse_file, (file_path, self.fields, self.row_filter, self.on_error))
+            ]
+        return [
+            (
+                _parse_range,
+                (*task, self.use_mmap, self.fields, self.row_filter, self.on_error),
+            )
+            for task in _split_file(file_path, self.chunk_size)
+        ]
+
+    def _read_parallel(self, file_paths: List[str]) -> EconomicData:
+        jobs = []
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for file_path in file_paths:
+                with _file_errors(file_path):
+                    futures = [
+                        executor.submit(parse, *args)
+                        for parse, args in self._tasks(file_path)
+                    ]
+                    jobs.append((file_path, futures))
+
+            # Части собираются строго в порядке файлов и смещений, поэтому
+            # результат совпадает с последовательным чтением.
+            for file_path, futures in jobs:
+                with _file_errors(file_path):
+                    for future in futures:
+                        self._merge(self._accept(future.result()))
+        return dict(self.data)
+
+    def _read_columnar_parallel(self, file_paths: List[str]) -> ColumnarData:
+        # Файлы из кэша в пул не отправляются; разобранные части одного
+        # файла сливаются по порядку смещений и сохраняются в кэш целиком.
+        jobs = []
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for file_path in file_paths:
+                with _file_errors(file_path):
+                    cached, key = self._cache_lookup(file_path)
+                    futures = (
+                        []
+                        if cached is not None
+                        else [
+                            executor.submit(_to_columnar, parse, *args)
+                            for parse, args in self._tasks(file_path)
+                        ]
+                    )
+                    jobs.append((file_path, cached, key, futures))
+
+            store = ColumnarData()
+            for file_path, cached, key, futures in jobs:
+                with _file_errors(file_path):
+                    if cached is None:
+                        cached = ColumnarData()
+                        for future in futures:
+                            part, rejects = future.result()
+                            self.reject_log.extend(rejects)
+                            cached.merge(part)
+                        if self.cache is not None and key is not None:
+                            self.cache.store(key, cached)
+                    store.merge(cached)
+        return store
+
+    def _read_async(self, file_paths: List[str]) -> List[EconomicData]:
+        results = asyncio.run(self._gather_files(file_paths))
+        # Ошибки поднимаются в порядке файлов, как при последовательном
+        # чтении, и с теми же сообщениями.
+        partials = []
+        for file_path, result in zip(file_paths, results):
+            with _file_errors(file_path):
+                if isinstance(result, BaseException):
+                    raise result
+                self.bytes_read += _file_size(file_path)
+                partials.append(self._accept(result))
+        return partials
+
+    async def _gather_files(
+        self, file_paths: List[str]
+    ) -> List[Union[Partial, BaseException]]:
+        # Чтение идёт в потоках (их не больше concurrency), разбор — в пуле
+        # процессов при workers > 1. Семафор ограничивает число файлов,
+        # которые одновременно читаются или разбираются.
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=self.concurrency))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pool: Executor = (
+            ProcessPoolExecutor(max_workers=self.workers)
+            if self.workers > 1
+            else ThreadPoolExecutor(max_workers=1)
+        )
+
+        async def read_file(file_path: str) -> Partial:
+            async with semaphore:
+                content = await asyncio.to_thread(_read_plain, file_path)
+                if content is None:
+                    partial = await loop.run_in_executor(
+                        pool,
+                        _parse_file,
+                        file_path,
+                        self.fields,
+                        self.row_filter,
+                        self.on_error,
+                    )
+                else:
+                    partial = await loop.run_in_executor(
+                        pool,
+                        _parse_bytes,
+                        file_path,
+                        content,
+                        self.fields,
+                        self.row_filter,
+                        self.on_error,
+                    )
+
+                return partial
+
+        with pool:
+            return await asyncio.gather(
+                *(read_file(file_path) for file_path in file_paths),
+                return_exceptions=True,
+            )
+
+    def _accept(self, partial: Partial) -> EconomicData:
+        data, rejects = partial
+        self.reject_log.extend(rejects)
+        return data
+
+    def _merge(self, partial: EconomicData) -> None:
+        for country, records in partial.items():
+            self.data[country].extend(records)
+
+    def _merge_rows(self, rows: Iterable[Row]) -> None:
+        data = self.data
+        for country, entry in rows:
+            data[country].append(entry)
+
     def _read_single_file(self, file_path: str) -> None:
-        with open(file_path, "r", encoding="utf-8") as f:
-            reader: Iterator[Dict[str, str]] = csv.DictReader(f)
+        self.bytes_read += _file_size(file_path)
+        if arrow_format(file_path):
+            self._merge_rows(self._scan_arrow(file_path))
+            return
+
+        if self.use_mmap and _is_plain(file_path):
+            self._merge_rows(self._parse_csv(scan_lines(file_path), file_path))
+            return
+
+        with open_text(file_path) as f:
+            self._merge_rows(self._parse_csv(f, file_path))
+
+    def _iter_single_file(self, file_path: str) -> Iterator[Row]:
+        self.bytes_read += _file_size(file_path)
+        if arrow_format(file_path):
+            yield from self._scan_arrow(file_path)
+            return
 
-            for row in reader:
-                self._process_row(row)
+        if self.use_mmap and _is_plain(file_path):
+            yield from self._parse_csv(scan_lines(file_path), file_path)
+            return
+
+        with open_text(file_path) as f:
+            yield from self._parse_csv(f, file_path)
+
+    def _scan_arrow(self, file_path: str) -> Iterator[Row]:
+        # Диапазон лет отсекает группы строк Parquet по статистике,
+        # остальные условия проверяются по разобранным записям.
+        rows = scan_arrow(file_path, self._scan_fields, self.row_filter.years)
+        if not self.row_filter:
+            return rows
+        return self.row_filter.records(rows)
+
+    def _parse_csv(
+        self,
+        lines: Iterable[str],
+        file_path: str,
+        header: Optional[List[str]] = None,
+        start: Optional[int] = None,
+        shift: int = 0,
+    ) -> Iterator[Row]:
+        # Без заголовка первая строка lines считается заголовком. start —
+        # смещение lines в файле, по нему считаются номера строк для журнала
+        # отброшенных строк.
+        if self.on_error == "fail":
+            return chain.from_iterable(self._parse_typed(lines, header))
+
+        # Строка заголовка, прочитанная из lines, тоже входит в нумерацию.
+        line = _line_counter(file_path, start or 0, shift + (header is None))
+
+        def reject(number: int, error: Exception, row: Dict[str, str]) -> None:
+            self._reject(file_path, line(number), error, row)
+
+        return chain.from_iterable(self._parse_typed(lines, header, reject))
+
+    def _parse_typed(
+        self,
+        lines: Iterable[str],
+        header: Optional[List[str]] = None,
+        reject: Optional[OnReject] = None,
+    ) -> Iterator[List[Row]]:
+        lines = iter(lines)
+        if header is None:
+            first = next(lines, None)
+            if first is None:
+                return
+            header = next(csv.reader([first]))
+        parser = TypedRowParser(
+            header,
+            self._converters,
+            "continent" not in self._projected,
+            self.row_filter,
+            self._parse_row,
+            reject,
+        )
+        yield from parser.parse(lines)
+
+    def _reject(
+        self,
+        file_path: str,
+        line: Optional[int],
+        error: Exception,
+        row: Dict[str, str],
+    ) -> None:
+        # str(KeyError) берёт сообщение в кавычки, поэтому оно берётся из args.
+        reason = str(error.args[0]) if error.args else str(error)
+        self.reject_log.reject(file_path, line, reason, row)
 
     def _process_row(self, row: Dict[str, str]) -> None:
+        country, entry = self._parse_row(row)
+        self.data[country].append(entry)
+
+    def _parse_row(self, row: Dict[str, str]) -> Row:
         try:
-            country = row["country"].strip()
+            for name in self._required:
+                if row[name] is None:
+                    raise ValueError(f"нет значения в столбце '{name}'")
+            country = COUNTRIES.intern(row["country"].strip())
+            if self._projected:
+                return country, self._parse_projected(row)
+
             entry: EconomicRecord = {
                 "year": int(row["year"]),
                 "gdp": float(row["gdp"]) if row["gdp"] else None,
@@ -38,12 +664,22 @@ class DataReader:
                     float(row["unemployment"]) if row["unemployment"] else None
                 ),
                 "population": int(row["population"]) if row["population"] else None,
-                "continent": row["continent"].strip(),
+                "continent": CONTINENTS.intern(row["continent"].strip()),
             }
-            self.data[country].append(entry)
+            return country, entry
         except KeyError as e:
             raise KeyError(f"Отсутствует ожидаемый столбец в данных: {e}")
         except ValueError as e:
             raise ValueError(
                 f"Ошибка преобразования данных в строке: {row}, ошибка: {e}"
             )
+
+    def _parse_projected(self, row: Dict[str, str]) -> EconomicRecord:
+        entry = EMPTY_RECORD.copy()
+        entry["year"] = int(row["year"])
+        for field, convert in self._converters:
+            value = row[field]
+            entry[field] = convert(value) if value else None  # type: ignore
+        if "continent" not in self._projected:
+            entry["continent"] = CONTINENTS.intern(row["continent"].strip())
+        return entry
@@ -0,0 +1,108 @@
+import heapq
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple, Type
+
+
+# NumPy импортируется только при расчёте движком numpy: импорт заметно
+# удлиняет запуск, а по умолчанию работает python-движок.
+@lru_cache(maxsize=None)
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - зависит от окружения
+        return None
+    return numpy
+
+
+class Engine(ABC):
+    name = ""
+
+    @abstractmethod
+    def group_sum_count(
+        self, codes: Sequence[int], values: Sequence[float], groups: int
+    ) -> Tuple[Sequence[float], Sequence[int]]:
+        pass
+
+    @abstractmethod
+    def argsort_desc(self, values: Sequence[float]) -> List[int]:
+        pass
+
+    @abstractmethod
+    def top_k_desc(self, values: Sequence[float], k: int) -> List[int]:
+        pass
+
+
+class PythonEngine(Engine):
+    name = "python"
+
+    def group_sum_count(
+        self, codes: Sequence[int], values: Sequence[float], groups: int
+    ) -> Tuple[Sequence[float], Sequence[int]]:
+        sums = [0.0] * groups
+        counts = [0] * groups
+
+        # NaN != NaN, поэтому пропуски отбрасываются без отдельной маски.
+        for code, value in zip(codes, values):
+            if value == value:
+                sums[code] += value
+                counts[code] += 1
+        return sums, counts
+
+    def argsort_desc(self, values: Sequence[float]) -> List[int]:
+        return sorted(range(len(values)), key=values.__getitem__, reverse=True)
+
+    def top_k_desc(self, values: Sequence[float], k: int) -> List[int]:
+        return heapq.nlargest(k, range(len(values)), key=values.__getitem__)
+
+
+class NumpyEngine(Engine):
+    name = "numpy"
+
+    def group_sum_count(
+        self, codes: Sequence[int], values: Sequence[float], groups: int
+    ) -> Tuple[Sequence[float], Sequence[int]]:
+        np = _numpy()
+        code_array = np.asarray(codes, dtype=np.intp)
+        value_array = np.asarray(values, dtype=np.float64)
+        valid = ~np.isnan(value_array)
+
+        # bincount складывает веса последовательно, в порядке строк,
+        # поэтому суммы совпадают с python-движком бит в бит.
+        sums = np.bincount(
+            code_array[valid], weights=value_array[valid], minlength=groups
+        )
+        counts = np.bincount(code_array[valid], minlength=groups)
+        return sums.tolist(), counts.tolist()
+
+    def argsort_desc(self, values: Sequence[float]) -> List[int]:
+        np = _numpy()
+        order = np.argsort(-np.asarray(values, dtype=np.float64), kind="stable")
+        return order.tolist()
+
+    def top_k_desc(self, values: Sequence[float], k: int) -> List[int]:
+        np = _numpy()
+        negated = -np.asarray(values, dtype=np.float64)
+        if k >= len(negated):
+            return self.argsort_desc(values)
+
+        # Кандидаты — всё не хуже k-го значения, включая равные ему;
+        # устойчивая сортировка кандидатов сохраняет порядок при равенстве.
+        threshold = np.partition(negated, k - 1)[k - 1]
+        candidates = np.flatnonzero(negated <= threshold)
+        order = candidates[np.argsort(negated[candidates], kind="stable")]
+        return order[:k].tolist()
+
+
+ENGINES: Dict[str, Type[Engine]] = {
+    "python": PythonEngine,
+    "numpy": NumpyEngine,
+}
+
+
+def get_engine(name: str) -> Engine:
+    if name not in ENGINES:
+        raise ValueError(f"Неизвестный движок: {name}")
+    if name == "numpy" and _numpy() is None:
+        return PythonEngine()
+    return ENGINES[name]()
@@ -0,0 +1,88 @@
+from typing import Dict, FrozenSet, Iterable, Iterator, Optional, Tuple
+
+from src.reports.base import EconomicRecord
+
+YearRange = Tuple[Optional[int], Optional[int]]
+
+Record = Tuple[str, EconomicRecord]
+
+
+# Фильтр строк по ключевым столбцам. Проверяется до преобразования
+# числовых полей, поэтому отброшенные строки почти ничего не стоят.
+class RowFilter:
+    def __init__(
+        self,
+        years: Optional[YearRange] = None,
+        countries: Optional[Iterable[str]] = None,
+        continents: Optional[Iterable[str]] = None,
+    ):
+        first, last = years or (None, None)
+        self.first_year = first
+        self.last_year = last
+        self.countries: Optional[FrozenSet[str]] = (
+            frozenset(countries) if countries else None
+        )
+        self.continents: Optional[FrozenSet[str]] = (
+            frozenset(continents) if continents else None
+        )
+
+    @property
+    def years(self) -> Optional[YearRange]:
+        if self.first_year is None and self.last_year is None:
+            return None
+        return self.first_year, self.last_year
+
+    def __bool__(self) -> bool:
+        return bool(self.years or self.countries or self.continents)
+
+    def key(self) -> str:
+        # Строка для ключей кэша и состояния: разные фильтры не должны
+        # подменять результаты друг друга.
+        if not self:
+            return ""
+        first = "" if self.first_year is None else self.first_year
+        last = "" if self.last_year is None else self.last_year
+        parts = [
+            f"years={first}-{last}",
+            "countries=" + "|".join(sorted(self.countries or ())),
+            "continents=" + "|".join(sorted(self.continents or ())),
+        ]
+        return ";".join(parts)
+
+    def _year_ok(self, year: int) -> bool:
+        if self.first_year is not None and year < self.first_year:
+            return False
+        return self.last_year is None or year <= self.last_year
+
+    def accepts(self, row: Dict[str, str]) -> bool:
+        # Строки с ошибками (в том числе короткие, где вместо значения
+        # None) пропускаются дальше, чтобы разбор строки сообщил о них
+        # как обычно.
+        try:
+            if self.countries and row["country"].strip() not in self.countries:
+                return False
+            if self.continents and row["continent"].strip() not in self.continents:
+                return False
+            if self.years:
+                return self._year_ok(int(row["year"]))
+        except (KeyError, ValueError, TypeError, AttributeError):
+            return True
+        return True
+
+    def accepts_record(self, country: str, record: EconomicRecord) -> bool:
+        return self.accepts_key(country, record["year"], record["continent"])
+
+    def accepts_key(self, country: str, year: int, continent: str) -> bool:
+        if self.countries and country not in self.countries:
+            return False
+        if self.continents and continent not in self.continents:
+            return False
+        return not self.years or self._year_ok(year)
+
+    def rows(self, rows: Iterable[Dict[str, str]]) -> Iterable[Dict[str, str]]:
+        return filter(self.accepts, rows) if self else rows
+
+    def records(self, rows: Iterable[Record]) -> Iterator[Record]:
+        for country, record in rows:
+            if self.accepts_record(country, record):
+                yield country, record
@@ -0,0 +1,177 @@
+import copy
+import hashlib
+import json
+import os
+import tempfile
+from itertools import chain
+from typing import Any, BinaryIO, Dict, List, Optional, Type
+
+from src.data_reader import DataReader, Row
+from src.profiling import NullProfiler, Profiler
+from src.reports.base import BaseReport, ReportOptions, StreamingReport
+from src.streaming import ReportOutcome, create_reports, feed, finalize
+
+STATE_VERSION = 1
+
+# Сколько байт в начале файла и перед сохранённым смещением сверяется,
+# чтобы заметить перезапись файла.
+FINGERPRINT_SIZE = 64 * 1024
+
+FileMarker = Dict[str, Any]
+
+
+def _digest(f: BinaryIO, start: int, end: int) -> str:
+    f.seek(start)
+    return hashlib.blake2b(f.read(end - start), digest_size=16).hexdigest()
+
+
+def _file_marker(file_path: str, offset: int) -> FileMarker:
+    with open(file_path, "rb") as f:
+        return {
+            "offset": offset,
+            "head": _digest(f, 0, min(offset, FINGERPRINT_SIZE)),
+            "tail": _digest(f, max(0, offset - FINGERPRINT_SIZE), offset),
+        }
+
+
+def _is_append_only(file_path: str, marker: FileMarker) -> bool:
+    if os.path.getsize(file_path) < marker["offset"]:
+        return False
+    return _file_marker(file_path, marker["offset"]) == marker
+
+
+def _complete_end(file_path: str) -> int:
+    # Недописанная последняя строка будет прочитана в следующий запуск.
+    with open(file_path, "rb") as f:
+        end = os.fstat(f.fileno()).st_size
+        while end > 0:
+            start = max(0, end - FINGERPRINT_SIZE)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline != -1:
+                return start + newline + 1
+            end = start
+    return 0
+
+
+def _read_tail(reader: DataReader, file_path: str, start: int) -> List[Row]:
+    # Последняя строка без перевода строки: в законченном файле это обычная
+    # строка, в дописываемом — возможно, недописанная. Она учитывается в
+    # текущем результате, но не в сохранённом смещении, поэтому после
+    # дописывания файла читается заново. Строка, которая не разбирается,
+    # считается недописанной и пропускается до следующего запуска.
+    try:
+        return list(reader.iter_range(file_path, start, os.path.getsize(file_path)))
+    except ValueError:
+        return []
+
+
+def load_state(state_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        return None
+    return state
+
+
+def save_state(state_path: str, state: Dict[str, Any]) -> None:
+    directory = os.path.dirname(os.path.abspath(state_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, state_path)
+
+
+def _resume_offsets(
+    state: Optional[Dict[str, Any]],
+    file_paths: List[str],
+    report_names: List[str],
+    fields: List[str],
+    row_filter: str,
+) -> Optional[Dict[str, int]]:
+    if state is None:
+        return None
+    if state["reports"].keys() != set(report_names) or state["fields"] != fields:
+        return None
+    if state.get("filter", "") != row_filter:
+        return None
+
+    files: Dict[str, FileMarker] = state["files"]
+    paths = [os.path.abspath(file_path) for file_path in file_paths]
+    if not set(files) <= set(paths):
+        return None
+
+    for path, marker in files.items():
+        if not os.path.exists(path) or not _is_append_only(path, marker):
+            return None
+    return {path: marker["offset"] for path, marker in files.items()}
+
+
+# Инкрементальный режим для файлов, в которые только дописывают строки:
+# в состоянии хранятся смещения файлов и накопители отчётов, поэтому
+# повторный запуск читает лишь новые байты. Если файл укоротился или
+# был перезаписан, отчёты пересчитываются целиком.
+def run_incremental(
+    reader: DataReader,
+    file_paths: List[str],
+    report_classes: List[Type[BaseReport]],
+    state_path: str,
+    options: Optional[ReportOptions] = None,
+    profiler: Optional[Profiler] = None,
+) -> List[ReportOutcome]:
+    profiler = profiler or NullProfiler()
+    report_names = [ReportClass.__name__ for ReportClass in report_classes]
+    fields = list(reader.fields)
+    row_filter = reader.row_filter.key()
+    state = load_state(state_path)
+    offsets = _resume_offsets(state, file_paths, report_names, fields, row_filter)
+
+    slots = create_reports(report_classes, options)
+    if state is not None and offsets is not None:
+        for name, slot in zip(report_names, slots):
+            if isinstance(slot, StreamingReport):
+                slot.set_state(state["reports"][name])
+    else:
+        offsets = {}
+
+    markers: Dict[str, FileMarker] = {}
+    tails: List[List[Row]] = []
+    for file_path in file_paths:
+        path = os.path.abspath(file_path)
+        if path in markers:
+            continue
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Файл не найден: {file_path}")
+
+        end = _complete_end(file_path)
+        rows = reader.iter_range(file_path, offsets.get(path, 0), end)
+        feed(rows, slots, profiler)
+        markers[path] = _file_marker(file_path, end)
+        with profiler.stage("read"):
+            tails.append(_read_tail(reader, file_path, end))
+
+    # Состояние сохраняется без строк после последнего перевода строки.
+    reports: Optional[Dict[str, Any]] = None
+    if all(isinstance(slot, StreamingReport) for slot in slots):
+        reports = {
+            name: copy.deepcopy(slot.get_state())  # type: ignore[union-attr]
+            for name, slot in zip(report_names, slots)
+        }
+    feed(chain.from_iterable(tails), slots, profiler)
+    outcomes = finalize(report_classes, slots, profiler)
+
+    if reports is not None:
+        save_state(
+            state_path,
+            {
+                "version": STATE_VERSION,
+                "fields": fields,
+                "filter": row_filter,
+                "files": markers,
+                "reports": reports,
+            },
+        )
+    return outcomes
@@ -0,0 +1,248 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+
+from src.data_reader import (
+    FIELD_CONVERTERS,
+    DataReader,
+    FileRange,
+    Row,
+    _is_plain,
+    _iter_range_rows,
+    _split_file,
+)
+from src.filters import RowFilter
+from src.reports.base import (
+    BaseReport,
+    GroupStats,
+    ReportOptions,
+    StreamingReport,
+)
+from src.streaming import ReportOutcome, create_reports, finalize
+
+INDEX_VERSION = 1
+
+INDEX_SUFFIX = ".idx"
+
+BLOCK_SIZE = 1024 * 1024
+
+# Сколько байт в начале и в конце файла хэшируется для проверки,
+# что индекс построен по текущему содержимому.
+FINGERPRINT_SIZE = 64 * 1024
+
+GroupKey = Tuple[str, int, str]
+
+
+def index_path(file_path: str) -> str:
+    return file_path + INDEX_SUFFIX
+
+
+def _source_marker(file_path: str) -> Dict[str, Any]:
+    with open(file_path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        digest = hashlib.blake2b(f.read(FINGERPRINT_SIZE), digest_size=16)
+        f.seek(max(0, stat.st_size - FINGERPRINT_SIZE))
+        digest.update(f.read())
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "digest": digest.hexdigest(),
+    }
+
+
+def _update_stats(stats: GroupStats, field: str, value: Any) -> None:
+    summary = stats.get(field)
+    if summary is None:
+        summary = stats[field] = [0, 0, None, None]
+    if value is None:
+        return
+    summary[0] += value
+    summary[1] += 1
+    if summary[2] is None or value < summary[2]:
+        summary[2] = value
+    if summary[3] is None or value > summary[3]:
+        summary[3] = value
+
+
+# Индекс строится за один проход: файл делится на блоки по границам
+# строк, для каждого блока запоминаются страны, континенты и диапазон
+# лет, а для каждой тройки (страна, год, континент) — сумма, количество,
+# минимум и максимум числовых полей.
+def build_index(file_path: str, block_size: int = BLOCK_SIZE) -> Dict[str, Any]:
+    if not _is_plain(file_path):
+        raise ValueError("индекс строится только для несжатых CSV-файлов")
+
+    marker = _source_marker(file_path)
+    reader = DataReader()
+    names: Dict[str, int] = {}
+    groups: Dict[GroupKey, GroupStats] = {}
+    blocks: List[List[Any]] = []
+
+    def code(name: str) -> int:
+        return names.setdefault(name, len(names))
+
+    for _, start, end in _split_file(file_path, block_size):
+        countries = set()
+        continents = set()
+        years: List[int] = []
+        for row in _iter_range_rows(file_path, start, end):
+            country, entry = reader._parse_row(row)
+            countries.add(code(country))
+            continents.add(code(entry["continent"]))
+            years.append(entry["year"])
+
+            key = (country, entry["year"], entry["continent"])
+            stats = groups.setdefault(key, {})
+            for field in FIELD_CONVERTERS:
+                _update_stats(stats, field, entry[field])  # type: ignore
+        if years:
+            blocks.append(
+                [
+                    start,
+                    end,
+                    min(years),
+                    max(years),
+                    sorted(countries),
+                    sorted(continents),
+                ]
+            )
+
+    return {
+        "version": INDEX_VERSION,
+        "source": marker,
+        "names": list(names),
+        "blocks": blocks,
+        "groups": [[*key, stats] for key, stats in groups.items()],
+    }
+
+
+def write_index(file_path: str, block_size: int = BLOCK_SIZE) -> Dict[str, Any]:
+    index = build_index(file_path, block_size)
+    path = index_path(file_path)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return index
+
+
+def load_index(file_path: str) -> Optional[Dict[str, Any]]:
+    # Индекс от другой версии файла молча игнорируется: чтение идёт
+    # обычным путём, пока индекс не перестроят.
+    try:
+        with open(index_path(file_path), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != INDEX_VERSION:
+            return None
+        if index["source"] != _source_marker(file_path):
+            return None
+    except (OSError, ValueError, KeyError, AttributeError):
+        return None
+    return index
+
+
+def _block_matches(block: List[Any], names: List[str], row_filter: RowFilter) -> bool:
+    _, _, first, last, countries, continents = block
+    if row_filter.first_year is not None and last < row_filter.first_year:
+        return False
+    if row_filter.last_year is not None and first > row_filter.last_year:
+        return False
+    if row_filter.countries and not row_filter.countries & {
+        names[code] for code in countries
+    }:
+        return False
+    if row_filter.continents and not row_filter.continents & {
+        names[code] for code in continents
+    }:
+        return False
+    return True
+
+
+def index_ranges(
+    file_path: str, index: Dict[str, Any], row_filter: RowFilter
+) -> List[FileRange]:
+    # Блоки, в которых заведомо нет подходящих строк, пропускаются;
+    # соседние подходящие блоки читаются одним диапазоном.
+    ranges: List[FileRange] = []
+    for block in index["blocks"]:
+        if not _block_matches(block, index["names"], row_filter):
+            continue
+        start, end = block[0], block[1]
+        if ranges and ranges[-1][2] == start:
+            ranges[-1] = (file_path, ranges[-1][1], end)
+        else:
+            ranges.append((file_path, start, end))
+    return ranges
+
+
+# Отчёты по сводкам индекса, без чтения строк. None — если хотя бы
+# для одного файла нет актуального индекса, какой-то отчёт не умеет
+# считаться по сводкам или под фильтр не попала ни одна группа.
+def answer_from_index(
+    file_paths: List[str],
+    report_classes: List[Type[BaseReport]],
+    row_filter: Optional[RowFilter] = None,
+    options: Optional[ReportOptions] = None,
+) -> Optional[List[ReportOutcome]]:
+    row_filter = row_filter or RowFilter()
+    for ReportClass in report_classes:
+        if not (issubclass(ReportClass, StreamingReport) and ReportClass.aggregatable):
+            return None
+
+    indexes = []
+    for file_path in file_paths:
+        index = load_index(file_path) if os.path.exists(file_path) else None
+        if index is None:
+            return None
+        indexes.append(index)
+
+    groups = [
+        (country, stats)
+        for index in indexes
+        for country, year, continent, stats in index["groups"]
+        if row_filter.accepts_key(country, year, continent)
+    ]
+    if not groups:
+        return None
+
+    slots = create_reports(report_classes, options)
+    for position, slot in enumerate(slots):
+        if isinstance(slot, StreamingReport):
+            try:
+                for country, stats in groups:
+                    slot.add_aggregate(country, stats)
+            except Exception as e:
+                slots[position] = e
+    return finalize(report_classes, slots)
+
+
+# Чтение с фильтром по актуальному индексу: читаются только блоки,
+# в которых могут быть подходящие строки. Без индекса или без фильтра
+# файл читается целиком, как обычно.
+class IndexedDataReader(DataReader):
+    def _index_ranges(self, file_path: str) -> Optional[List[FileRange]]:
+        if not self.row_filter or not _is_plain(file_path):
+            return None
+        index = load_index(file_path)
+        if index is None:
+            return None
+        return index_ranges(file_path, index, self.row_filter)
+
+    def _read_single_file(self, file_path: str) -> None:
+        ranges = self._index_ranges(file_path)
+        if ranges is None:
+            super()._read_single_file(file_path)
+            return
+        for _, start, end in ranges:
+            self._merge_rows(self.iter_range(file_path, start, end))
+
+    def _iter_single_file(self, file_path: str) -> Iterator[Row]:
+        ranges = self._index_ranges(file_path)
+        if ranges is None:
+            yield from super()._iter_single_file(file_path)
+            return
+        for _, start, end in ranges:
+            yield from self.iter_range(file_path, start, end)
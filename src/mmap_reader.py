@@ -0,0 +1,38 @@
+import io
+import mmap
+import os
+from typing import Iterator, Optional
+
+BLOCK_SIZE = 4 * 1024 * 1024
+
+
+# Чтение CSV через mmap: файл отображается в память и декодируется
+# блоками по BLOCK_SIZE, выровненными по переводам строк, без копирования
+# через буфер файла. Первой отдаётся строка заголовка, затем строки
+# диапазона [start, end) (по умолчанию — всего файла); разбирает их тот же
+# TypedRowParser, что и обычное чтение.
+def scan_lines(
+    file_path: str, start: Optional[int] = None, end: Optional[int] = None
+) -> Iterator[str]:
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header_end = mm.find(b"\n")
+            if header_end == -1:
+                header_end = size
+            yield mm[: header_end + 1].decode("utf-8")
+
+            pos = header_end + 1 if start is None else max(start, header_end + 1)
+            stop = size if end is None else end
+            while pos < stop:
+                block_end = min(pos + BLOCK_SIZE, stop)
+                if block_end < stop:
+                    newline = mm.find(b"\n", block_end, stop)
+                    block_end = stop if newline == -1 else newline + 1
+
+                # StringIO делит текст только по "\n", как и _split_file.
+                yield from io.StringIO(mm[pos:block_end].decode("utf-8"))
+                pos = block_end
@@ -0,0 +1,175 @@
+import csv
+import json
+import os
+import sys
+from abc import ABC, abstractmethod
+from itertools import islice
+from typing import IO, Any, Dict, List, Optional, Type
+
+from tabulate import tabulate  # type: ignore
+
+from src.reports.base import BaseReport, ReportResult
+
+# Сколько первых строк используется для расчёта ширины столбцов
+# в потоковом выводе фиксированной ширины.
+WIDTH_SAMPLE = 1000
+
+
+def report_title(ReportClass: Type[BaseReport]) -> str:
+    return ReportClass.__name__.replace("Report", "")
+
+
+def _format_cell(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    if value is None:
+        return ""
+    return str(value)
+
+
+class Renderer(ABC):
+    # Машинные форматы пишут служебные сообщения в stderr,
+    # чтобы не портить вывод.
+    machine = False
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.stream: IO[str] = (
+            open(path, "w", encoding="utf-8", newline="") if path else sys.stdout
+        )
+
+    @abstractmethod
+    def write(self, ReportClass: Type[BaseReport], rows: ReportResult) -> None:
+        pass
+
+    def message(self, text: str) -> None:
+        print(text, file=sys.stderr if self.machine else self.stream)
+
+    def close(self) -> None:
+        if self.path:
+            self.stream.close()
+
+    def __enter__(self) -> "Renderer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class TableRenderer(Renderer):
+    def write(self, ReportClass: Type[BaseReport], rows: ReportResult) -> None:
+        table = tabulate(
+            rows,
+            headers="keys",
+            tablefmt="github",
+            floatfmt=".2f",
+            showindex=range(1, len(rows) + 1),
+        )
+        print(f"\n--- Отчёт: {report_title(ReportClass)} ---", file=self.stream)
+        print(table, file=self.stream)
+
+
+# Таблица фиксированной ширины: ширина столбцов считается по первым
+# WIDTH_SAMPLE строкам, дальше строки пишутся по одной без сборки
+# всей таблицы в памяти.
+class FixedWidthRenderer(Renderer):
+    def write(self, ReportClass: Type[BaseReport], rows: ReportResult) -> None:
+        headers = ["", *rows[0]]
+        sample = [
+            [str(index), *map(_format_cell, row.values())]
+            for index, row in enumerate(rows[:WIDTH_SAMPLE], start=1)
+        ]
+        widths = [
+            max(len(header), *(len(cells[i]) for cells in sample))
+            for i, header in enumerate(headers)
+        ]
+        numeric = [True] + [not isinstance(value, str) for value in rows[0].values()]
+
+        def line(cells: List[str]) -> str:
+            return "  ".join(
+                cell.rjust(width) if is_number else cell.ljust(width)
+                for cell, width, is_number in zip(cells, widths, numeric)
+            ).rstrip()
+
+        write = self.stream.write
+        write(f"\n--- Отчёт: {report_title(ReportClass)} ---\n")
+        write(line(headers) + "\n")
+        write("  ".join("-" * width for width in widths) + "\n")
+        for cells in sample:
+            write(line(cells) + "\n")
+        rest = islice(rows, WIDTH_SAMPLE, None)
+        for index, row in enumerate(rest, start=WIDTH_SAMPLE + 1):
+            write(line([str(index), *map(_format_cell, row.values())]) + "\n")
+
+
+class CsvRenderer(Renderer):
+    machine = True
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__(path)
+        self.written = 0
+
+    def write(self, ReportClass: Type[BaseReport], rows: ReportResult) -> None:
+        if self.written:
+            self.stream.write("\n")
+        writer = csv.DictWriter(self.stream, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+        self.written += 1
+
+
+class JsonLinesRenderer(Renderer):
+    machine = True
+
+    def write(self, ReportClass: Type[BaseReport], rows: ReportResult) -> None:
+        title = report_title(ReportClass)
+        for row in rows:
+            self.stream.write(
+                json.dumps({"report": title, **row}, ensure_ascii=False) + "\n"
+            )
+
+
+# Parquet пишется только в файл; для нескольких отчётов к имени
+# файла добавляется название отчёта.
+class ParquetRenderer(Renderer):
+    machine = True
+
+    def __init__(self, path: Optional[str] = None):
+        if not path:
+            raise ValueError("Для формата parquet нужно указать --output-file")
+        try:
+            import pyarrow  # type: ignore  # noqa: F401
+        except ImportError:
+            raise ValueError("Для формата parquet требуется пакет pyarrow")
+        self.path = path
+        self.stream = sys.stdout
+        self.written: Dict[str, int] = {}
+
+    def write(self, ReportClass: Type[BaseReport], rows: ReportResult) -> None:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+
+        path = self.path or ""
+        if self.written:
+            stem, suffix = os.path.splitext(path)
+            path = f"{stem}-{report_title(ReportClass)}{suffix}"
+        pq.write_table(pa.Table.from_pylist(rows), path)
+        self.written[path] = len(rows)
+
+    def close(self) -> None:
+        pass
+
+
+RENDERERS: Dict[str, Type[Renderer]] = {
+    "table": TableRenderer,
+    "fixed": FixedWidthRenderer,
+    "csv": CsvRenderer,
+    "jsonl": JsonLinesRenderer,
+    "parquet": ParquetRenderer,
+}
+
+
+def create_renderer(output_format: str, path: Optional[str] = None) -> Renderer:
+    if output_format not in RENDERERS:
+        raise ValueError(f"Неизвестный формат вывода: {output_format}")
+    return RENDERERS[output_format](path)
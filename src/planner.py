@@ -0,0 +1,91 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Type, Union
+
+from src.columnar import ColumnarData
+from src.data_reader import Row
+from src.engines import Engine
+from src.profiling import NullProfiler, Profiler
+from src.reports.base import (
+    BaseReport,
+    EconomicData,
+    ReportOptions,
+    ReportResult,
+    StreamingReport,
+)
+from src.shared import run_parallel
+from src.streaming import ReportOutcome, run_streaming
+
+Source = Union[EconomicData, ColumnarData, Iterable[Row]]
+
+
+def iter_records(data: EconomicData) -> Iterator[Row]:
+    for country, records in data.items():
+        for record in records:
+            yield country, record
+
+
+# Планировщик отчётов: накопители всех потоковых отчётов заполняются
+# за один общий проход по данным, после чего каждый отчёт получает свой
+# результат. Повторно запрошенный отчёт считается один раз.
+def run_reports(
+    source: Source,
+    report_classes: List[Type[BaseReport]],
+    engine: Optional[Engine] = None,
+    profiler: Optional[Profiler] = None,
+    parallel: bool = False,
+    options: Optional[ReportOptions] = None,
+) -> List[ReportOutcome]:
+    profiler = profiler or NullProfiler()
+    options = options or {}
+    unique = list(dict.fromkeys(report_classes))
+    results: Dict[Type[BaseReport], Union[ReportResult, Exception]] = {}
+
+    if isinstance(source, ColumnarData) and parallel and len(unique) > 1:
+        with profiler.stage("generate:parallel"):
+            results.update(run_parallel(source, unique, engine, options))
+        return [(cls, results[cls]) for cls in report_classes]
+
+    if isinstance(source, ColumnarData):
+        for ReportClass in unique:
+            with profiler.stage(f"generate:{ReportClass.__name__}"):
+                results[ReportClass] = _generate_columnar(
+                    ReportClass, source, engine, options
+                )
+        return [(cls, results[cls]) for cls in report_classes]
+
+    if isinstance(source, dict):
+        fused: List[Type[BaseReport]] = [
+            cls for cls in unique if issubclass(cls, StreamingReport)
+        ]
+        with profiler.stage("generate:fused"):
+            results.update(run_streaming(iter_records(source), fused, options))
+    else:
+        # Строки читаются по мере подачи в отчёты: профилировщик делит
+        # время на чтение и работу каждого отчёта.
+        results.update(run_streaming(source, unique, options, profiler))
+
+    for ReportClass in unique:
+        if ReportClass not in results and isinstance(source, dict):
+            with profiler.stage(f"generate:{ReportClass.__name__}"):
+                results[ReportClass] = _generate(ReportClass, source, options)
+    return [(cls, results[cls]) for cls in report_classes]
+
+
+def _generate(
+    ReportClass: Type[BaseReport], data: EconomicData, options: ReportOptions
+) -> Union[ReportResult, Exception]:
+    try:
+        return ReportClass(**options).generate(data)
+    except Exception as e:
+        return e
+
+
+def _generate_columnar(
+    ReportClass: Type[BaseReport],
+    data: ColumnarData,
+    engine: Optional[Engine],
+    options: ReportOptions,
+) -> Union[ReportResult, Exception]:
+    try:
+        return ReportClass(**options).generate_columnar(data, engine)
+    except Exception as e:
+        return e
@@ -0,0 +1,64 @@
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, DefaultDict, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+class Profiler:
+    def __init__(self) -> None:
+        self.timings: DefaultDict[str, float] = defaultdict(float)
+        self.counters: DefaultDict[str, int] = defaultdict(int)
+
+    @contextmanager
+    def _measure(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - started
+
+    def stage(self, name: str) -> ContextManager[None]:
+        return self._measure(name)
+
+    def count(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+
+    def counted(self, items: Iterable[T], name: str) -> Iterator[T]:
+        count = 0
+        try:
+            for item in items:
+                count += 1
+                yield item
+        finally:
+            self.counters[name] += count
+
+    def summary(self) -> str:
+        lines = ["--- Профиль ---"]
+        lines.extend(f"{name}: {sec:.4f} с" for name, sec in self.timings.items())
+        lines.extend(f"{name}: {value}" for name, value in self.counters.items())
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "timings": {k: round(v, 6) for k, v in self.timings.items()},
+                "counters": dict(self.counters),
+            },
+            ensure_ascii=False,
+        )
+
+
+# Выключенный профилировщик: этапы и счётчики ничего не делают,
+# итераторы возвращаются без обёртки.
+class NullProfiler(Profiler):
+    def stage(self, name: str) -> ContextManager[None]:
+        return nullcontext()
+
+    def count(self, name: str, value: int = 1) -> None:
+        pass
+
+    def counted(self, items: Iterable[T], name: str) -> Iterator[T]:
+        return iter(items)
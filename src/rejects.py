@@ -0,0 +1,53 @@
+import csv
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+ON_ERROR_MODES = ("fail", "skip", "log")
+
+# (файл, номер строки, причина, исходная строка в JSON)
+Reject = Tuple[str, Optional[int], str, str]
+
+
+# Журнал отброшенных строк: считает их по файлам и, если задан путь,
+# пишет в CSV-файл по мере поступления, не накапливая в памяти.
+class RejectLog:
+    def __init__(self, path: Optional[str] = None, keep: bool = False):
+        self.path = path
+        self.counts: Dict[str, int] = {}
+        # keep — копить записи в памяти, чтобы передать их из
+        # процесса-обработчика в основной процесс.
+        self.entries: Optional[List[Reject]] = [] if keep else None
+        self.stream = open(path, "w", encoding="utf-8", newline="") if path else None
+        self.writer = csv.writer(self.stream) if self.stream else None
+        if self.writer:
+            self.writer.writerow(["file", "line", "reason", "row"])
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def add(self, reject: Reject) -> None:
+        file_path = reject[0]
+        self.counts[file_path] = self.counts.get(file_path, 0) + 1
+        if self.writer:
+            self.writer.writerow(reject)
+        if self.entries is not None:
+            self.entries.append(reject)
+
+    def reject(
+        self, file_path: str, line: Optional[int], reason: str, row: Any
+    ) -> None:
+        raw = json.dumps(row, ensure_ascii=False, default=str)
+        self.add((file_path, line, reason, raw))
+
+    def extend(self, rejects: List[Reject]) -> None:
+        for reject in rejects:
+            self.add(reject)
+
+    def summary(self) -> str:
+        files = ", ".join(f"{path}: {count}" for path, count in self.counts.items())
+        return f"Отброшено строк: {self.total} ({files})"
+
+    def close(self) -> None:
+        if self.stream:
+            self.stream.close()
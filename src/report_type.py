@@ -1,18 +1,23 @@
-from typing import Dict, List, Type
+from typing import Dict, List, Tuple, Type
 
 from src.reports.average_gdp import AverageGdpReport
-from src.reports.base import BaseReport
+from src.reports.base import ECONOMIC_FIELDS, BaseReport
 
+AVAILABLE_REPORTS: Dict[str, Type[BaseReport]] = {
+    "average-gdp": AverageGdpReport,
+}
 
-def generate_report(report_names: List[str]) -> List[Type[BaseReport]]:
-    available_reports: Dict[str, Type[BaseReport]] = {
-        "average-gdp": AverageGdpReport,
-    }
 
+def generate_report(report_names: List[str]) -> List[Type[BaseReport]]:
     reports: List[Type[BaseReport]] = []
     for name in report_names:
-        if name in available_reports:
-            reports.append(available_reports[name])
+        if name in AVAILABLE_REPORTS:
+            reports.append(AVAILABLE_REPORTS[name])
         else:
             raise ValueError(f"Неизвестный тип отчёта: {name}")
     return reports
+
+
+def required_fields(report_classes: List[Type[BaseReport]]) -> Tuple[str, ...]:
+    requested = {field for cls in report_classes for field in cls.fields}
+    return tuple(field for field in ECONOMIC_FIELDS if field in requested)
@@ -1,27 +1,131 @@
-from typing import Dict, List, Union
+import math
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
 
-from src.reports.base import BaseReport, EconomicData
+from src.engines import Engine, PythonEngine
+from src.reports.base import (
+    EconomicRecord,
+    GroupStats,
+    ReportResult,
+    StreamingReport,
+)
 
+if TYPE_CHECKING:
+    from src.columnar import ColumnarData
 
-class AverageGdpReport(BaseReport):
-    def generate(self, data: EconomicData) -> List[Dict[str, Union[str, float]]]:
+# Квантиль нормального распределения для 95% доверительного интервала.
+Z95 = 1.96
 
-        result: List[Dict[str, Union[str, float]]] = []
 
-        for country, records in data.items():
-            gdp_values = [r["gdp"] for r in records if r["gdp"] is not None]
+def _ci95(count: int, m2: float) -> Optional[float]:
+    # Полуширина интервала для среднего по выборке; по одному значению
+    # дисперсию не оценить.
+    if count < 2:
+        return None
+    return round(Z95 * math.sqrt(m2 / (count - 1) / count), 2)
 
-            if not gdp_values:
-                continue
 
-            avg_gdp = sum(gdp_values) / len(gdp_values)
-            result.append(
+class AverageGdpReport(StreamingReport):
+    fields = ("gdp",)
+    aggregatable = True
+    spillable = True
+
+    def reset(self) -> None:
+        # страна -> [сумма ВВП, количество значений]
+        self.totals: Dict[str, List[float]] = {}
+        # страна -> [количество, среднее, сумма квадратов отклонений]
+        # для приближённого режима (алгоритм Уэлфорда)
+        self.moments: Dict[str, List[float]] = {}
+
+    def add(self, country: str, record: EconomicRecord) -> None:
+        if self.approx:
+            self._add_sample(country, record["gdp"])
+            return
+
+        totals = self.totals.get(country)
+        if totals is None:
+            totals = self.totals[country] = [0.0, 0]
+
+        gdp = record["gdp"]
+        if gdp is not None:
+            totals[0] += gdp
+            totals[1] += 1
+
+    def _add_sample(self, country: str, gdp: Optional[float]) -> None:
+        moments = self.moments.get(country)
+        if moments is None:
+            moments = self.moments[country] = [0, 0.0, 0.0]
+
+        if gdp is not None:
+            moments[0] += 1
+            delta = gdp - moments[1]
+            moments[1] += delta / moments[0]
+            moments[2] += delta * (gdp - moments[1])
+
+    def add_aggregate(self, country: str, stats: GroupStats) -> None:
+        totals = self.totals.get(country)
+        if totals is None:
+            totals = self.totals[country] = [0.0, 0]
+
+        gdp_sum, gdp_count = stats["gdp"][:2]
+        totals[0] += gdp_sum
+        totals[1] += gdp_count
+
+    def get_state(self) -> Any:
+        return self.totals
+
+    def set_state(self, state: Any) -> None:
+        self.totals = {
+            country: [float(gdp_sum), int(gdp_count)]
+            for country, (gdp_sum, gdp_count) in state.items()
+        }
+
+    def combine_states(self, first: Any, second: Any) -> Any:
+        return [first[0] + second[0], first[1] + second[1]]
+
+    def generate_columnar(
+        self, data: "ColumnarData", engine: Optional[Engine] = None
+    ) -> ReportResult:
+        engine = engine or PythonEngine()
+        sums, counts = engine.group_sum_count(
+            data.country, data.gdp, len(data.countries)
+        )
+
+        codes = [code for code in range(len(data.countries)) if counts[code]]
+        averages = [round(sums[code] / counts[code], 2) for code in codes]
+
+        return [
+            {
+                "country": data.countries.decode(codes[index]),
+                "avg_gdp": averages[index],
+            }
+            for index in self.rank(engine, averages)
+        ]
+
+    def finalize(self) -> ReportResult:
+        if self.approx:
+            samples = (
                 {
                     "country": country,
-                    "avg_gdp": round(avg_gdp, 2),
+                    "avg_gdp": round(mean, 2),
+                    "ci95": _ci95(int(count), m2),
                 }
+                for country, (count, mean, m2) in self.moments.items()
+                if count
             )
+            return self.sort_rows(samples, "avg_gdp")
 
-        result.sort(key=lambda x: x["avg_gdp"], reverse=True)
+        rows = (
+            {"country": country, "avg_gdp": round(gdp_sum / gdp_count, 2)}
+            for country, (gdp_sum, gdp_count) in self.totals.items()
+            if gdp_count
+        )
+        return self.sort_rows(rows, "avg_gdp")
 
-        return result
+    def finalize_groups(self, groups: Iterable[Tuple[str, int, Any]]) -> ReportResult:
+        # Генератор, а не список: с top/bottom в памяти остаётся только куча.
+        rows = (
+            (number, {"country": country, "avg_gdp": round(gdp_sum / gdp_count, 2)})
+            for country, number, (gdp_sum, gdp_count) in groups
+            if gdp_count
+        )
+        return self.sort_numbered(rows, "avg_gdp")
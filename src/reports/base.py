@@ -1,5 +1,23 @@
+import heapq
 from abc import ABC, abstractmethod
-from typing import Dict, List, TypedDict, Union
+from operator import itemgetter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypedDict,
+    Union,
+)
+
+if TYPE_CHECKING:
+    from src.columnar import ColumnarData
+    from src.engines import Engine
 
 
 class EconomicRecord(TypedDict):
@@ -14,9 +32,147 @@ class EconomicRecord(TypedDict):
 
 EconomicData = Dict[str, List[EconomicRecord]]
 
+ECONOMIC_FIELDS = (
+    "year",
+    "gdp",
+    "gdp_growth",
+    "inflation",
+    "unemployment",
+    "population",
+    "continent",
+)
+
+ReportResult = List[Dict[str, Union[str, float, None]]]
+
+# Сводка по группе строк: поле -> [сумма, количество, минимум, максимум].
+GroupStats = Dict[str, List[Any]]
+
+
+class ReportOptions(TypedDict, total=False):
+    top: int
+    bottom: int
+    approx: bool
+
 
 class BaseReport(ABC):
+    # Поля записи, которые читает отчёт; остальные можно не разбирать.
+    fields: ClassVar[Tuple[str, ...]] = ECONOMIC_FIELDS
+
+    def __init__(
+        self,
+        top: Optional[int] = None,
+        bottom: Optional[int] = None,
+        approx: bool = False,
+    ) -> None:
+        self.top = top
+        self.bottom = bottom
+        # Данные — случайная выборка: вместе со значением отчёт выводит
+        # оценку погрешности.
+        self.approx = approx
+
+    @abstractmethod
+    def generate(self, data: EconomicData) -> ReportResult:
+        pass
+
+    def generate_columnar(
+        self, data: "ColumnarData", engine: Optional["Engine"] = None
+    ) -> ReportResult:
+        return self.generate(data.to_records())
+
+    def sort_rows(self, rows: Iterable[Dict[str, Any]], key: str) -> ReportResult:
+        # С top/bottom достаточно ограниченной кучи на k строк:
+        # O(n log k) времени и O(k) памяти, если rows — генератор.
+        if self.top is not None:
+            return heapq.nlargest(self.top, rows, key=itemgetter(key))
+        if self.bottom is not None:
+            return heapq.nsmallest(self.bottom, rows, key=itemgetter(key))
+        return sorted(rows, key=itemgetter(key), reverse=True)
+
+    def sort_numbered(
+        self, rows: Iterable[Tuple[int, Dict[str, Any]]], key: str
+    ) -> ReportResult:
+        # Как sort_rows, но строки с равными значениями идут по номеру,
+        # а не в порядке rows.
+        ranked: Iterable[Tuple[int, Dict[str, Any]]]
+        if self.top is not None:
+            ranked = heapq.nlargest(
+                self.top, rows, key=lambda item: (item[1][key], -item[0])
+            )
+        elif self.bottom is not None:
+            ranked = heapq.nsmallest(
+                self.bottom, rows, key=lambda item: (item[1][key], item[0])
+            )
+        else:
+            ranked = sorted(
+                rows, key=lambda item: (item[1][key], -item[0]), reverse=True
+            )
+        return [row for _, row in ranked]
+
+    def rank(self, engine: "Engine", values: Sequence[float]) -> List[int]:
+        # Порядок индексов values для вывода, как у sort_rows.
+        if self.top is not None:
+            return engine.top_k_desc(values, self.top)
+        if self.bottom is not None:
+            return engine.top_k_desc([-value for value in values], self.bottom)
+        return engine.argsort_desc(values)
+
+
+# Отчёт с накопителем: строки подаются по одной через add, а память
+# ограничена числом групп, а не числом строк.
+class StreamingReport(BaseReport):
+    # Можно ли посчитать отчёт по готовым сводкам из индекса (add_aggregate).
+    aggregatable: ClassVar[bool] = False
+    # Можно ли выгружать накопитель по группам (--memory-limit):
+    # get_state — словарь группа -> частичный накопитель.
+    spillable: ClassVar[bool] = False
+
+    def __init__(
+        self,
+        top: Optional[int] = None,
+        bottom: Optional[int] = None,
+        approx: bool = False,
+    ) -> None:
+        super().__init__(top, bottom, approx)
+        self.reset()
 
     @abstractmethod
-    def generate(self, data: EconomicData) -> List[Dict[str, Union[str, float]]]:
+    def reset(self) -> None:
         pass
+
+    @abstractmethod
+    def add(self, country: str, record: EconomicRecord) -> None:
+        pass
+
+    @abstractmethod
+    def finalize(self) -> ReportResult:
+        pass
+
+    def add_aggregate(self, country: str, stats: GroupStats) -> None:
+        raise NotImplementedError("отчёт не поддерживает расчёт по сводкам")
+
+    # Состояние накопителя в JSON-совместимом виде (инкрементальный режим).
+    @abstractmethod
+    def get_state(self) -> Any:
+        pass
+
+    @abstractmethod
+    def set_state(self, state: Any) -> None:
+        pass
+
+    def groups(self) -> int:
+        return len(self.get_state())
+
+    def combine_states(self, first: Any, second: Any) -> Any:
+        raise NotImplementedError("отчёт не поддерживает ограничение памяти")
+
+    # Итог по потоку (группа, номер первого появления, накопитель) в
+    # порядке ключа группы; группы с равными значениями выводятся по номеру.
+    def finalize_groups(self, groups: Iterable[Tuple[Any, int, Any]]) -> ReportResult:
+        raise NotImplementedError("отчёт не поддерживает ограничение памяти")
+
+    def generate(self, data: EconomicData) -> ReportResult:
+        self.reset()
+        for country, records in data.items():
+            for record in records:
+                self.add(country, record)
+        return self.finalize()
@@ -0,0 +1,260 @@
+import csv
+import gc
+from contextlib import contextmanager
+from itertools import chain, compress, islice, repeat
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from src.columnar import CONTINENTS, COUNTRIES, interner
+from src.filters import Record, RowFilter
+from src.reports.base import ECONOMIC_FIELDS
+
+BATCH_SIZE = 4096
+
+Converter = Callable[[str], Any]
+
+Column = Callable[[int], Sequence[str]]
+
+# Номер строки пачки (с 1, без заголовка), ошибка и словарь строки.
+OnReject = Callable[[int, Exception, Dict[str, str]], None]
+
+
+def _convert(values: Sequence[str], convert: Converter) -> List[Any]:
+    # Пустые строки заменяются на None сразу для всего столбца; если
+    # пустых нет, столбец преобразуется одним map.
+    if "" in values:
+        return [convert(value) if value else None for value in values]
+    return list(map(convert, values))
+
+
+def _lookup(values: Sequence[str], convert: Converter) -> List[Any]:
+    # Для столбцов с немногими различными значениями (страна, континент,
+    # год) каждое значение преобразуется один раз на пачку, а столбец
+    # собирается поиском по словарю.
+    known = {value: convert(value) for value in set(values)}
+    return list(map(known.__getitem__, values))
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    # Записи пачки содержат только числа и строки и не образуют циклов,
+    # а большие списки пачки сборщик мусора обходил бы при каждой сборке
+    # молодого поколения.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def as_dict(header: List[str], values: List[str]) -> Dict[str, str]:
+    # Тот же словарь, что строит csv.DictReader: недостающие поля — None,
+    # лишние значения — списком под ключом None.
+    row: Dict = dict(zip(header, values))
+    width = len(header)
+    count = len(values)
+    if count > width:
+        row[None] = values[width:]
+    elif count < width:
+        for name in header[count:]:
+            row.setdefault(name, None)
+    return row
+
+
+# Разбор строк CSV с фиксированной схемой: заголовок один раз
+# сопоставляется с номерами столбцов, а строки преобразуются пачками,
+# по столбцу за раз. Пачка без кавычек режется на поля одним split по
+# всему тексту, без списка на каждую строку. Пачка, в которой что-то не
+# так (неверное число полей, ошибка преобразования, нет столбца),
+# разбирается построчно через fallback, поэтому ошибки и их сообщения те
+# же, что при разборе по словарям. С reject ошибка строки не прерывает
+# разбор: строка с её номером передаётся в reject, остальные строки пачки
+# разбираются дальше.
+class TypedRowParser:
+    def __init__(
+        self,
+        header: List[str],
+        converters: Sequence[Tuple[str, Converter]],
+        keep_continent: bool,
+        row_filter: RowFilter,
+        fallback: Callable[[Dict[str, str]], Record],
+        reject: Optional[OnReject] = None,
+    ):
+        self.header = header
+        self.width = len(header)
+        self.row_filter = row_filter
+        self.fallback = fallback
+        self.reject = reject
+        # При повторах имени csv.DictReader берёт последний столбец.
+        positions = {name: index for index, name in enumerate(header)}
+        needed = ["country", "year", *(field for field, _ in converters)]
+        if keep_continent:
+            needed.append("continent")
+        self.complete = all(name in positions for name in needed)
+        self.country_name = interner(COUNTRIES)
+        self.continent_name = interner(CONTINENTS)
+        self.country = positions.get("country", 0)
+
+        # Третий элемент — обязательное поле: пустое значение в нём не
+        # заменяется на None, а отправляет пачку на построчный разбор, где
+        # строка завершится той же ошибкой, что и при разборе по словарям.
+        converted = dict(converters)
+        self.columns: List[Tuple[Optional[int], Optional[Converter], bool]] = []
+        for field in ECONOMIC_FIELDS:
+            if field == "year":
+                self.columns.append((positions.get("year"), int, True))
+            elif field == "continent":
+                index = positions.get("continent") if keep_continent else None
+                self.columns.append((index, str.strip, False))
+            elif field in converted:
+                self.columns.append((positions.get(field), converted[field], False))
+            else:
+                self.columns.append((None, None, False))
+        self.keys = [
+            (name, positions[name])
+            for name in ("country", "year", "continent")
+            if name in positions
+        ]
+
+    def parse(self, lines: Iterable[str]) -> Iterator[List[Record]]:
+        # Результат отдаётся пачками, чтобы не платить за генератор на
+        # каждой строке.
+        lines = iter(lines)
+        # Сколько строк уже прочитано: по нему считаются номера строк
+        # для reject.
+        before = 0
+        while True:
+            with _gc_paused():
+                batch = list(islice(lines, BATCH_SIZE))
+                text = "".join(batch)
+                quoted = '"' in text or "\r" in text
+                if batch and not quoted:
+                    records = self._parse_text(batch, text, before)
+            if not batch:
+                return
+            if quoted:
+                break
+            before += len(batch)
+            yield records
+
+        # Значение в кавычках может занимать несколько строк, поэтому
+        # остаток файла разбирается одним csv.reader; номер строки
+        # записи — номер её последней строки, как у csv.DictReader.
+        rows = csv.reader(chain(batch, lines))
+        numbered = ((before + rows.line_num, values) for values in rows)
+        while True:
+            with _gc_paused():
+                chunk = list(islice(numbered, BATCH_SIZE))
+                records = self._parse_rows(chunk) if chunk else []
+            if not chunk:
+                return
+            yield records
+
+    def _parse_text(self, batch: List[str], text: str, before: int) -> List[Record]:
+        width = self.width
+        commas = set(map(str.count, batch, repeat(",")))
+        if not self.complete or commas != {width - 1}:
+            return self._parse_slowly(enumerate(csv.reader(batch), before + 1))
+
+        flat = text.replace("\n", ",").split(",")
+        if len(flat) > len(batch) * width:
+            flat.pop()
+        records = self._build(lambda index: flat[index::width])
+        if records is None:
+            return self._parse_slowly(enumerate(csv.reader(batch), before + 1))
+        return records
+
+    def _parse_rows(self, chunk: List[Tuple[int, List[str]]]) -> List[Record]:
+        batch = [values for _, values in chunk]
+        if not self.complete or set(map(len, batch)) != {self.width}:
+            return self._parse_slowly(chunk)
+        table = list(zip(*batch))
+        records = self._build(table.__getitem__)
+        if records is None:
+            return self._parse_slowly(chunk)
+        return records
+
+    def _build(self, column: Column) -> Optional[List[Record]]:
+        mask: Optional[List[bool]] = None
+        if self.row_filter:
+            keys = [column(index) for _, index in self.keys]
+            mask = list(map(self._accepts, *keys))
+
+        def values(index: int) -> Sequence[str]:
+            result = column(index)
+            return result if mask is None else list(compress(result, mask))
+
+        try:
+            countries = _lookup(values(self.country), self.country_name)
+            columns: List[Iterable[Any]] = []
+            for index, convert, required in self.columns:
+                if index is None:
+                    columns.append(repeat(None if convert is None else ""))
+                elif convert is str.strip:
+                    columns.append(_lookup(values(index), self.continent_name))
+                elif required:
+                    columns.append(_lookup(values(index), convert))  # type: ignore
+                else:
+                    columns.append(_convert(values(index), convert))  # type: ignore
+        except ValueError:
+            return None
+
+        return [
+            (
+                country,
+                {
+                    "year": year,
+                    "gdp": gdp,
+                    "gdp_growth": gdp_growth,
+                    "inflation": inflation,
+                    "unemployment": unemployment,
+                    "population": population,
+                    "continent": continent,
+                },
+            )
+            for (
+                country,
+                year,
+                gdp,
+                gdp_growth,
+                inflation,
+                unemployment,
+                population,
+                continent,
+            ) in zip(countries, *columns)
+        ]
+
+    def _accepts(self, *values: str) -> bool:
+        return self.row_filter.accepts(
+            {name: value for (name, _), value in zip(self.keys, values)}
+        )
+
+    def _parse_slowly(self, batch: Iterable[Tuple[int, List[str]]]) -> List[Record]:
+        rows = (
+            (number, as_dict(self.header, values)) for number, values in batch if values
+        )
+        if self.row_filter:
+            rows = (
+                (number, row) for number, row in rows if self.row_filter.accepts(row)
+            )
+        if self.reject is None:
+            return [self.fallback(row) for _, row in rows]
+
+        records = []
+        for number, row in rows:
+            try:
+                records.append(self.fallback(row))
+            except (KeyError, ValueError) as e:
+                self.reject(number, e, row)
+        return records
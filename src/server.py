@@ -0,0 +1,415 @@
+import argparse
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from functools import partial, reduce
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import compress, repeat
+from operator import and_
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import parse_qs, urlparse
+
+from src.cli import positive_int, year_range
+from src.columnar import ColumnarData
+from src.data_reader import DataReader, _is_plain
+from src.engines import Engine
+from src.filters import RowFilter
+from src.incremental import (
+    FileMarker,
+    _complete_end,
+    _file_marker,
+    _is_append_only,
+    _read_tail,
+)
+from src.planner import run_reports
+from src.report_type import AVAILABLE_REPORTS, generate_report
+from src.reports.base import ReportOptions
+
+Stat = Tuple[int, int]
+
+
+class FileState(NamedTuple):
+    number: int
+    stat: Stat
+    # Отметка конца прочитанной части; None — файл нельзя дочитывать
+    # по смещению (сжатый, Parquet/Feather), он перечитывается целиком.
+    marker: Optional[FileMarker]
+    # Сколько строк взято из последней строки без перевода строки: они
+    # стоят после отметки и при дописывании файла читаются заново.
+    tail: int = 0
+
+
+def _stat(file_path: str) -> Stat:
+    stat = os.stat(file_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+# Блокировка «много читателей — один писатель»: запросы считаются
+# параллельно, а изменение хранилища ждёт их завершения. Ожидающий
+# писатель не пропускает вперёд новых читателей.
+class ReadWriteLock:
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+
+    @contextmanager
+    def reading(self) -> Iterator[None]:
+        with self._condition:
+            while self._writing:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        with self._condition:
+            while self._writing:
+                self._condition.wait()
+            self._writing = True
+            while self._readers:
+                self._condition.wait()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+# Данные сервера в памяти: одно колоночное хранилище на все файлы и номер
+# файла для каждой строки. Новые строки файла, в который только дописывали,
+# сначала читаются целиком в отдельное хранилище и лишь затем добавляются
+# к общему, поэтому ошибка в них не оставляет половину строк. Изменённый
+# иначе файл перечитывается, а общее хранилище собирается заново без его
+# прежних строк. Запросы считаются под блокировкой чтения, изменения
+# хранилища — под блокировкой записи, перезагрузки идут по одной.
+class Dataset:
+    def __init__(self, file_paths: List[str], reader_factory: Callable[[], DataReader]):
+        self.file_paths = file_paths
+        self.reader_factory = reader_factory
+        self.files: Dict[str, FileState] = {}
+        self.store = ColumnarData()
+        self.sources = array("H")
+        self.version = 0
+        self.loaded_at = time.time()
+        self.last_error: Optional[str] = None
+        self.lock = ReadWriteLock()
+        self._reload = threading.Lock()
+
+    def load(self) -> None:
+        with self._reload:
+            store = ColumnarData()
+            sources = array("H")
+            for index, file_path in enumerate(self.file_paths):
+                rows, self.files[file_path] = self._read_file(index, file_path)
+                store.merge(rows)
+                sources.extend(repeat(index, len(rows)))
+            with self.lock.writing():
+                self.store, self.sources = store, sources
+                self._changed()
+
+    def refresh(self) -> List[str]:
+        # При ошибке чтения в хранилище остаются прежние строки файла, а
+        # следующая проверка начнёт с того же места.
+        changed: List[str] = []
+        with self._reload:
+            try:
+                for file_path in self.file_paths:
+                    state = self.files[file_path]
+                    if _stat(file_path) == state.stat:
+                        continue
+                    self.files[file_path] = self._update_file(file_path, state)
+                    changed.append(file_path)
+            except Exception as e:
+                self.last_error = f"{file_path}: {e}"
+                return changed
+            self.last_error = None
+        return changed
+
+    def _read_file(self, index: int, file_path: str) -> Tuple[ColumnarData, FileState]:
+        stat = _stat(file_path)
+        reader = self.reader_factory()
+        if not _is_plain(file_path):
+            return reader.read_columnar([file_path]), FileState(index, stat, None)
+
+        rows, end, tail = self._read_rows(reader, file_path, 0)
+        return rows, FileState(index, stat, _file_marker(file_path, end), tail)
+
+    def _read_rows(
+        self, reader: DataReader, file_path: str, start: int
+    ) -> Tuple[ColumnarData, int, int]:
+        end = _complete_end(file_path)
+        rows = ColumnarData()
+        rows.extend(reader.iter_range(file_path, start, end))
+        tail = _read_tail(reader, file_path, end)
+        rows.extend(tail)
+        return rows, end, len(tail)
+
+    def _update_file(self, file_path: str, state: FileState) -> FileState:
+        marker = state.marker
+        if marker is None or not _is_append_only(file_path, marker):
+            rows, state = self._read_file(state.number, file_path)
+            self._replace(state.number, rows)
+            return state
+
+        stat = _stat(file_path)
+        reader = self.reader_factory()
+        rows, end, tail = self._read_rows(reader, file_path, marker["offset"])
+        if state.tail:
+            # Прежний хвост прочитан заново вместе с новыми строками.
+            self._replace(state.number, rows, self._without_tail(state))
+        elif rows:
+            with self.lock.writing():
+                self.store.merge(rows)
+                self.sources.extend(repeat(state.number, len(rows)))
+                self._changed()
+        return FileState(state.number, stat, _file_marker(file_path, end), tail)
+
+    def _without_tail(self, state: FileState) -> List[bool]:
+        keep = [True] * len(self.sources)
+        count = state.tail
+        for position in reversed(range(len(self.sources))):
+            if not count:
+                break
+            if self.sources[position] == state.number:
+                keep[position] = False
+                count -= 1
+        return keep
+
+    def _replace(
+        self, index: int, rows: ColumnarData, keep: Optional[List[bool]] = None
+    ) -> None:
+        # Новое хранилище собирается рядом со старым: меняются они только
+        # здесь, под блокировкой перезагрузки, а запросы пока считают по
+        # старому. По умолчанию убираются все прежние строки файла.
+        if keep is None:
+            keep = [source != index for source in self.sources]
+        store = self.store.select(keep)
+        sources = array("H", compress(self.sources, keep))
+        store.merge(rows)
+        sources.extend(repeat(index, len(rows)))
+        with self.lock.writing():
+            self.store, self.sources = store, sources
+            self._changed()
+
+    def _changed(self) -> None:
+        self.version += 1
+        self.loaded_at = time.time()
+
+
+def _argument(parse: Callable[[str], Any], value: str) -> Any:
+    # Параметры запроса проверяются теми же функциями, что и аргументы
+    # командной строки.
+    try:
+        return parse(value)
+    except argparse.ArgumentTypeError as e:
+        raise ValueError(str(e))
+
+
+def _query_filter(query: Dict[str, List[str]]) -> RowFilter:
+    def names(key: str) -> Optional[List[str]]:
+        values = [name for value in query.get(key, []) for name in value.split(",")]
+        return [name.strip() for name in values if name.strip()] or None
+
+    years = query.get("years")
+    return RowFilter(
+        _argument(year_range, years[-1]) if years else None,
+        names("countries"),
+        names("continents"),
+    )
+
+
+def _query_options(query: Dict[str, List[str]]) -> ReportOptions:
+    options: ReportOptions = {}
+    if "top" in query and "bottom" in query:
+        raise ValueError("Параметры top и bottom нельзя указывать вместе")
+    if "top" in query:
+        options["top"] = _argument(positive_int, query["top"][-1])
+    if "bottom" in query:
+        options["bottom"] = _argument(positive_int, query["bottom"][-1])
+    return options
+
+
+def _filter_mask(store: ColumnarData, row_filter: RowFilter) -> List[bool]:
+    # Маска строится по столбцам кодов и лет, без разбора строк в словари:
+    # условие проверяется один раз для каждого кода или года, а строки
+    # только ищут готовый ответ.
+    checks: List[Iterable[bool]] = []
+    for names, table, codes in (
+        (row_filter.countries, store.countries, store.country),
+        (row_filter.continents, store.continents, store.continent),
+    ):
+        if names:
+            allowed = [name in names for name in table.values]
+            checks.append(map(allowed.__getitem__, codes))
+    if row_filter.years:
+        years = set(filter(row_filter._year_ok, set(store.year)))
+        checks.append(map(years.__contains__, store.year))
+    return list(reduce(partial(map, and_), checks))
+
+
+def run_query(
+    dataset: Dataset, query: Dict[str, List[str]], engine: Optional[Engine] = None
+) -> Dict[str, Any]:
+    names = query.get("report")
+    if not names:
+        raise ValueError(
+            "Необходимо указать отчёт: report=" + ",".join(AVAILABLE_REPORTS)
+        )
+    names = [name for value in names for name in value.split(",") if name]
+    report_classes = generate_report(names)
+    options = _query_options(query)
+    row_filter = _query_filter(query)
+
+    # Отфильтрованная копия считается уже без блокировки, чтобы не
+    # задерживать перезагрузку.
+    with dataset.lock.reading():
+        version = dataset.version
+        store = dataset.store
+        if row_filter:
+            store = store.select(_filter_mask(store, row_filter))
+        else:
+            outcomes = run_reports(store, report_classes, engine, options=options)
+    if row_filter:
+        outcomes = run_reports(store, report_classes, engine, options=options)
+
+    reports: List[Dict[str, Any]] = []
+    for name, (_, result) in zip(names, outcomes):
+        if isinstance(result, Exception):
+            reports.append({"report": name, "error": str(result)})
+        else:
+            reports.append({"report": name, "rows": result})
+    return {"version": version, "reports": reports}
+
+
+class ReportHandler(BaseHTTPRequestHandler):
+    server: "Union[ReportServer, UnixReportServer]"
+
+    def do_GET(self) -> None:
+        started = time.perf_counter()
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        status = 200
+        body: Dict[str, Any]
+        if url.path == "/reports":
+            try:
+                body = run_query(self.server.dataset, query, self.server.engine)
+            except ValueError as e:
+                status, body = 400, {"error": str(e)}
+            except Exception as e:
+                status, body = 500, {"error": str(e)}
+        elif url.path == "/status":
+            body = self._status()
+        else:
+            status, body = 404, {"error": f"Неизвестный путь: {url.path}"}
+
+        latency = round((time.perf_counter() - started) * 1000, 3)
+        body["latency_ms"] = latency
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("X-Latency-Ms", str(latency))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _status(self) -> Dict[str, Any]:
+        dataset = self.server.dataset
+        with dataset.lock.reading():
+            return {
+                "files": dataset.file_paths,
+                "rows": len(dataset.store),
+                "version": dataset.version,
+                "loaded_at": dataset.loaded_at,
+                "last_error": dataset.last_error,
+                "reports": list(AVAILABLE_REPORTS),
+            }
+
+    def address_string(self) -> str:
+        # У Unix-сокета нет адреса клиента.
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ReportServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        dataset: Dataset,
+        engine: Optional[Engine] = None,
+        verbose: bool = False,
+    ):
+        self.dataset = dataset
+        self.engine = engine
+        self.verbose = verbose
+        super().__init__(address, ReportHandler)
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class UnixReportServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+        def __init__(
+            self,
+            path: str,
+            dataset: Dataset,
+            engine: Optional[Engine] = None,
+            verbose: bool = False,
+        ):
+            self.dataset = dataset
+            self.engine = engine
+            self.verbose = verbose
+            super().__init__(path, ReportHandler)
+
+else:  # pragma: no cover - зависит от платформы
+    UnixReportServer = None  # type: ignore
+
+
+# Опрос файлов в отдельном потоке: изменения подхватываются не позже
+# чем через interval секунд.
+class Watcher(threading.Thread):
+    def __init__(self, dataset: Dataset, interval: float):
+        super().__init__(daemon=True)
+        self.dataset = dataset
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            changed = self.dataset.refresh()
+            if self.dataset.last_error:
+                print(f"Ошибка обновления: {self.dataset.last_error}", file=sys.stderr)
+            elif changed:
+                print(f"Обновлены файлы: {', '.join(changed)}", file=sys.stderr)
+
+    def stop(self) -> None:
+        self.stopped.set()
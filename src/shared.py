@@ -0,0 +1,119 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+from src.columnar import COLUMNS, ColumnarData
+from src.engines import Engine
+from src.reports.base import BaseReport, ReportOptions, ReportResult
+
+SharedLayout = Dict[str, Any]
+
+MASK_COLUMN = "population_mask"
+
+
+# Колоночные данные в одном блоке разделяемой памяти: процессы-отчёты
+# подключаются к нему по имени и читают массивы без копирования.
+class SharedColumnarData:
+    def __init__(self, store: ColumnarData):
+        columns = [(name, getattr(store, name)) for name in COLUMNS]
+        columns.append((MASK_COLUMN, store.population_mask))
+
+        size = sum(len(column) * _itemsize(column) for _, column in columns)
+        self.memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+        buf = self.memory.buf
+        assert buf is not None
+        layout = []
+        offset = 0
+        for name, column in columns:
+            data = memoryview(column).cast("B")
+            end = offset + len(data)
+            buf[offset:end] = data
+            layout.append((name, memoryview(column).format, offset, len(data)))
+            offset = end
+
+        self.layout: SharedLayout = {
+            "name": self.memory.name,
+            "countries": store.countries.values,
+            "continents": store.continents.values,
+            "columns": layout,
+        }
+
+    def close(self) -> None:
+        self.memory.close()
+        self.memory.unlink()
+
+    def __enter__(self) -> "SharedColumnarData":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _itemsize(column: Any) -> int:
+    return memoryview(column).itemsize
+
+
+def attach(
+    layout: SharedLayout,
+) -> Tuple[shared_memory.SharedMemory, ColumnarData, List[memoryview]]:
+    memory = shared_memory.SharedMemory(name=layout["name"])
+    buf = memory.buf
+    assert buf is not None
+    store = ColumnarData()
+    for value in layout["countries"]:
+        store.countries.encode(value)
+    for value in layout["continents"]:
+        store.continents.encode(value)
+
+    views: List[memoryview] = []
+    for name, typecode, offset, size in layout["columns"]:
+        end = offset + size
+        raw = buf[offset:end]
+        view = raw.cast(typecode)
+        views.extend((view, raw))
+        setattr(store, name, view)
+    return memory, store, views
+
+
+def _generate_shared(
+    layout: SharedLayout,
+    ReportClass: Type[BaseReport],
+    engine: Optional[Engine],
+    options: ReportOptions,
+) -> Union[ReportResult, Exception]:
+    memory, store, views = attach(layout)
+    try:
+        return ReportClass(**options).generate_columnar(store, engine)
+    except Exception as e:
+        return e
+    finally:
+        del store
+        for view in views:
+            view.release()
+        memory.close()
+
+
+def run_parallel(
+    store: ColumnarData,
+    report_classes: List[Type[BaseReport]],
+    engine: Optional[Engine] = None,
+    options: Optional[ReportOptions] = None,
+) -> Dict[Type[BaseReport], Union[ReportResult, Exception]]:
+    workers = min(len(report_classes), os.cpu_count() or 1)
+    with SharedColumnarData(store) as shared:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                ReportClass: executor.submit(
+                    _generate_shared, shared.layout, ReportClass, engine, options or {}
+                )
+                for ReportClass in report_classes
+            }
+            results: Dict[Type[BaseReport], Union[ReportResult, Exception]] = {}
+            for ReportClass, future in futures.items():
+                try:
+                    results[ReportClass] = future.result()
+                except Exception as e:
+                    results[ReportClass] = e
+    return results
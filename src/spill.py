@@ -0,0 +1,184 @@
+import heapq
+import os
+import pickle
+import sys
+import tempfile
+from functools import reduce
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from src.data_reader import Row
+from src.profiling import NullProfiler, Profiler
+from src.reports.base import BaseReport, ReportOptions, StreamingReport
+from src.streaming import ReportOutcome, Slot, create_reports, feed, finalize
+
+# Сколько серий сливается за один проход; при большем числе серий
+# слияние идёт в несколько проходов.
+MERGE_FANIN = 64
+
+# Через сколько строк проверяется размер накопителей.
+CHECK_ROWS = 4096
+
+MAX_BATCH = 10_000
+
+# Место под элемент словаря групп сверх ключа и значения.
+DICT_SLOT = 64
+
+# Группа в серии: ключ и пара (номер первого появления группы, накопитель).
+Group = Tuple[Any, Tuple[int, Any]]
+
+
+def _group_size(key: Any, state: Any) -> int:
+    # Оценка памяти под группу накопителя: ключ, состояние и его элементы.
+    size = sys.getsizeof(key) + sys.getsizeof(state) + DICT_SLOT
+    if isinstance(state, (list, tuple)):
+        size += sum(map(sys.getsizeof, state))
+    return size
+
+
+# Потоковый расчёт отчётов с ограничением памяти на накопители. Строки
+# подаются в отчёты, как с --stream; когда оценка размера накопителей
+# превышает memory_limit, их группы (get_state) сбрасываются во временный
+# файл (серию) отсортированными по ключу, и накопители начинаются заново.
+# Вместе с накопителем группы сохраняется номер её первого появления: по
+# нему отчёт упорядочивает группы с равными значениями, как при одном
+# проходе. В конце серии сливаются k-путевым слиянием: частичные
+# накопители одной группы объединяются, и группы по одной подаются в
+# finalize_groups, так что вся таблица групп в памяти не собирается (с
+# top/bottom остаётся только куча). Если накопители уложились в ограничение, результат
+# считается как с --stream, без временных файлов.
+class SpillingAggregator:
+    def __init__(self, memory_limit: int, directory: Optional[str] = None):
+        self.memory_limit = memory_limit
+        self.directory = directory
+        self.runs = 0
+        # Сколько групп уже пронумеровано в предыдущих сериях.
+        self.seen = 0
+        self.group_size = 0
+        self.batch = MAX_BATCH
+
+    def run(
+        self,
+        rows: Iterable[Row],
+        report_classes: List[Type[BaseReport]],
+        options: Optional[ReportOptions] = None,
+        profiler: Optional[Profiler] = None,
+    ) -> List[ReportOutcome]:
+        profiler = profiler or NullProfiler()
+        slots = create_reports(report_classes, options)
+        with tempfile.TemporaryDirectory(prefix="spill-", dir=self.directory) as tmp:
+            runs: Dict[int, List[str]] = {}
+            rows = iter(rows)
+            while True:
+                with profiler.stage("read"):
+                    chunk = list(islice(rows, CHECK_ROWS))
+                if not chunk:
+                    break
+                feed(chunk, slots, profiler)
+                if self._size(slots) > self.memory_limit:
+                    with profiler.stage("spill"):
+                        self._spill(tmp, slots, runs)
+
+            if not runs:
+                return finalize(report_classes, slots, profiler)
+            with profiler.stage("spill"):
+                self._spill(tmp, slots, runs)
+
+            outcomes: List[ReportOutcome] = []
+            for index, (ReportClass, slot) in enumerate(zip(report_classes, slots)):
+                if isinstance(slot, Exception):
+                    outcomes.append((ReportClass, slot))
+                    continue
+                try:
+                    # Слияние серий идёт по мере выдачи групп отчёту,
+                    # поэтому входит во время его генерации.
+                    with profiler.stage(f"generate:{ReportClass.__name__}"):
+                        if index in runs:
+                            groups = self._merge(tmp, slot, runs[index])
+                            result = slot.finalize_groups(
+                                (key, number, state) for key, (number, state) in groups
+                            )
+                        else:
+                            result = slot.finalize()
+                except Exception as e:
+                    outcomes.append((ReportClass, e))
+                    continue
+                outcomes.append((ReportClass, result))
+            return outcomes
+
+    def _spillable(self, slots: List[Slot]) -> Iterator[Tuple[int, StreamingReport]]:
+        for index, slot in enumerate(slots):
+            if isinstance(slot, StreamingReport) and slot.spillable:
+                yield index, slot
+
+    def _size(self, slots: List[Slot]) -> int:
+        groups = 0
+        for _, report in self._spillable(slots):
+            count = report.groups()
+            if count and not self.group_size:
+                self.group_size = _group_size(*next(iter(report.get_state().items())))
+                # При слиянии в памяти по пачке на серию.
+                limit = self.memory_limit // self.group_size
+                self.batch = min(MAX_BATCH, max(1, limit // (MERGE_FANIN + 1)))
+            groups += count
+        return groups * self.group_size
+
+    def _spill(
+        self, directory: str, slots: List[Slot], runs: Dict[int, List[str]]
+    ) -> None:
+        for index, report in self._spillable(slots):
+            state = report.get_state()
+            if not state:
+                continue
+            # Словарь накопителя хранит группы в порядке первого появления
+            # после прошлого сброса.
+            groups = sorted(
+                (
+                    (key, (self.seen + number, group))
+                    for number, (key, group) in enumerate(state.items())
+                ),
+                key=itemgetter(0),
+            )
+            runs.setdefault(index, []).append(self._write(directory, iter(groups)))
+            self.seen += len(groups)
+            report.reset()
+        self.runs += 1
+
+    def _write(self, directory: str, groups: Iterator[Group]) -> str:
+        fd, path = tempfile.mkstemp(dir=directory, suffix=".run")
+        with os.fdopen(fd, "wb") as f:
+            while True:
+                batch = list(islice(groups, self.batch))
+                if not batch:
+                    break
+                pickle.dump(batch, f, pickle.HIGHEST_PROTOCOL)
+        return path
+
+    def _read(self, path: str) -> Iterator[Group]:
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    batch = pickle.load(f)
+                except EOFError:
+                    break
+                yield from batch
+        os.remove(path)
+
+    def _merge(
+        self, directory: str, report: StreamingReport, paths: List[str]
+    ) -> Iterator[Group]:
+        while len(paths) > MERGE_FANIN:
+            paths = [
+                self._write(
+                    directory, self._combine(report, paths[start:][:MERGE_FANIN])
+                )
+                for start in range(0, len(paths), MERGE_FANIN)
+            ]
+        return self._combine(report, paths)
+
+    def _combine(self, report: StreamingReport, paths: List[str]) -> Iterator[Group]:
+        merged = heapq.merge(*map(self._read, paths), key=itemgetter(0))
+        for key, groups in groupby(merged, key=itemgetter(0)):
+            numbers, states = zip(*(entry for _, entry in groups))
+            yield key, (min(numbers), reduce(report.combine_states, states))
@@ -0,0 +1,85 @@
+from itertools import islice
+from typing import Iterable, List, Optional, Tuple, Type, Union
+
+from src.data_reader import Row
+from src.profiling import NullProfiler, Profiler
+from src.reports.base import (
+    BaseReport,
+    ReportOptions,
+    ReportResult,
+    StreamingReport,
+)
+
+ReportOutcome = Tuple[Type[BaseReport], Union[ReportResult, Exception]]
+
+Slot = Union[StreamingReport, Exception]
+
+# Сколько строк подаётся в отчёты за раз. Отчёты обходят пачку по
+# очереди, поэтому время чтения и каждого отчёта меряется по пачкам.
+FEED_CHUNK = 4096
+
+
+def create_reports(
+    report_classes: List[Type[BaseReport]], options: Optional[ReportOptions] = None
+) -> List[Slot]:
+    return [
+        (
+            ReportClass(**(options or {}))
+            if issubclass(ReportClass, StreamingReport)
+            else ValueError("отчёт не поддерживает потоковый режим")
+        )
+        for ReportClass in report_classes
+    ]
+
+
+def feed(
+    rows: Iterable[Row], slots: List[Slot], profiler: Optional[Profiler] = None
+) -> None:
+    # Ошибка в одном отчёте не останавливает остальные.
+    profiler = profiler or NullProfiler()
+    rows = iter(rows)
+    while True:
+        with profiler.stage("read"):
+            chunk = list(islice(rows, FEED_CHUNK))
+        if not chunk:
+            return
+        for position, slot in enumerate(slots):
+            if isinstance(slot, Exception):
+                continue
+            with profiler.stage(f"generate:{type(slot).__name__}"):
+                try:
+                    add = slot.add
+                    for country, record in chunk:
+                        add(country, record)
+                except Exception as e:
+                    slots[position] = e
+
+
+def finalize(
+    report_classes: List[Type[BaseReport]],
+    slots: List[Slot],
+    profiler: Optional[Profiler] = None,
+) -> List[ReportOutcome]:
+    profiler = profiler or NullProfiler()
+    outcomes: List[ReportOutcome] = []
+    for ReportClass, slot in zip(report_classes, slots):
+        if isinstance(slot, Exception):
+            outcomes.append((ReportClass, slot))
+            continue
+        try:
+            with profiler.stage(f"generate:{ReportClass.__name__}"):
+                outcomes.append((ReportClass, slot.finalize()))
+        except Exception as e:
+            outcomes.append((ReportClass, e))
+    return outcomes
+
+
+def run_streaming(
+    rows: Iterable[Row],
+    report_classes: List[Type[BaseReport]],
+    options: Optional[ReportOptions] = None,
+    profiler: Optional[Profiler] = None,
+) -> List[ReportOutcome]:
+    slots = create_reports(report_classes, options)
+    feed(rows, slots, profiler)
+    return finalize(report_classes, slots, profiler)
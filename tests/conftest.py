@@ -0,0 +1,14 @@
+import pytest
+
+from tests.helpers import HEADER
+
+
+@pytest.fixture
+def write_csv():
+    # CSV с заголовком входных данных; newline="\r\n" — с переводами строк Windows.
+    def write(path, rows=(), newline="\n"):
+        text = (HEADER + "".join(rows)).replace("\n", newline)
+        path.write_bytes(text.encode("utf-8"))
+        return str(path)
+
+    return write
@@ -0,0 +1,16 @@
+HEADER = "country,year,gdp,gdp_growth,inflation,unemployment,population,continent\n"
+
+
+def make_record(gdp=None, year=2020, **fields):
+    # Запись с пустыми числовыми полями; нужные поля задаются аргументами.
+    record = {
+        "year": year,
+        "gdp": gdp,
+        "gdp_growth": None,
+        "inflation": None,
+        "unemployment": None,
+        "population": None,
+        "continent": "Europe",
+    }
+    record.update(fields)
+    return record
@@ -0,0 +1,113 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.arrow_reader import arrow_format, scan_arrow
+from src.data_reader import DataReader
+from tests.helpers import HEADER
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+feather = pytest.importorskip("pyarrow.feather")
+
+COLUMNS = {
+    "country": ["Spain", "Italy", "Spain", "France"],
+    "year": [2020, 2021, 2022, 2023],
+    "gdp": [1000.0, 2000.0, None, 3000.0],
+    "gdp_growth": [1.0, 2.0, 3.0, 4.0],
+    "inflation": [1.0, 2.0, 3.0, 4.0],
+    "unemployment": [1.0, 2.0, 3.0, 4.0],
+    "population": [47, 59, 48, None],
+    "continent": ["Europe", "Europe", "Europe", "Europe"],
+}
+
+
+def write_csv(path):
+    lines = [
+        ",".join("" if value is None else str(value) for value in row) + "\n"
+        for row in zip(*COLUMNS.values())
+    ]
+    path.write_text(HEADER + "".join(lines), encoding="utf-8")
+    return str(path)
+
+
+def write_parquet(path, row_group_size=None):
+    pq.write_table(pa.table(COLUMNS), str(path), row_group_size=row_group_size)
+    return str(path)
+
+
+def write_feather(path):
+    feather.write_feather(pa.table(COLUMNS), str(path))
+    return str(path)
+
+
+class TestScanArrow:
+    def test_arrow_format_by_extension(self):
+        assert arrow_format("data.PARQUET") == "parquet"
+        assert arrow_format("data.feather") == "feather"
+        assert arrow_format("data.csv") is None
+
+    @pytest.mark.parametrize(
+        "writer, name", [(write_parquet, "data.parquet"), (write_feather, "data.arrow")]
+    )
+    def test_matches_csv_reader(self, tmp_path, writer, name):
+        csv_path = write_csv(tmp_path / "data.csv")
+        arrow_path = writer(tmp_path / name)
+
+        assert DataReader().read_all_files([arrow_path]) == DataReader().read_all_files(
+            [csv_path]
+        )
+
+    def test_projects_requested_columns(self, tmp_path):
+        file_path = write_parquet(tmp_path / "data.parquet")
+
+        with patch.object(pq.ParquetFile, "read_row_group", autospec=True) as read:
+            read.return_value = pa.table({"country": [], "year": [], "gdp": []})
+            list(scan_arrow(file_path, ["gdp"]))
+
+        assert read.call_args.kwargs["columns"] == ["country", "year", "gdp"]
+
+    def test_year_range_skips_row_groups(self, tmp_path):
+        file_path = write_parquet(tmp_path / "data.parquet", row_group_size=1)
+
+        with patch.object(
+            pq.ParquetFile,
+            "read_row_group",
+            autospec=True,
+            side_effect=pq.ParquetFile.read_row_group,
+        ) as read:
+            rows = list(scan_arrow(file_path, ["gdp"], years=(2021, 2022)))
+
+        assert [(country, entry["year"]) for country, entry in rows] == [
+            ("Italy", 2021),
+            ("Spain", 2022),
+        ]
+        assert [call.args[1] for call in read.call_args_list] == [1, 2]
+
+    def test_year_range_filters_rows_inside_group(self, tmp_path):
+        file_path = write_feather(tmp_path / "data.feather")
+
+        rows = list(scan_arrow(file_path, ["gdp"], years=(2022, None)))
+
+        assert [entry["year"] for _, entry in rows] == [2022, 2023]
+
+    def test_missing_column(self, tmp_path):
+        file_path = tmp_path / "data.parquet"
+        pq.write_table(pa.table({"country": ["Spain"], "year": [2020]}), file_path)
+
+        with pytest.raises(ValueError, match="Отсутствует ожидаемый столбец"):
+            DataReader(fields=["gdp"]).read_all_files([str(file_path)])
+
+    def test_parallel_reader_reads_arrow_files(self, tmp_path):
+        file_path = write_parquet(tmp_path / "data.parquet")
+
+        result = DataReader(workers=2).read_all_files([file_path])
+
+        assert result == DataReader().read_all_files([file_path])
+
+    def test_without_pyarrow(self, tmp_path):
+        file_path = write_parquet(tmp_path / "data.parquet")
+
+        with patch("src.arrow_reader._pyarrow", return_value=None):
+            with pytest.raises(ValueError, match="требуется пакет pyarrow"):
+                DataReader().read_all_files([file_path])
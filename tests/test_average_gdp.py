@@ -143,4 +143,91 @@ class TestAverageGdpReport:
         result = report.generate(data)
         assert "country" in result[0]
         assert "avg_gdp" in result[0]
-        assert len(result[0]) == 2
\ No newline at end of file
+        assert len(result[0]) == 2
+
+    def test_streaming_add_matches_generate(self):
+        records: List[EconomicRecord] = [
+            {"year": 2020, "gdp": 100.0, "gdp_growth": 0.0, "inflation": 0.0, "unemployment": 0.0,
+             "population": 1, "continent": "Europe"},
+            {"year": 2021, "gdp": None, "gdp_growth": 0.0, "inflation": 0.0, "unemployment": 0.0,
+             "population": 1, "continent": "Europe"},
+            {"year": 2022, "gdp": 300.0, "gdp_growth": 0.0, "inflation": 0.0, "unemployment": 0.0,
+             "population": 1, "continent": "Europe"},
+        ]
+        data: Dict[str, List[EconomicRecord]] = {"Spain": records, "Italy": records[:1]}
+
+        report = AverageGdpReport()
+        for country, country_records in data.items():
+            for record in country_records:
+                report.add(country, record)
+
+        assert report.finalize() == AverageGdpReport().generate(data)
+        assert report.finalize() == [
+            {"country": "Spain", "avg_gdp": 200.0},
+            {"country": "Italy", "avg_gdp": 100.0},
+        ]
+
+    def test_generate_resets_previous_state(self):
+        data: Dict[str, List[EconomicRecord]] = {
+            "USA": [
+                {"year": 2020, "gdp": 2100.0, "gdp_growth": 0.0, "inflation": 0.0, "unemployment": 0.0,
+                 "population": 330000000, "continent": "North America"}
+            ]
+        }
+
+        report = AverageGdpReport()
+        report.generate(data)
+        result = report.generate(data)
+
+        assert result == [{"country": "USA", "avg_gdp": 2100.0}]
+
+    def test_generate_top_keeps_first_rows(self):
+        data: Dict[str, List[EconomicRecord]] = {
+            country: [
+                {"year": 2020, "gdp": gdp, "gdp_growth": 0.0, "inflation": 0.0, "unemployment": 0.0,
+                 "population": 1, "continent": "Europe"}
+            ]
+            for country, gdp in [("A", 10.0), ("B", 30.0), ("C", 20.0), ("D", 30.0)]
+        }
+
+        result = AverageGdpReport(top=2).generate(data)
+
+        assert result == AverageGdpReport().generate(data)[:2]
+        assert result == [
+            {"country": "B", "avg_gdp": 30.0},
+            {"country": "D", "avg_gdp": 30.0},
+        ]
+
+    def test_generate_bottom_returns_lowest_ascending(self):
+        data: Dict[str, List[EconomicRecord]] = {
+            country: [
+                {"year": 2020, "gdp": gdp, "gdp_growth": 0.0, "inflation": 0.0, "unemployment": 0.0,
+                 "population": 1, "continent": "Europe"}
+            ]
+            for country, gdp in [("A", 20.0), ("B", 30.0), ("C", 10.0), ("D", 20.0)]
+        }
+
+        result = AverageGdpReport(bottom=3).generate(data)
+
+        assert result == [
+            {"country": "C", "avg_gdp": 10.0},
+            {"country": "A", "avg_gdp": 20.0},
+            {"country": "D", "avg_gdp": 20.0},
+        ]
+
+    def test_approx_adds_confidence_interval(self):
+        data: Dict[str, List[EconomicRecord]] = {
+            country: [
+                {"year": 2020, "gdp": gdp, "gdp_growth": None, "inflation": None, "unemployment": None,
+                 "population": None, "continent": "Europe"}
+                for gdp in values
+            ]
+            for country, values in [("A", [100.0, 200.0, 300.0]), ("B", [50.0]), ("C", [None])]
+        }
+
+        result = AverageGdpReport(approx=True).generate(data)
+
+        assert result == [
+            {"country": "A", "avg_gdp": 200.0, "ci95": 113.16},
+            {"country": "B", "avg_gdp": 50.0, "ci95": None},
+        ]
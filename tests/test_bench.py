@@ -0,0 +1,70 @@
+import csv
+import json
+from unittest.mock import patch
+
+from src.bench import MODES, generate_csv, main, run_benchmarks
+from src.data_reader import DataReader
+
+
+class TestGenerateCsv:
+    def test_generate_is_deterministic(self, tmp_path):
+        generate_csv(str(tmp_path / "a.csv"), 500, countries=10, seed=7)
+        generate_csv(str(tmp_path / "b.csv"), 500, countries=10, seed=7)
+
+        assert (tmp_path / "a.csv").read_bytes() == (tmp_path / "b.csv").read_bytes()
+
+    def test_generate_matches_schema(self, tmp_path):
+        file_path = str(tmp_path / "a.csv")
+
+        generate_csv(file_path, 1000, countries=5, null_rate=0.2)
+
+        data = DataReader().read_all_files([file_path])
+        assert sum(len(records) for records in data.values()) == 1000
+        assert len(data) == 5
+
+    def test_generate_respects_null_rate(self, tmp_path):
+        file_path = tmp_path / "a.csv"
+
+        generate_csv(str(file_path), 2000, null_rate=0.0)
+
+        with open(file_path, encoding="utf-8") as f:
+            assert all(all(row.values()) for row in csv.DictReader(f))
+
+
+class TestRunBenchmarks:
+    def test_run_benchmarks_reports_stages(self):
+        summary = run_benchmarks([200], countries=4)
+
+        memory, stream = summary["results"]
+        assert (memory["report"], memory["mode"]) == ("average-gdp", "memory")
+        assert memory["rows"] == 200
+        assert set(memory["timings"]) == {"parse", "aggregate", "sort", "render"}
+        assert memory["peak_rss_mb"] > 0
+        assert stream["mode"] == "stream"
+        assert set(stream["timings"]) == {"parse+aggregate", "sort", "render"}
+        assert stream["peak_rss_mb"] > 0
+
+    def test_peak_rss_is_read_after_reset(self):
+        calls = []
+        with (
+            patch(
+                "src.bench.reset_peak_rss", side_effect=lambda: calls.append("reset")
+            ),
+            patch(
+                "src.bench._vm_hwm_kb",
+                side_effect=lambda: calls.append("probe") or 51200,
+            ),
+        ):
+            summary = run_benchmarks([200], countries=4)
+
+        assert calls == ["reset", "probe"] * 2
+        assert [result["peak_rss_mb"] for result in summary["results"]] == [50.0] * 2
+
+    def test_main_saves_json(self, tmp_path):
+        output = tmp_path / "bench.json"
+
+        main(["--rows", "100", "--output", str(output)])
+
+        summary = json.loads(output.read_text(encoding="utf-8"))
+        assert summary["params"]["countries"] == 200
+        assert [result["mode"] for result in summary["results"]] == MODES
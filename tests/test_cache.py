@@ -0,0 +1,117 @@
+import os
+from unittest.mock import patch
+
+from src.cache import ParsedCache
+from src.columnar import ColumnarData
+from src.data_reader import DataReader
+
+
+def make_store(rows=1):
+    store = ColumnarData()
+    for index in range(rows):
+        store.append(
+            "Spain",
+            {
+                "year": 2000 + index,
+                "gdp": 1.5,
+                "gdp_growth": None,
+                "inflation": 2.0,
+                "unemployment": None,
+                "population": None,
+                "continent": "Europe",
+            },
+        )
+    return store
+
+
+class TestParsedCache:
+    def test_store_and_load_round_trip(self, tmp_path):
+        cache = ParsedCache(str(tmp_path))
+        store = make_store(3)
+
+        cache.store("key", store)
+        loaded = cache.load("key")
+
+        assert loaded is not None
+        assert loaded.to_records() == store.to_records()
+
+    def test_load_missing_key(self, tmp_path):
+        assert ParsedCache(str(tmp_path)).load("missing") is None
+
+    def test_load_corrupted_entry(self, tmp_path):
+        (tmp_path / "broken.bin").write_bytes(b"garbage")
+
+        assert ParsedCache(str(tmp_path)).load("broken") is None
+
+    def test_load_truncated_header(self, tmp_path):
+        (tmp_path / "short.bin").write_bytes(make_store().to_bytes()[:6])
+
+        assert ParsedCache(str(tmp_path)).load("short") is None
+
+    def test_fingerprint_changes_with_content(self, tmp_path, write_csv):
+        cache = ParsedCache(str(tmp_path / "cache"))
+        file_path = write_csv(tmp_path / "a.csv", ["Spain,2020,1,1,1,1,1,Europe\n"])
+        before = cache.fingerprint(file_path)
+
+        write_csv(tmp_path / "a.csv", ["Spain,2020,2,1,1,1,1,Europe\n"])
+        os.utime(file_path, ns=(0, 0))
+
+        assert cache.fingerprint(file_path) != before
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        entry_size = len(make_store(10).to_bytes())
+        cache = ParsedCache(str(tmp_path), max_size=entry_size * 2)
+
+        cache.store("first", make_store(10))
+        cache.store("second", make_store(10))
+        os.utime(tmp_path / "first.bin", (1, 1))
+        os.utime(tmp_path / "second.bin", (2, 2))
+        cache.load("first")
+        cache.store("third", make_store(10))
+
+        assert sorted(os.listdir(tmp_path)) == ["first.bin", "third.bin"]
+
+
+class TestDataReaderCache:
+    def test_second_read_skips_parsing(self, tmp_path, write_csv):
+        file_path = write_csv(
+            tmp_path / "a.csv",
+            ["Spain,2020,1,1,1,1,1,Europe\n", "Italy,2020,,1,1,,1,Europe\n"],
+        )
+        cache = ParsedCache(str(tmp_path / "cache"))
+        expected = DataReader().read_all_files([file_path])
+
+        assert DataReader(cache=cache).read_columnar([file_path]).to_records() == (
+            expected
+        )
+        with patch.object(DataReader, "_iter_single_file") as mock_iter:
+            columnar = DataReader(cache=cache).read_columnar([file_path])
+            mock_iter.assert_not_called()
+
+        assert columnar.to_records() == expected
+
+    def test_record_and_stream_reads_bypass_cache(self, tmp_path, write_csv):
+        file_path = write_csv(tmp_path / "a.csv", ["Spain,2020,1,1,1,1,1,Europe\n"])
+        cache = ParsedCache(str(tmp_path / "cache"))
+        DataReader(cache=cache).read_columnar([file_path])
+
+        with patch.object(ParsedCache, "fingerprint") as mock_fingerprint:
+            DataReader(cache=cache).read_all_files([file_path])
+            list(DataReader(cache=cache).iter_rows([file_path]))
+            DataReader(workers=2, cache=cache).read_all_files([file_path])
+            mock_fingerprint.assert_not_called()
+
+    def test_parallel_read_does_not_fill_cache(self, tmp_path, write_csv):
+        file_path = write_csv(
+            tmp_path / "a.csv",
+            [f"Spain,{2000 + i},{i},1,1,1,1,Europe\n" for i in range(30)],
+        )
+        cache_dir = tmp_path / "cache"
+
+        parallel = DataReader(
+            workers=2, chunk_size=128, cache=ParsedCache(str(cache_dir))
+        )
+        result = parallel.read_all_files([file_path])
+
+        assert result == DataReader().read_all_files([file_path])
+        assert not cache_dir.exists()
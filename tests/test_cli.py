@@ -1,9 +1,17 @@
-from argparse import Namespace
+from argparse import ArgumentTypeError, Namespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.cli import parse_arguments, validate_arguments
+from src.cli import (
+    fraction,
+    parse_arguments,
+    parse_index_arguments,
+    positive_int,
+    size_value,
+    validate_arguments,
+    year_range,
+)
 
 
 @patch("src.cli.argparse.ArgumentParser.parse_args")
@@ -59,3 +67,100 @@ def test_parse_arguments_invalid_report_choice(
     ):
         parse_arguments()
         mock_error.assert_called()
+
+
+def test_parse_arguments_workers():
+    with patch(
+        "sys.argv",
+        ["main.py", "--files", "data.csv", "--report", "average-gdp", "--workers", "4"],
+    ):
+        args = parse_arguments()
+
+    assert args.workers == 4
+
+
+def test_parse_arguments_output_and_top():
+    argv = ["main.py", "--files", "data.csv", "--report", "average-gdp"]
+    with patch("sys.argv", argv + ["--output", "jsonl", "--top", "5"]):
+        args = parse_arguments()
+
+    assert args.output == "jsonl"
+    assert args.top == 5
+    assert args.output_file is None
+
+
+def test_parse_arguments_top_and_bottom_are_exclusive():
+    argv = ["main.py", "--files", "data.csv", "--report", "average-gdp"]
+    with patch("sys.argv", argv + ["--top", "5", "--bottom", "5"]):
+        with pytest.raises(SystemExit):
+            parse_arguments()
+
+
+def test_positive_int_rejects_zero():
+    with pytest.raises(ArgumentTypeError):
+        positive_int("0")
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("512", 512),
+        ("2K", 2048),
+        ("1.5M", 1572864),
+        ("2G", 2 * 1024**3),
+        ("1gb", 1024**3),
+    ],
+)
+def test_size_value(value, expected):
+    assert size_value(value) == expected
+
+
+@pytest.mark.parametrize("value", ["abc", "0", "-1G"])
+def test_size_value_invalid(value):
+    with pytest.raises(ArgumentTypeError):
+        size_value(value)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2015-2023", (2015, 2023)),
+        ("2020", (2020, 2020)),
+        ("2015-", (2015, None)),
+        ("-2023", (None, 2023)),
+    ],
+)
+def test_year_range(value, expected):
+    assert year_range(value) == expected
+
+
+@pytest.mark.parametrize("value", ["abc", "-", "2023-2015", "20x0"])
+def test_year_range_invalid(value):
+    with pytest.raises(ArgumentTypeError):
+        year_range(value)
+
+
+@pytest.mark.parametrize("value, expected", [("0.05", 0.05), ("1", 1.0)])
+def test_fraction(value, expected):
+    assert fraction(value) == expected
+
+
+@pytest.mark.parametrize("value", ["0", "1.5", "-0.1", "abc"])
+def test_fraction_invalid(value):
+    with pytest.raises(ArgumentTypeError):
+        fraction(value)
+
+
+def test_validate_arguments_approx_with_state():
+    args = Namespace(
+        files=["data.csv"], report=["average-gdp"], approx=0.1, state="state.json"
+    )
+    with pytest.raises(ValueError, match="--approx несовместим с --state"):
+        validate_arguments(args)
+
+
+def test_parse_index_arguments():
+    args = parse_index_arguments(["a.csv", "b.csv", "--block-size", "4M"])
+
+    assert args.files == ["a.csv", "b.csv"]
+    assert args.block_size == 4 * 1024**2
@@ -0,0 +1,120 @@
+import math
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from src.columnar import CategoryTable, ColumnarData, interner
+from src.reports.average_gdp import AverageGdpReport
+from tests.helpers import make_record
+
+
+class TestCategoryTable:
+    def test_encode_returns_same_code_for_same_value(self):
+        table = CategoryTable()
+
+        assert table.encode("Spain") == 0
+        assert table.encode("Italy") == 1
+        assert table.encode("Spain") == 0
+        assert len(table) == 2
+        assert table.decode(1) == "Italy"
+
+    def test_intern_returns_shared_string(self):
+        table = CategoryTable()
+        first = "".join(["Spa", "in"])
+        second = "".join(["Sp", "ain"])
+
+        assert table.intern(first) is first
+        assert table.intern(second) is first
+        assert table.codes == {"Spain": 0}
+
+    def test_concurrent_encode_gives_one_code_per_value(self):
+        table = CategoryTable()
+        names = [f"Country{index}" for index in range(50_000)]
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(
+                    executor.map(lambda _: list(map(table.encode, names)), range(8))
+                )
+        finally:
+            sys.setswitchinterval(interval)
+
+        assert all(codes == results[0] for codes in results)
+        assert sorted(table.values) == sorted(names)
+        assert all(table.decode(code) == name for name, code in zip(names, results[0]))
+
+    def test_interner_strips_and_reuses_names(self):
+        table = CategoryTable()
+        intern = interner(table)
+
+        name = intern(" Spain ")
+
+        assert name == "Spain"
+        assert intern("Spain") is name
+        assert intern(" Spain ") is name
+
+
+class TestColumnarData:
+    def test_append_stores_missing_values(self):
+        store = ColumnarData()
+
+        store.append("Spain", make_record())
+
+        assert len(store) == 1
+        assert math.isnan(store.gdp[0])
+        assert math.isnan(store.inflation[0])
+        assert store.population_mask[0] == 0
+        assert store.record(0)["gdp"] is None
+        assert store.record(0)["population"] is None
+
+    def test_round_trip_preserves_records(self):
+        data = {
+            "Spain": [
+                make_record(1.5, gdp_growth=0.5, population=1),
+                make_record(year=2021, population=1),
+            ],
+            "Japan": [make_record(2.5, continent="Asia")],
+        }
+
+        store = ColumnarData.from_records(data)
+
+        assert store.to_records() == data
+        assert list(store.country) == [0, 0, 1]
+        assert list(store.continent) == [0, 0, 1]
+
+    def test_select_keeps_marked_rows_and_codes(self):
+        data = {
+            "Spain": [
+                make_record(1.5, gdp_growth=0.5, population=1),
+                make_record(year=2021, population=1),
+            ],
+            "Japan": [make_record(2.5, continent="Asia")],
+        }
+        store = ColumnarData.from_records(data)
+
+        selected = store.select([False, True, True])
+
+        assert selected.to_records() == {
+            "Spain": [make_record(year=2021, population=1)],
+            "Japan": data["Japan"],
+        }
+        assert list(selected.country) == [0, 1]
+        selected.append("Italy", make_record(1.0, year=2022))
+        assert len(store.countries) == 2
+
+
+class TestAverageGdpColumnar:
+    def test_columnar_matches_records(self):
+        data = {
+            "Spain": [make_record(100.0), make_record(300.0, year=2021)],
+            "Japan": [make_record()],
+            "Italy": [make_record(150.0), make_record(year=2021)],
+        }
+
+        result = AverageGdpReport().generate_columnar(ColumnarData.from_records(data))
+
+        assert result == AverageGdpReport().generate(data)
+        assert result == [
+            {"country": "Spain", "avg_gdp": 200.0},
+            {"country": "Italy", "avg_gdp": 150.0},
+        ]
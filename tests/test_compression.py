@@ -0,0 +1,152 @@
+import bz2
+import gzip
+import lzma
+import struct
+import zlib
+from unittest.mock import patch
+
+import pytest
+
+from src import compression
+from src.compression import (
+    _bgzf_members,
+    _zstd_frames,
+    detect_compression,
+    open_text,
+)
+from src.data_reader import DataReader
+from tests.helpers import HEADER
+
+CONTENT = HEADER + "".join(
+    f"Country{index % 7},{2000 + index % 20},{index * 1.5},1.0,2.0,3.0,{index},Europe\n"
+    for index in range(500)
+)
+
+
+def bgzf_member(data):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+    body = compressor.compress(data) + compressor.flush()
+    trailer = struct.pack("<II", zlib.crc32(data), len(data))
+    size = 18 + len(body) + len(trailer)
+    header = b"\x1f\x8b\x08\x04" + b"\x00" * 4 + b"\x00\xff"
+    header += struct.pack("<HBBHH", 6, ord("B"), ord("C"), 2, size - 1)
+    return header + body + trailer
+
+
+def parts(data, count):
+    step = len(data) // count + 1
+    return [data[start:][:step] for start in range(0, len(data), step)]
+
+
+@pytest.fixture
+def plain_file(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text(CONTENT, encoding="utf-8")
+    return str(path)
+
+
+class TestDetectCompression:
+    @pytest.mark.parametrize(
+        "compress, expected",
+        [
+            (gzip.compress, "gzip"),
+            (bz2.compress, "bz2"),
+            (lzma.compress, "xz"),
+            (lambda data: data, None),
+        ],
+    )
+    def test_detects_by_magic_bytes(self, tmp_path, compress, expected):
+        path = tmp_path / "data.bin"
+        path.write_bytes(compress(CONTENT.encode("utf-8")))
+
+        assert detect_compression(str(path)) == expected
+
+
+class TestOpenText:
+    @pytest.mark.parametrize("compress", [gzip.compress, bz2.compress, lzma.compress])
+    def test_reads_compressed_file(self, tmp_path, compress):
+        path = tmp_path / "data.csv.packed"
+        path.write_bytes(compress(CONTENT.encode("utf-8")))
+
+        with open_text(str(path)) as f:
+            assert f.read() == CONTENT
+
+    def test_zstd_frames_are_decompressed_in_parallel(self, tmp_path):
+        zstandard = pytest.importorskip("zstandard")
+        compressor = zstandard.ZstdCompressor()
+        frames = [compressor.compress(part) for part in parts(CONTENT.encode(), 4)]
+        skippable = b"\x50\x2a\x4d\x18" + struct.pack("<I", 3) + b"abc"
+        data = frames[0] + skippable + b"".join(frames[1:])
+        path = tmp_path / "data.csv.zst"
+        path.write_bytes(data)
+
+        assert len(_zstd_frames(data)) == 4
+        with patch("src.compression.os.cpu_count", return_value=4):
+            with patch(
+                "src.compression._parallel_chunks",
+                wraps=compression._parallel_chunks,
+            ) as parallel:
+                with open_text(str(path)) as f:
+                    assert f.read() == CONTENT
+        parallel.assert_called_once()
+
+    def test_zstd_single_frame_streams(self, tmp_path):
+        zstandard = pytest.importorskip("zstandard")
+        path = tmp_path / "data.csv.zst"
+        path.write_bytes(zstandard.ZstdCompressor().compress(CONTENT.encode()))
+
+        with open_text(str(path)) as f:
+            assert f.read() == CONTENT
+
+    def test_bgzf_members_are_found_without_decompression(self, tmp_path):
+        data = b"".join(bgzf_member(part) for part in parts(CONTENT.encode(), 3))
+        path = tmp_path / "data.csv.gz"
+        path.write_bytes(data)
+
+        assert len(_bgzf_members(data)) == 3
+        with patch("src.compression.os.cpu_count", return_value=2):
+            with open_text(str(path)) as f:
+                assert f.read() == CONTENT
+
+    def test_plain_multi_member_gzip_reads_sequentially(self, tmp_path):
+        data = b"".join(gzip.compress(part) for part in parts(CONTENT.encode(), 3))
+        path = tmp_path / "data.csv.gz"
+        path.write_bytes(data)
+
+        assert _bgzf_members(data) is None
+        with open_text(str(path)) as f:
+            assert f.read() == CONTENT
+
+    def test_zstd_without_package(self, tmp_path):
+        path = tmp_path / "data.csv.zst"
+        path.write_bytes(b"\x28\xb5\x2f\xfd" + b"\x00" * 8)
+
+        with patch("src.compression.zstandard", None):
+            with pytest.raises(ValueError, match="требуется пакет zstandard"):
+                open_text(str(path))
+
+
+class TestCompressedDataReader:
+    @pytest.mark.parametrize("options", [{}, {"use_mmap": True}, {"workers": 2}])
+    def test_matches_plain_file(self, tmp_path, plain_file, options):
+        path = tmp_path / "data.csv.gz"
+        path.write_bytes(gzip.compress(CONTENT.encode("utf-8")))
+
+        result = DataReader(**options).read_all_files([str(path)])
+
+        assert result == DataReader().read_all_files([plain_file])
+
+    def test_iter_rows_matches_plain_file(self, tmp_path, plain_file):
+        path = tmp_path / "data.csv.xz"
+        path.write_bytes(lzma.compress(CONTENT.encode("utf-8")))
+
+        rows = list(DataReader(fields=["gdp"]).iter_rows([str(path)]))
+
+        assert rows == list(DataReader(fields=["gdp"]).iter_rows([plain_file]))
+
+    def test_incremental_range_rejects_compressed_file(self, tmp_path):
+        path = tmp_path / "data.csv.gz"
+        path.write_bytes(gzip.compress(CONTENT.encode("utf-8")))
+
+        with pytest.raises(ValueError, match="только несжатые CSV"):
+            list(DataReader().iter_range(str(path), 0, 100))
@@ -1,10 +1,16 @@
 import csv
+import gzip
+from concurrent.futures import ProcessPoolExecutor
 from io import StringIO
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from src.data_reader import DataReader
+from src.cache import ParsedCache
+from src.data_reader import DataReader, _split_file
+from src.rejects import RejectLog
+from tests.helpers import HEADER
 
 
 class TestReadAllFiles:
@@ -60,6 +66,18 @@ class TestReadAllFiles:
         assert len(result["Germany"]) == 1
         assert result["Germany"][0]["year"] == 2020
 
+    @pytest.mark.parametrize(
+        "options", [{}, {"workers": 2, "chunk_size": 256}, {"async_io": True}]
+    )
+    def test_bytes_read(self, options):
+        root = Path(__file__).parent.parent
+        files = [str(root / "economic1.csv"), str(root / "economic2.csv")]
+        reader = DataReader(**options)
+
+        reader.read_all_files(files)
+
+        assert reader.bytes_read == sum(Path(path).stat().st_size for path in files)
+
 
 class TestReadSingleFile:
     def create_mock_csv(self, data):
@@ -70,7 +88,7 @@ class TestReadSingleFile:
             writer.writerows(data)
         return output.getvalue()
 
-    @patch("builtins.open")
+    @patch("src.data_reader.open_text")
     def test_read_single_file_success(self, mock_file):
         mock_data = [
             {
@@ -100,12 +118,12 @@ class TestReadSingleFile:
 
         reader = DataReader()
 
-        with patch.object(reader, "_process_row") as mock_process_row:
-            reader._read_single_file("dummy.csv")
+        reader._read_single_file("dummy.csv")
 
-            assert mock_process_row.call_count == 2
-            mock_process_row.assert_any_call(mock_data[0])
-            mock_process_row.assert_any_call(mock_data[1])
+        assert reader.data == {
+            "Germany": [reader._parse_row(mock_data[0])[1]],
+            "France": [reader._parse_row(mock_data[1])[1]],
+        }
 
 
 class TestProcessRow:
@@ -286,3 +304,289 @@ class TestProcessRow:
 
         japan = reader.data["Japan"][0]
         assert japan["continent"] == "Asia"
+
+
+class TestParallelRead:
+    def test_parallel_matches_serial(self, tmp_path, write_csv):
+        rows = [
+            f"{country},{2000 + i},{100 + i},1.0,2.0,3.0,{10 + i},Europe\n"
+            for i in range(50)
+            for country in ("Germany", "France", "Italy")
+        ]
+        first = write_csv(tmp_path / "a.csv", rows[:90])
+        second = write_csv(tmp_path / "b.csv", rows[90:])
+
+        serial = DataReader().read_all_files([first, second])
+        parallel = DataReader(workers=2, chunk_size=256).read_all_files([first, second])
+
+        assert parallel == serial
+        assert list(parallel) == list(serial)
+
+    def test_split_file_covers_whole_file(self, tmp_path, write_csv):
+        rows = [f"Spain,{2000 + i},1,1,1,1,1,Europe\n" for i in range(20)]
+        file_path = write_csv(tmp_path / "a.csv", rows)
+
+        ranges = _split_file(file_path, 64)
+
+        assert ranges[0][1] == len(HEADER)
+        assert ranges[-1][2] == (tmp_path / "a.csv").stat().st_size
+        for (_, _, end), (_, start, _) in zip(ranges, ranges[1:]):
+            assert end == start
+
+    def test_parallel_file_not_found(self, tmp_path):
+        reader = DataReader(workers=2)
+
+        with pytest.raises(FileNotFoundError, match=r"Файл не найден: missing\.csv"):
+            reader.read_all_files(["missing.csv"])
+
+    def test_parallel_invalid_row(self, tmp_path, write_csv):
+        file_path = write_csv(tmp_path / "bad.csv", ["Spain,abc,1,1,1,1,1,Europe\n"])
+
+        with pytest.raises(ValueError, match=r"Ошибка при чтении файла .*bad\.csv"):
+            DataReader(workers=2).read_all_files([file_path])
+
+
+class TestAsyncRead:
+    def write_files(self, tmp_path, count=30):
+        paths = []
+        for i in range(count):
+            path = tmp_path / f"country{i}.csv"
+            path.write_text(
+                HEADER
+                + f"Country{i % 7},{2000 + i},{100 + i},1.0,2.0,3.0,{10 + i},Europe\n",
+                encoding="utf-8",
+            )
+            paths.append(str(path))
+        return paths
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_async_matches_serial(self, tmp_path, workers):
+        paths = self.write_files(tmp_path)
+
+        result = DataReader(
+            async_io=True, concurrency=4, workers=workers
+        ).read_all_files(paths)
+
+        serial = DataReader().read_all_files(paths)
+        assert result == serial
+        assert list(result) == list(serial)
+
+    def test_async_columnar_and_cache(self, tmp_path):
+        paths = self.write_files(tmp_path, 5)
+        cache = ParsedCache(str(tmp_path / "cache"))
+
+        first = DataReader(async_io=True, cache=cache).read_columnar(paths)
+        second = DataReader(async_io=True, cache=cache).read_columnar(paths)
+
+        expected = DataReader().read_all_files(paths)
+        assert first.to_records() == expected
+        assert second.to_records() == expected
+
+    def test_async_compressed_file(self, tmp_path):
+        path = tmp_path / "a.csv.gz"
+        path.write_bytes(
+            gzip.compress((HEADER + "Spain,2020,1,1,1,1,1,Europe\n").encode())
+        )
+
+        result = DataReader(async_io=True).read_all_files([str(path)])
+
+        assert result["Spain"][0]["gdp"] == 1.0
+
+    def test_async_reports_first_error_in_file_order(self, tmp_path):
+        paths = self.write_files(tmp_path, 3)
+        bad = tmp_path / "bad.csv"
+        bad.write_text(HEADER + "Spain,abc,1,1,1,1,1,Europe\n", encoding="utf-8")
+
+        with pytest.raises(FileNotFoundError, match=r"Файл не найден: missing\.csv"):
+            DataReader(async_io=True).read_all_files(
+                [paths[0], "missing.csv", str(bad)]
+            )
+        with pytest.raises(ValueError, match=r"Ошибка при чтении файла .*bad\.csv"):
+            DataReader(async_io=True).read_all_files([str(bad), "missing.csv"])
+
+
+class TestIterRows:
+    def test_iter_rows_yields_parsed_rows(self, tmp_path):
+        file_path = tmp_path / "a.csv"
+        file_path.write_text(
+            HEADER + "Spain,2023,1394,2.4,3.2,11.8,48,Europe\n"
+            "Spain,2022,,5.5,8.4,13.0,48, Europe \n",
+            encoding="utf-8",
+        )
+
+        rows = list(DataReader().iter_rows([str(file_path)]))
+
+        assert [country for country, _ in rows] == ["Spain", "Spain"]
+        assert rows[0][1]["gdp"] == 1394.0
+        assert rows[1][1]["gdp"] is None
+        assert rows[1][1]["continent"] == "Europe"
+
+    def test_iter_rows_does_not_store_data(self, tmp_path):
+        file_path = tmp_path / "a.csv"
+        file_path.write_text(
+            HEADER + "Spain,2023,1394,2.4,3.2,11.8,48,Europe\n",
+            encoding="utf-8",
+        )
+        reader = DataReader()
+
+        list(reader.iter_rows([str(file_path)]))
+
+        assert reader.data == {}
+
+    def test_iter_rows_file_not_found(self):
+        with pytest.raises(FileNotFoundError, match=r"Файл не найден: missing\.csv"):
+            list(DataReader().iter_rows(["missing.csv"]))
+
+
+class TestReadColumnar:
+    def test_read_columnar_matches_read_all_files(self):
+        root = Path(__file__).parent.parent
+        files = [str(root / "economic1.csv"), str(root / "economic2.csv")]
+
+        store = DataReader().read_columnar(files)
+
+        assert store.to_records() == DataReader().read_all_files(files)
+
+    def test_parallel_matches_serial_and_fills_cache(self, tmp_path):
+        root = Path(__file__).parent.parent
+        files = [str(root / "economic1.csv"), str(root / "economic2.csv")]
+        cache = ParsedCache(str(tmp_path / "cache"))
+
+        submit = ProcessPoolExecutor.submit
+
+        with patch.object(
+            ProcessPoolExecutor, "submit", autospec=True, side_effect=submit
+        ) as spy:
+            first = DataReader(workers=2, chunk_size=256, cache=cache).read_columnar(
+                files
+            )
+            chunks = spy.call_count
+            second = DataReader(workers=2, cache=cache).read_columnar(files)
+
+        serial = DataReader().read_columnar(files)
+        assert first.to_records() == second.to_records() == serial.to_records()
+        assert first.countries.values == serial.countries.values
+        assert chunks > 2
+        assert spy.call_count == chunks
+
+    def test_parallel_keeps_rejects(self, tmp_path):
+        path = tmp_path / "a.csv"
+        path.write_text(
+            HEADER
+            + "Spain,2020,1,1,1,1,1,Europe\n" * 20
+            + "Spain,abc,1,1,1,1,1,Europe\n",
+            encoding="utf-8",
+        )
+        log = RejectLog(keep=True)
+        reader = DataReader(workers=2, chunk_size=64, on_error="log", reject_log=log)
+
+        store = reader.read_columnar([str(path)])
+
+        assert len(store) == 20
+        assert [entry[1] for entry in log.entries] == [22]
+
+
+class TestFieldProjection:
+    def test_projection_converts_only_requested_fields(self):
+        reader = DataReader(fields=["gdp"])
+        row = {
+            "country": "Germany",
+            "year": "2020",
+            "gdp": "3800000000000",
+            "gdp_growth": "invalid",
+            "inflation": "1.5",
+            "unemployment": "3.2",
+            "population": "83000000",
+            "continent": "Europe",
+        }
+
+        reader._process_row(row)
+
+        record = reader.data["Germany"][0]
+        assert record["year"] == 2020
+        assert record["gdp"] == 3800000000000.0
+        assert record["gdp_growth"] is None
+        assert record["population"] is None
+        assert record["continent"] == ""
+
+    def test_projection_ignores_missing_unrequested_columns(self):
+        reader = DataReader(fields=["gdp", "continent"])
+
+        reader._process_row(
+            {"country": "Japan", "year": "2020", "gdp": "", "continent": " Asia "}
+        )
+
+        assert reader.data["Japan"][0]["gdp"] is None
+        assert reader.data["Japan"][0]["continent"] == "Asia"
+
+    def test_projection_validates_requested_fields(self):
+        reader = DataReader(fields=["gdp"])
+        row = {"country": "Japan", "year": "2020", "gdp": "abc"}
+
+        with pytest.raises(ValueError, match=r"Ошибка преобразования данных в строке"):
+            reader._process_row(row)
+
+    def test_projection_rejects_truncated_row(self):
+        reader = DataReader(fields=["gdp"])
+        row = {"country": "Italy", "year": "2001", "gdp": None, "continent": None}
+
+        with pytest.raises(ValueError, match="нет значения в столбце 'gdp'"):
+            reader._process_row(row)
+
+    def test_projection_missing_requested_column(self):
+        reader = DataReader(fields=["population"])
+
+        with pytest.raises(KeyError, match="population"):
+            reader._process_row({"country": "Japan", "year": "2020"})
+
+
+class TestIterSample:
+    @pytest.fixture
+    def data_file(self, tmp_path):
+        path = tmp_path / "data.csv"
+        path.write_text(
+            HEADER
+            + "".join(
+                f"Country{i % 9},{2000 + i % 20},{i}.5,1,2,3,{i},Europe\n"
+                for i in range(2000)
+            ),
+            encoding="utf-8",
+        )
+        return str(path)
+
+    def test_full_fraction_reads_everything(self, data_file):
+        with patch("src.data_reader.SAMPLE_BLOCK", 1024):
+            rows = list(DataReader().iter_sample([data_file], 1.0))
+
+        assert rows == list(DataReader().iter_rows([data_file]))
+
+    def test_reads_only_sampled_blocks(self, data_file):
+        reader = DataReader()
+        with patch("src.data_reader.SAMPLE_BLOCK", 1024):
+            with patch.object(reader, "iter_range", wraps=reader.iter_range) as ranges:
+                rows = list(reader.iter_sample([data_file], 0.1, seed=1))
+            again = list(DataReader().iter_sample([data_file], 0.1, seed=1))
+
+        blocks = len(_split_file(data_file, 1024))
+        assert ranges.call_count == round(blocks * 0.1)
+        assert 0 < len(rows) < 2000
+        assert rows == again
+        all_rows = list(DataReader().iter_rows([data_file]))
+        assert all(row in all_rows for row in rows[:20])
+
+    def test_small_file_reads_at_least_one_block(self, data_file):
+        rows = list(DataReader().iter_sample([data_file], 0.001))
+
+        assert len(rows) == 2000
+
+    def test_compressed_file_samples_rows(self, tmp_path, data_file):
+        path = tmp_path / "data.csv.gz"
+        path.write_bytes(gzip.compress(Path(data_file).read_bytes()))
+
+        rows = list(DataReader().iter_sample([str(path)], 0.25))
+
+        assert 350 < len(rows) < 650
+
+    def test_missing_file(self):
+        with pytest.raises(FileNotFoundError, match=r"Файл не найден: missing\.csv"):
+            list(DataReader().iter_sample(["missing.csv"], 0.5))
@@ -0,0 +1,116 @@
+import random
+from unittest.mock import patch
+
+import pytest
+
+from src.columnar import ColumnarData
+from src.engines import NumpyEngine, PythonEngine, get_engine
+from src.reports.average_gdp import AverageGdpReport
+
+
+def make_data(seed, countries=30, rows=2000):
+    rng = random.Random(seed)
+    data = {}
+    for _ in range(rows):
+        country = f"Country{rng.randrange(countries)}"
+        gdp = None if rng.random() < 0.1 else round(rng.uniform(1, 1e6), 3)
+        data.setdefault(country, []).append(
+            {
+                "year": rng.randrange(1990, 2024),
+                "gdp": gdp,
+                "gdp_growth": None,
+                "inflation": None,
+                "unemployment": None,
+                "population": None,
+                "continent": "Europe",
+            }
+        )
+    return data
+
+
+@pytest.fixture(params=["python", "numpy"])
+def engine(request):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        return NumpyEngine()
+    return PythonEngine()
+
+
+class TestEngineParity:
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_average_gdp_matches_records_path(self, engine, seed):
+        data = make_data(seed)
+
+        result = AverageGdpReport().generate_columnar(
+            ColumnarData.from_records(data), engine
+        )
+
+        assert result == AverageGdpReport().generate(data)
+
+    def test_average_gdp_ties_keep_first_seen_order(self, engine):
+        record = {
+            "year": 2020,
+            "gdp": 10.0,
+            "gdp_growth": None,
+            "inflation": None,
+            "unemployment": None,
+            "population": None,
+            "continent": "Europe",
+        }
+        data = {"B": [record], "A": [record], "C": [record]}
+
+        result = AverageGdpReport().generate_columnar(
+            ColumnarData.from_records(data), engine
+        )
+
+        assert [row["country"] for row in result] == ["B", "A", "C"]
+
+    def test_group_sum_count_skips_nan(self, engine):
+        sums, counts = engine.group_sum_count(
+            [0, 1, 0, 1], [1.0, float("nan"), 2.5, 4.0], 3
+        )
+
+        assert list(sums) == [3.5, 4.0, 0.0]
+        assert list(counts) == [2, 1, 0]
+
+    def test_argsort_desc_is_stable(self, engine):
+        assert engine.argsort_desc([1.0, 3.0, 1.0, 2.0]) == [1, 3, 0, 2]
+
+    @pytest.mark.parametrize("k", [1, 2, 3, 5, 10])
+    def test_top_k_desc_matches_argsort_prefix(self, engine, k):
+        values = [1.0, 3.0, 1.0, 2.0, 3.0, 0.5]
+
+        assert engine.top_k_desc(values, k) == engine.argsort_desc(values)[:k]
+
+    @pytest.mark.parametrize("seed", [1, 2])
+    def test_average_gdp_top_matches_full_sort(self, engine, seed):
+        data = make_data(seed)
+
+        result = AverageGdpReport(top=5).generate_columnar(
+            ColumnarData.from_records(data), engine
+        )
+
+        assert result == AverageGdpReport().generate(data)[:5]
+
+    @pytest.mark.parametrize("seed", [1, 2])
+    def test_average_gdp_bottom_matches_records_path(self, engine, seed):
+        data = make_data(seed)
+
+        result = AverageGdpReport(bottom=5).generate_columnar(
+            ColumnarData.from_records(data), engine
+        )
+
+        assert result == AverageGdpReport(bottom=5).generate(data)
+
+
+class TestGetEngine:
+    def test_get_engine_python(self):
+        assert isinstance(get_engine("python"), PythonEngine)
+
+    def test_get_engine_numpy_falls_back_without_numpy(self):
+        with patch("src.engines._numpy", return_value=None):
+            assert isinstance(get_engine("numpy"), PythonEngine)
+
+    def test_get_engine_unknown(self):
+        with pytest.raises(ValueError, match="Неизвестный движок: fortran"):
+            get_engine("fortran")
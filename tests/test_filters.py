@@ -0,0 +1,134 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.cache import ParsedCache
+from src.data_reader import DataReader
+from src.filters import RowFilter
+from src.row_parser import _convert
+
+ROWS = [
+    "Spain,2014,100,1,1,1,47,Europe\n",
+    "Spain,2015,200,1,1,1,47,Europe\n",
+    "Japan,2016,300,1,1,1,125,Asia\n",
+    "Italy,2023,400,1,1,1,59,Europe\n",
+    "Chile,2024,500,1,1,1,19,South America\n",
+]
+
+
+def keys(data):
+    return sorted(
+        (country, record["year"])
+        for country, records in data.items()
+        for record in records
+    )
+
+
+class TestRowFilter:
+    def test_empty_filter_is_inactive(self):
+        row_filter = RowFilter()
+
+        assert not row_filter
+        assert row_filter.key() == ""
+        rows = [{"country": "Spain"}]
+        assert row_filter.rows(rows) is rows
+
+    def test_accepts_checks_key_columns(self):
+        row_filter = RowFilter((2015, 2023), ["Spain"], ["Europe"])
+
+        assert row_filter.accepts(
+            {"country": " Spain", "year": "2015", "continent": "Europe"}
+        )
+        assert not row_filter.accepts(
+            {"country": "Spain", "year": "2014", "continent": "Europe"}
+        )
+        assert not row_filter.accepts(
+            {"country": "Japan", "year": "2015", "continent": "Europe"}
+        )
+
+    def test_broken_rows_are_left_to_parser(self):
+        row_filter = RowFilter((2015, None))
+
+        assert row_filter.accepts({"country": "Spain", "year": "abc"})
+
+    def test_key_depends_on_conditions(self):
+        assert RowFilter((2015, None)).key() != RowFilter((None, 2015)).key()
+        assert (
+            RowFilter(countries=["B", "A"]).key()
+            == RowFilter(countries=["A", "B"]).key()
+        )
+
+
+class TestFilteredReader:
+    @pytest.mark.parametrize(
+        "options", [{}, {"use_mmap": True}, {"workers": 2, "chunk_size": 40}]
+    )
+    def test_year_range(self, tmp_path, options, write_csv):
+        file_path = write_csv(tmp_path / "a.csv", ROWS)
+        reader = DataReader(row_filter=RowFilter((2015, 2023)), **options)
+
+        assert keys(reader.read_all_files([file_path])) == [
+            ("Italy", 2023),
+            ("Japan", 2016),
+            ("Spain", 2015),
+        ]
+
+    @pytest.mark.parametrize("use_mmap", [False, True])
+    def test_continents_without_continent_field(self, tmp_path, use_mmap, write_csv):
+        file_path = write_csv(tmp_path / "a.csv", ROWS)
+        reader = DataReader(
+            fields=["gdp"], use_mmap=use_mmap, row_filter=RowFilter(continents=["Asia"])
+        )
+
+        rows = list(reader.iter_rows([file_path]))
+
+        assert [(country, entry["gdp"]) for country, entry in rows] == [
+            ("Japan", 300.0)
+        ]
+
+    def test_rejected_rows_are_not_converted(self, tmp_path, write_csv):
+        file_path = write_csv(tmp_path / "a.csv", ROWS)
+        reader = DataReader(row_filter=RowFilter(countries=["Chile"]))
+
+        with patch("src.row_parser._convert", wraps=_convert) as convert:
+            reader.read_all_files([file_path])
+
+        assert convert.call_count > 0
+        assert all(len(call.args[0]) == 1 for call in convert.call_args_list)
+
+    def test_invalid_row_still_reports_error(self, tmp_path, write_csv):
+        file_path = write_csv(tmp_path / "a.csv", ["Spain,20x0,100,1,1,1,47,Europe\n"])
+        reader = DataReader(row_filter=RowFilter((2015, 2023)))
+
+        with pytest.raises(ValueError, match="Ошибка преобразования данных"):
+            reader.read_all_files([file_path])
+
+    def test_cache_is_keyed_by_filter(self, tmp_path, write_csv):
+        file_path = write_csv(tmp_path / "a.csv", ROWS)
+        cache = ParsedCache(str(tmp_path / "cache"))
+
+        filtered = DataReader(cache=cache, row_filter=RowFilter(countries=["Spain"]))
+        assert keys(filtered.read_columnar([file_path]).to_records()) == [
+            ("Spain", 2014),
+            ("Spain", 2015),
+        ]
+        assert len(DataReader(cache=cache).read_columnar([file_path]).to_records()) == 4
+
+    def test_parquet_year_range_uses_row_group_statistics(self, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        table = pa.table(
+            {
+                "country": ["Spain", "Japan", "Italy"],
+                "year": [2014, 2016, 2023],
+                "gdp": [100.0, 300.0, 400.0],
+                "continent": ["Europe", "Asia", "Europe"],
+            }
+        )
+        file_path = str(tmp_path / "a.parquet")
+        pq.write_table(table, file_path, row_group_size=1)
+        reader = DataReader(
+            fields=["gdp"], row_filter=RowFilter((2016, None), continents=["Europe"])
+        )
+
+        assert keys(reader.read_all_files([file_path])) == [("Italy", 2023)]
@@ -0,0 +1,168 @@
+import json
+
+import pytest
+
+from src.data_reader import DataReader
+from src.filters import RowFilter
+from src.incremental import run_incremental
+from src.reports.average_gdp import AverageGdpReport
+from tests.helpers import HEADER
+
+
+def run(file_path, state_path):
+    reader = DataReader(fields=AverageGdpReport.fields)
+    outcomes = run_incremental(
+        reader, [str(file_path)], [AverageGdpReport], str(state_path)
+    )
+    return outcomes[0][1]
+
+
+def full(file_path):
+    return AverageGdpReport().generate(DataReader().read_all_files([str(file_path)]))
+
+
+class TestRunIncremental:
+    def test_first_run_matches_full_recompute(self, tmp_path):
+        file_path = tmp_path / "a.csv"
+        file_path.write_text(
+            HEADER + "Spain,2020,100,1,1,1,1,Europe\n", encoding="utf-8"
+        )
+
+        result = run(file_path, tmp_path / "state.json")
+
+        assert result == full(file_path)
+        state = json.loads((tmp_path / "state.json").read_text(encoding="utf-8"))
+        assert state["files"][str(file_path)]["offset"] == file_path.stat().st_size
+        assert state["reports"]["AverageGdpReport"] == {"Spain": [100.0, 1]}
+
+    def test_append_reads_only_new_rows(self, tmp_path):
+        file_path = tmp_path / "a.csv"
+        file_path.write_text(
+            HEADER + "Spain,2020,100,1,1,1,1,Europe\n", encoding="utf-8"
+        )
+        run(file_path, tmp_path / "state.json")
+        offset = file_path.stat().st_size
+
+        with open(file_path, "a", encoding="utf-8") as f:
+            f.write("Spain,2021,300,1,1,1,1,Europe\nItaly,2021,50,1,1,1,1,Europe\n")
+
+        starts = []
+        original = DataReader.iter_range
+
+        def spy(self, path, start, end):
+            starts.append(start)
+            return original(self, path, start, end)
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(DataReader, "iter_range", spy)
+            result = run(file_path, tmp_path / "state.json")
+
+        # Второй вызов — пустой хвост после последнего перевода строки.
+        assert starts == [offset, file_path.stat().st_size]
+        assert result == full(file_path)
+
+    def test_unterminated_last_line_is_read_again(self, tmp_path):
+        file_path = tmp_path / "a.csv"
+        file_path.write_text(
+            HEADER + "Spain,2020,100,1,1,1,1,Europe\nItaly,2020,5", encoding="utf-8"
+        )
+
+        assert run(file_path, tmp_path / "state.json") == [
+            {"country": "Spain", "avg_gdp": 100.0},
+            {"country": "Italy", "avg_gdp": 5.0},
+        ]
+        state = json.loads((tmp_path / "state.json").read_text(encoding="utf-8"))
+        assert state["reports"]["AverageGdpReport"] == {"Spain": [100.0, 1]}
+
+        with open(file_path, "a", encoding="utf-8") as f:
+            f.write("0,1,1,1,1,Europe\n")
+
+        assert run(file_path, tmp_path / "state.json") == full(file_path)
+
+    def test_unparsable_last_line_is_deferred(self, tmp_path):
+        file_path = tmp_path / "a.csv"
+        file_path.write_text(
+            HEADER + "Spain,2020,100,1,1,1,1,Europe\nItaly,20", encoding="utf-8"
+        )
+
+        assert run(file_path, tmp_path / "state.json") == [
+            {"country": "Spain", "avg_gdp": 100.0}
+        ]
+
+        with open(file_path, "a", encoding="utf-8") as f:
+            f.write("20,50,1,1,1,1,Europe\n")
+
+        assert run(file_path, tmp_path / "state.json") == full(file_path)
+
+    def test_finished_file_without_trailing_newline(self, tmp_path):
+        file_path = tmp_path / "a.csv"
+        file_path.write_text(
+            HEADER + "Spain,2020,100,1,1,1,1,Europe\nItaly,2020,50,1,1,1,1,Europe",
+            encoding="utf-8",
+        )
+
+        assert run(file_path, tmp_path / "state.json") == full(file_path)
+        assert run(file_path, tmp_path / "state.json") == full(file_path)
+
+    def test_truncated_file_triggers_full_recompute(self, tmp_path):
+        file_path = tmp_path / "a.csv"
+        file_path.write_text(
+            HEADER + "Spain,2020,100,1,1,1,1,Europe\nItaly,2020,50,1,1,1,1,Europe\n",
+            encoding="utf-8",
+        )
+        run(file_path, tmp_path / "state.json")
+
+        file_path.write_text(HEADER + "Spain,2020,7,1,1,1,1,Europe\n", encoding="utf-8")
+
+        assert run(file_path, tmp_path / "state.json") == [
+            {"country": "Spain", "avg_gdp": 7.0}
+        ]
+
+    def test_rewritten_file_triggers_full_recompute(self, tmp_path):
+        file_path = tmp_path / "a.csv"
+        file_path.write_text(
+            HEADER + "Spain,2020,100,1,1,1,1,Europe\n", encoding="utf-8"
+        )
+        run(file_path, tmp_path / "state.json")
+
+        file_path.write_text(
+            HEADER + "Spain,2020,200,1,1,1,1,Europe\nSpain,2021,400,1,1,1,1,Europe\n",
+            encoding="utf-8",
+        )
+
+        assert run(file_path, tmp_path / "state.json") == [
+            {"country": "Spain", "avg_gdp": 300.0}
+        ]
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError, match="Файл не найден"):
+            run(tmp_path / "missing.csv", tmp_path / "state.json")
+
+    def test_corrupted_state_is_ignored(self, tmp_path):
+        file_path = tmp_path / "a.csv"
+        file_path.write_text(
+            HEADER + "Spain,2020,100,1,1,1,1,Europe\n", encoding="utf-8"
+        )
+        (tmp_path / "state.json").write_text("{broken", encoding="utf-8")
+
+        assert run(file_path, tmp_path / "state.json") == full(file_path)
+
+    def test_changed_filter_triggers_full_recompute(self, tmp_path):
+        file_path = tmp_path / "a.csv"
+        file_path.write_text(
+            HEADER
+            + "Spain,2020,100,1,1,1,1,Europe\n"
+            + "Spain,2021,300,1,1,1,1,Europe\n",
+            encoding="utf-8",
+        )
+        state_path = tmp_path / "state.json"
+        run(file_path, state_path)
+
+        reader = DataReader(
+            fields=AverageGdpReport.fields, row_filter=RowFilter(years=(2021, None))
+        )
+        outcomes = run_incremental(
+            reader, [str(file_path)], [AverageGdpReport], str(state_path)
+        )
+
+        assert outcomes[0][1] == [{"country": "Spain", "avg_gdp": 300.0}]
@@ -0,0 +1,173 @@
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.data_reader import DataReader
+from src.filters import RowFilter
+from src.index import (
+    IndexedDataReader,
+    answer_from_index,
+    build_index,
+    index_path,
+    index_ranges,
+    load_index,
+    write_index,
+)
+from src.reports.average_gdp import AverageGdpReport
+from src.reports.base import BaseReport
+
+ROWS = [
+    "Spain,2014,100,1,1,1,47,Europe\n",
+    "Spain,2015,200,1,1,1,47,Europe\n",
+    "Japan,2016,300,1,1,1,125,Asia\n",
+    "Japan,2017,,1,1,1,125,Asia\n",
+    "Italy,2023,400,1,1,1,59,Europe\n",
+    "Chile,2024,500,1,1,1,19,South America\n",
+]
+
+
+class OtherReport(BaseReport):
+    def generate(self, data):
+        return []
+
+
+class TestBuildIndex:
+    def test_groups_hold_field_aggregates(self, tmp_path, write_csv):
+        file_path = write_csv(
+            tmp_path / "a.csv", ROWS[:2] + ["Spain,2015,400,,1,1,,Europe\n"]
+        )
+
+        index = build_index(file_path)
+
+        assert index["groups"][1] == [
+            "Spain",
+            2015,
+            "Europe",
+            {
+                "gdp": [600.0, 2, 200.0, 400.0],
+                "gdp_growth": [1.0, 1, 1.0, 1.0],
+                "inflation": [2.0, 2, 1.0, 1.0],
+                "unemployment": [2.0, 2, 1.0, 1.0],
+                "population": [47, 1, 47, 47],
+            },
+        ]
+
+    def test_blocks_track_years_and_countries(self, tmp_path, write_csv):
+        file_path = write_csv(tmp_path / "a.csv", ROWS)
+
+        index = build_index(file_path, block_size=40)
+
+        assert len(index["blocks"]) > 1
+        first = index["blocks"][0]
+        assert first[2:4] == [2014, 2015]
+        assert [index["names"][code] for code in first[4]] == ["Spain"]
+
+    def test_rejects_compressed_file(self, tmp_path):
+        file_path = tmp_path / "a.csv.gz"
+        file_path.write_bytes(b"\x1f\x8b\x08\x00")
+
+        with pytest.raises(ValueError, match="только для несжатых"):
+            build_index(str(file_path))
+
+
+class TestLoadIndex:
+    def test_roundtrip(self, tmp_path, write_csv):
+        file_path = write_csv(tmp_path / "a.csv", ROWS)
+
+        index = write_index(file_path)
+
+        assert os.path.exists(index_path(file_path))
+        assert load_index(file_path) == json.loads(json.dumps(index))
+
+    def test_changed_source_invalidates_index(self, tmp_path, write_csv):
+        file_path = write_csv(tmp_path / "a.csv", ROWS)
+        write_index(file_path)
+
+        with open(file_path, "a", encoding="utf-8") as f:
+            f.write("Peru,2020,100,1,1,1,33,South America\n")
+
+        assert load_index(file_path) is None
+
+    def test_missing_or_broken_index(self, tmp_path, write_csv):
+        file_path = write_csv(tmp_path / "a.csv", ROWS)
+        assert load_index(file_path) is None
+
+        with open(index_path(file_path), "w", encoding="utf-8") as f:
+            f.write("{broken")
+        assert load_index(file_path) is None
+
+
+class TestAnswerFromIndex:
+    def test_matches_full_scan(self, tmp_path, write_csv):
+        first = write_csv(tmp_path / "a.csv", ROWS[:3])
+        second = write_csv(tmp_path / "b.csv", ROWS[3:])
+        for file_path in (first, second):
+            write_index(file_path)
+
+        outcomes = answer_from_index([first, second], [AverageGdpReport])
+
+        data = DataReader().read_all_files([first, second])
+        assert outcomes == [(AverageGdpReport, AverageGdpReport().generate(data))]
+
+    def test_applies_filter_and_options(self, tmp_path, write_csv):
+        file_path = write_csv(tmp_path / "a.csv", ROWS)
+        write_index(file_path)
+        row_filter = RowFilter((2015, 2023), continents=["Europe", "Asia"])
+
+        outcomes = answer_from_index(
+            [file_path], [AverageGdpReport], row_filter, {"top": 2}
+        )
+
+        reader = DataReader(row_filter=row_filter)
+        data = reader.read_all_files([file_path])
+        assert outcomes == [(AverageGdpReport, AverageGdpReport(top=2).generate(data))]
+
+    def test_falls_back_without_index(self, tmp_path, write_csv):
+        file_path = write_csv(tmp_path / "a.csv", ROWS)
+
+        assert answer_from_index([file_path], [AverageGdpReport]) is None
+
+    def test_falls_back_for_report_without_aggregates(self, tmp_path, write_csv):
+        file_path = write_csv(tmp_path / "a.csv", ROWS)
+        write_index(file_path)
+
+        assert answer_from_index([file_path], [OtherReport]) is None
+
+
+class TestIndexedDataReader:
+    def test_reads_only_matching_blocks(self, tmp_path, write_csv):
+        file_path = write_csv(tmp_path / "a.csv", ROWS)
+        index = write_index(file_path, block_size=40)
+        row_filter = RowFilter(countries=["Italy"])
+        reader = IndexedDataReader(row_filter=row_filter)
+
+        ranges = index_ranges(file_path, index, row_filter)
+        with patch.object(
+            IndexedDataReader, "iter_range", wraps=reader.iter_range
+        ) as iter_range:
+            result = reader.read_all_files([file_path])
+
+        assert len(ranges) == 1
+        assert iter_range.call_count == 1
+        assert reader.bytes_read == ranges[0][2] - ranges[0][1]
+        assert result == DataReader(row_filter=row_filter).read_all_files([file_path])
+
+    def test_adjacent_blocks_are_merged(self, tmp_path, write_csv):
+        file_path = write_csv(tmp_path / "a.csv", ROWS)
+        index = write_index(file_path, block_size=40)
+
+        ranges = index_ranges(file_path, index, RowFilter(countries=["Japan"]))
+
+        assert len(ranges) == 1
+
+    def test_stale_index_reads_whole_file(self, tmp_path, write_csv):
+        file_path = write_csv(tmp_path / "a.csv", ROWS)
+        write_index(file_path, block_size=40)
+        write_csv(tmp_path / "a.csv", ROWS + ["Italy,2024,800,1,1,1,59,Europe\n"])
+        row_filter = RowFilter(countries=["Italy"])
+
+        rows = list(IndexedDataReader(row_filter=row_filter).iter_rows([file_path]))
+
+        assert [entry["gdp"] for _, entry in rows] == [400.0, 800.0]
@@ -0,0 +1,116 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.data_reader import DataReader, _split_file
+from src.mmap_reader import scan_lines
+from tests.helpers import HEADER
+
+
+class TestScanLines:
+    def test_yields_header_then_lines(self, tmp_path, write_csv):
+        file_path = write_csv(
+            tmp_path / "a.csv", ["Spain,2023,1394,2.4,3.2,11.8,48,Europe\n"]
+        )
+
+        lines = list(scan_lines(file_path))
+
+        assert lines == [HEADER, "Spain,2023,1394,2.4,3.2,11.8,48,Europe\n"]
+
+    def test_handles_crlf_quotes_and_blank_lines(self, tmp_path, write_csv):
+        file_path = write_csv(
+            tmp_path / "a.csv",
+            [
+                '"Korea, Republic of",2023,1700,1,1,1,51,Asia\n',
+                "\n",
+                '"Multi\nline",2023,1,1,1,1,1,Asia\n',
+                "Spain,2023,1394,1,1,1,48,Europe\n",
+            ],
+            newline="\r\n",
+        )
+
+        rows = list(
+            DataReader(use_mmap=True, fields=["gdp", "continent"]).iter_rows(
+                [file_path]
+            )
+        )
+
+        assert [country for country, _ in rows] == [
+            "Korea, Republic of",
+            "Multi\r\nline",
+            "Spain",
+        ]
+        assert [record["continent"] for _, record in rows] == ["Asia"] * 2 + ["Europe"]
+
+    def test_missing_column(self, tmp_path):
+        file_path = tmp_path / "a.csv"
+        file_path.write_text("country,year\nSpain,2023\n", encoding="utf-8")
+
+        with pytest.raises(ValueError, match="gdp"):
+            DataReader(use_mmap=True, fields=["gdp"]).read_all_files([str(file_path)])
+
+    def test_short_row(self, tmp_path, write_csv):
+        file_path = write_csv(tmp_path / "a.csv", ["Spain,2023\n"])
+
+        with pytest.raises(ValueError, match="нет значения в столбце 'gdp'"):
+            DataReader(use_mmap=True, fields=["gdp"]).read_all_files([file_path])
+
+    def test_empty_file(self, tmp_path):
+        file_path = tmp_path / "a.csv"
+        file_path.write_bytes(b"")
+
+        assert list(scan_lines(str(file_path))) == []
+
+    def test_ranges_cover_all_rows(self, tmp_path, write_csv):
+        rows = [f"Spain,{2000 + i},{i},1,1,1,1,Europe\n" for i in range(40)]
+        file_path = write_csv(tmp_path / "a.csv", rows)
+
+        scanned = [
+            line
+            for _, start, end in _split_file(file_path, 100)
+            for line in list(scan_lines(file_path, start, end))[1:]
+        ]
+
+        assert scanned == rows
+
+    def test_uses_typed_parser(self, tmp_path, write_csv):
+        file_path = write_csv(
+            tmp_path / "a.csv", ["Spain,2023,1394,2.4,3.2,11.8,48,Europe\n"] * 10
+        )
+        reader = DataReader(use_mmap=True)
+
+        with patch.object(DataReader, "_parse_row") as parse_row:
+            result = reader.read_all_files([file_path])
+
+        assert len(result["Spain"]) == 10
+        parse_row.assert_not_called()
+
+
+class TestDataReaderMmap:
+    def test_mmap_matches_csv_reader(self, tmp_path, write_csv):
+        rows = [
+            f"Country{i % 7},{2000 + i},{i * 1.5},1,1,1,{i},Europe\n"
+            for i in range(100)
+        ]
+        rows.append("Spain,2023,,1,1,1,,Europe\n")
+        file_path = write_csv(tmp_path / "a.csv", rows)
+
+        expected = DataReader().read_all_files([file_path])
+        result = DataReader(use_mmap=True).read_all_files([file_path])
+        parallel = DataReader(workers=2, chunk_size=256, use_mmap=True).read_all_files(
+            [file_path]
+        )
+
+        assert result == expected
+        assert parallel == expected
+
+    def test_mmap_projection_leaves_other_fields_empty(self, tmp_path, write_csv):
+        file_path = write_csv(
+            tmp_path / "a.csv", ["Spain,2023,1394,2.4,3.2,11.8,48,Europe\n"]
+        )
+
+        rows = list(DataReader(use_mmap=True, fields=["gdp"]).iter_rows([file_path]))
+
+        assert rows[0][1]["gdp"] == 1394.0
+        assert rows[0][1]["inflation"] is None
+        assert rows[0][1]["population"] is None
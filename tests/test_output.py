@@ -0,0 +1,102 @@
+import csv
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.output import (
+    CsvRenderer,
+    FixedWidthRenderer,
+    JsonLinesRenderer,
+    ParquetRenderer,
+    TableRenderer,
+    create_renderer,
+)
+from src.reports.average_gdp import AverageGdpReport
+
+ROWS = [
+    {"country": "United States", "avg_gdp": 23315.081},
+    {"country": "China", "avg_gdp": 17734.0},
+]
+
+
+class TestRenderers:
+    def test_table_renderer(self, capsys):
+        TableRenderer().write(AverageGdpReport, ROWS)
+
+        output = capsys.readouterr().out
+        assert "--- Отчёт: AverageGdp ---" in output
+        assert "| United States |  23315.08 |" in output
+
+    def test_fixed_width_aligns_columns(self, tmp_path):
+        path = tmp_path / "report.txt"
+        with FixedWidthRenderer(str(path)) as renderer:
+            renderer.write(AverageGdpReport, ROWS)
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert lines[2:] == [
+            "   country         avg_gdp",
+            "-  -------------  --------",
+            "1  United States  23315.08",
+            "2  China          17734.00",
+        ]
+
+    def test_fixed_width_streams_rows_beyond_sample(self, tmp_path):
+        path = tmp_path / "report.txt"
+        rows = [{"country": f"C{i}", "avg_gdp": float(i)} for i in range(5)]
+        with patch("src.output.WIDTH_SAMPLE", 2):
+            with FixedWidthRenderer(str(path)) as renderer:
+                renderer.write(AverageGdpReport, rows)
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 4 + len(rows)
+        assert lines[-1].split() == ["5", "C4", "4.00"]
+
+    def test_csv_renderer_separates_reports(self, tmp_path):
+        path = tmp_path / "report.csv"
+        with CsvRenderer(str(path)) as renderer:
+            renderer.write(AverageGdpReport, ROWS)
+            renderer.write(AverageGdpReport, ROWS[:1])
+
+        blocks = path.read_text(encoding="utf-8").split("\n\n")
+        assert list(csv.DictReader(blocks[0].splitlines())) == [
+            {"country": "United States", "avg_gdp": "23315.081"},
+            {"country": "China", "avg_gdp": "17734.0"},
+        ]
+        assert len(blocks) == 2
+
+    def test_jsonl_renderer_adds_report_name(self, capsys):
+        JsonLinesRenderer().write(AverageGdpReport, ROWS)
+
+        lines = capsys.readouterr().out.splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {"report": "AverageGdp", **row} for row in ROWS
+        ]
+
+    def test_machine_renderer_writes_messages_to_stderr(self, capsys):
+        JsonLinesRenderer().message("Нет данных для обработки.")
+
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "Нет данных для обработки." in captured.err
+
+    def test_parquet_requires_output_file(self):
+        with pytest.raises(ValueError, match="--output-file"):
+            ParquetRenderer()
+
+    def test_parquet_roundtrip(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "report.parquet"
+        with ParquetRenderer(str(path)) as renderer:
+            renderer.write(AverageGdpReport, ROWS)
+
+        assert pq.read_table(str(path)).to_pylist() == ROWS
+
+
+class TestCreateRenderer:
+    def test_create_known_renderer(self):
+        assert isinstance(create_renderer("csv"), CsvRenderer)
+
+    def test_create_unknown_renderer(self):
+        with pytest.raises(ValueError, match="Неизвестный формат вывода: xml"):
+            create_renderer("xml")
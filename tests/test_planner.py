@@ -0,0 +1,66 @@
+from unittest.mock import patch
+
+from src.columnar import ColumnarData
+from src.planner import iter_records, run_reports
+from src.reports.average_gdp import AverageGdpReport
+from src.reports.base import BaseReport, EconomicData, ReportResult
+from tests.helpers import make_record
+
+DATA = {
+    "Spain": [make_record(10.0), make_record(30.0)],
+    "Italy": [make_record(50.0)],
+}
+
+EXPECTED = [
+    {"country": "Italy", "avg_gdp": 50.0},
+    {"country": "Spain", "avg_gdp": 20.0},
+]
+
+
+class CountReport(BaseReport):
+    def generate(self, data: EconomicData) -> ReportResult:
+        return [
+            {"country": country, "rows": len(rows)} for country, rows in data.items()
+        ]
+
+
+class BrokenReport(BaseReport):
+    def generate(self, data: EconomicData) -> ReportResult:
+        raise RuntimeError("boom")
+
+
+class TestRunReports:
+    def test_in_memory_streaming_reports_share_one_pass(self):
+        with patch("src.planner.iter_records", side_effect=iter_records) as mock_iter:
+            outcomes = run_reports(DATA, [AverageGdpReport, AverageGdpReport])
+
+        assert mock_iter.call_count == 1
+        assert outcomes == [(AverageGdpReport, EXPECTED), (AverageGdpReport, EXPECTED)]
+
+    def test_mixes_streaming_and_regular_reports_in_requested_order(self):
+        outcomes = run_reports(DATA, [CountReport, AverageGdpReport])
+
+        assert outcomes == [
+            (
+                CountReport,
+                [{"country": "Spain", "rows": 2}, {"country": "Italy", "rows": 1}],
+            ),
+            (AverageGdpReport, EXPECTED),
+        ]
+
+    def test_failing_report_is_isolated(self):
+        outcomes = run_reports(DATA, [BrokenReport, AverageGdpReport])
+
+        assert isinstance(outcomes[0][1], RuntimeError)
+        assert outcomes[1] == (AverageGdpReport, EXPECTED)
+
+    def test_row_stream_source(self):
+        outcomes = run_reports(iter_records(DATA), [AverageGdpReport, CountReport])
+
+        assert outcomes[0] == (AverageGdpReport, EXPECTED)
+        assert isinstance(outcomes[1][1], ValueError)
+
+    def test_columnar_source(self):
+        outcomes = run_reports(ColumnarData.from_records(DATA), [AverageGdpReport])
+
+        assert outcomes == [(AverageGdpReport, EXPECTED)]
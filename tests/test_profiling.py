@@ -0,0 +1,59 @@
+import json
+
+from src.profiling import NullProfiler, Profiler
+
+
+class TestProfiler:
+    def test_stage_accumulates_time(self):
+        profiler = Profiler()
+
+        with profiler.stage("read"):
+            pass
+        with profiler.stage("read"):
+            pass
+
+        assert list(profiler.timings) == ["read"]
+        assert profiler.timings["read"] >= 0
+
+    def test_counted_counts_consumed_items(self):
+        profiler = Profiler()
+
+        items = list(profiler.counted(iter(range(5)), "rows_read"))
+
+        assert items == [0, 1, 2, 3, 4]
+        assert profiler.counters["rows_read"] == 5
+
+    def test_to_json(self):
+        profiler = Profiler()
+        profiler.count("files", 2)
+        with profiler.stage("read"):
+            pass
+
+        payload = json.loads(profiler.to_json())
+
+        assert payload["counters"] == {"files": 2}
+        assert set(payload["timings"]) == {"read"}
+
+    def test_summary_lists_stages_and_counters(self):
+        profiler = Profiler()
+        profiler.count("rows_read", 3)
+        with profiler.stage("generate:AverageGdpReport"):
+            pass
+
+        summary = profiler.summary()
+
+        assert "generate:AverageGdpReport" in summary
+        assert "rows_read: 3" in summary
+
+
+class TestNullProfiler:
+    def test_null_profiler_records_nothing(self):
+        profiler = NullProfiler()
+        items = iter([1, 2])
+
+        with profiler.stage("read"):
+            profiler.count("files")
+
+        assert profiler.counted(items, "rows_read") is items
+        assert profiler.timings == {}
+        assert profiler.counters == {}
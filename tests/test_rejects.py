@@ -0,0 +1,181 @@
+import csv
+import gzip
+from unittest.mock import patch
+
+import pytest
+
+from src.data_reader import DataReader, _split_file
+from src.rejects import RejectLog
+from tests.helpers import HEADER
+
+ROWS = [
+    "Spain,2020,100,1,1,1,10,Europe\n",
+    "France,abc,200,1,1,1,20,Europe\n",
+    "Italy,2021,300,1,1,1,30,Europe\n",
+    "Chile,2021,x,1,1,1,40,South America\n",
+    "Peru,2022,500,1,1,1,50,South America\n",
+]
+
+
+@pytest.fixture
+def broken_file(tmp_path):
+    path = tmp_path / "broken.csv"
+    path.write_text(HEADER + "".join(ROWS * 20), encoding="utf-8")
+    return str(path)
+
+
+def expected_lines():
+    return [2 + 5 * block + offset for block in range(20) for offset in (1, 3)]
+
+
+class TestRejectLog:
+    def test_counts_by_file_and_summary(self):
+        log = RejectLog()
+
+        log.reject("a.csv", 2, "ошибка", {"year": "abc"})
+        log.reject("b.csv", 5, "ошибка", {"year": "x"})
+        log.reject("a.csv", 7, "ошибка", {"year": "y"})
+
+        assert log.total == 3
+        assert log.entries is None
+        assert log.summary() == "Отброшено строк: 3 (a.csv: 2, b.csv: 1)"
+
+    def test_writes_csv_file(self, tmp_path):
+        path = tmp_path / "rejects.csv"
+        log = RejectLog(str(path))
+
+        log.reject("a.csv", 2, "ошибка", {"year": "abc"})
+        log.close()
+
+        with open(path, encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows == [
+            ["file", "line", "reason", "row"],
+            ["a.csv", "2", "ошибка", '{"year": "abc"}'],
+        ]
+
+    def test_keep_collects_entries_for_extend(self):
+        worker = RejectLog(keep=True)
+        worker.reject("a.csv", None, "ошибка", {})
+        log = RejectLog()
+
+        log.extend(worker.entries)
+
+        assert log.counts == {"a.csv": 1}
+
+
+class TestLenientReading:
+    def test_fail_mode_raises(self, broken_file):
+        with pytest.raises(ValueError, match="Ошибка преобразования данных"):
+            DataReader().read_all_files([broken_file])
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {},
+            {"use_mmap": True},
+            {"workers": 2, "chunk_size": 100},
+            {"async_io": True},
+            {"async_io": True, "workers": 2},
+        ],
+    )
+    def test_skip_keeps_valid_rows(self, broken_file, options):
+        log = RejectLog()
+        reader = DataReader(on_error="skip", reject_log=log, **options)
+
+        result = reader.read_all_files([broken_file])
+
+        assert sorted(result) == ["Italy", "Peru", "Spain"]
+        assert sum(map(len, result.values())) == 60
+        assert log.counts == {broken_file: 40}
+
+    @pytest.mark.parametrize(
+        "options", [{}, {"workers": 2, "chunk_size": 100}, {"async_io": True}]
+    )
+    def test_line_numbers(self, broken_file, options):
+        log = RejectLog(keep=True)
+        reader = DataReader(on_error="log", reject_log=log, **options)
+
+        reader.read_all_files([broken_file])
+
+        assert [entry[1] for entry in log.entries] == expected_lines()
+        file_path, line, reason, row = log.entries[0]
+        assert file_path == broken_file
+        assert "Ошибка преобразования данных" in reason
+        assert '"country": "France"' in row
+
+    @pytest.mark.parametrize("quote", ["", '"'])
+    def test_only_failing_batch_is_parsed_by_rows(self, tmp_path, quote):
+        rows = [ROWS[2]] * 20 + [ROWS[1]] + [ROWS[2]] * 9
+        path = tmp_path / "data.csv"
+        path.write_text(
+            HEADER + "".join(rows).replace("Italy", f"{quote}Italy{quote}"),
+            encoding="utf-8",
+        )
+        log = RejectLog(keep=True)
+        parse_row = DataReader._parse_row
+
+        with (
+            patch("src.row_parser.BATCH_SIZE", 10),
+            patch.object(
+                DataReader, "_parse_row", autospec=True, side_effect=parse_row
+            ) as spy,
+        ):
+            result = DataReader(on_error="log", reject_log=log).read_all_files(
+                [str(path)]
+            )
+
+        assert len(result["Italy"]) == 29
+        assert [entry[1] for entry in log.entries] == [22]
+        assert spy.call_count == 10
+
+    def test_iter_rows_and_ranges(self, broken_file):
+        log = RejectLog(keep=True)
+        reader = DataReader(on_error="skip", reject_log=log)
+
+        rows = list(reader.iter_rows([broken_file]))
+        ranges = [
+            row
+            for _, start, end in _split_file(broken_file, 100)
+            for row in reader.iter_range(broken_file, start, end)
+        ]
+
+        assert len(rows) == len(ranges) == 60
+        lines = [entry[1] for entry in log.entries]
+        assert lines == expected_lines() * 2
+
+    def test_compressed_file(self, tmp_path):
+        path = tmp_path / "broken.csv.gz"
+        path.write_bytes(gzip.compress((HEADER + "".join(ROWS)).encode("utf-8")))
+        log = RejectLog(keep=True)
+
+        DataReader(on_error="skip", reject_log=log).read_all_files([str(path)])
+
+        assert [entry[1] for entry in log.entries] == [3, 5]
+
+    def test_missing_column_is_rejected(self, tmp_path):
+        path = tmp_path / "short.csv"
+        path.write_text("country,year\nSpain,2020\n", encoding="utf-8")
+        log = RejectLog(keep=True)
+
+        result = DataReader(on_error="skip", reject_log=log).read_all_files([str(path)])
+
+        assert result == {}
+        assert log.entries[0][2].startswith("Отсутствует ожидаемый столбец")
+
+    @pytest.mark.parametrize("options", [{}, {"workers": 2, "chunk_size": 40}])
+    def test_short_row_is_logged(self, tmp_path, options):
+        path = tmp_path / "short.csv"
+        path.write_text(HEADER + ROWS[0] + "Italy,2001\n" + ROWS[2], encoding="utf-8")
+        reject_path = tmp_path / "rejects.csv"
+        log = RejectLog(str(reject_path))
+
+        reader = DataReader(on_error="log", reject_log=log, fields=["gdp"], **options)
+        result = reader.read_all_files([str(path)])
+        log.close()
+
+        assert sorted(result) == ["Italy", "Spain"]
+        with open(reject_path, encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [(row["file"], row["line"]) for row in rows] == [(str(path), "3")]
+        assert "нет значения в столбце 'gdp'" in rows[0]["reason"]
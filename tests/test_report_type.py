@@ -1,6 +1,6 @@
 import pytest
 
-from src.report_type import generate_report
+from src.report_type import generate_report, required_fields
 from src.reports.average_gdp import AverageGdpReport
 from src.reports.base import BaseReport
 
@@ -45,3 +45,24 @@ def test_generate_report_returns_list_of_types():
     for cls in report_classes:
         assert isinstance(cls, type)
         assert issubclass(cls, BaseReport)
+
+
+class TestRequiredFields:
+    def test_required_fields_average_gdp(self):
+        assert required_fields([AverageGdpReport]) == ("gdp",)
+
+    def test_required_fields_union_keeps_schema_order(self):
+        class ContinentReport(BaseReport):
+            fields = ("continent", "gdp", "population")
+
+            def generate(self, data):
+                return []
+
+        assert required_fields([AverageGdpReport, ContinentReport]) == (
+            "gdp",
+            "population",
+            "continent",
+        )
+
+    def test_required_fields_empty(self):
+        assert required_fields([]) == ()
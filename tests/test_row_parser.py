@@ -0,0 +1,144 @@
+import csv
+import io
+from unittest.mock import patch
+
+import pytest
+
+from src.data_reader import DataReader
+from src.filters import RowFilter
+from tests.helpers import HEADER
+
+EXTRA_HEADER = HEADER.replace("continent", "continent,note")
+
+ROWS = [
+    "Spain,2014,100,1.5,2,3,47,Europe\n",
+    " Chile ,2015,,,,,,South America\n",
+    "Japan,2016,300,0.5,,4,125, Asia \n",
+]
+
+
+def dict_reader_rows(reader, text):
+    # Разбор по словарям, как до появления TypedRowParser.
+    rows = reader.row_filter.rows(csv.DictReader(io.StringIO(text)))
+    return [reader._parse_row(row) for row in rows]
+
+
+def typed_rows(reader, text):
+    return list(reader._parse_csv(io.StringIO(text), "data.csv"))
+
+
+def assert_same(text, **options):
+    reader = DataReader(**options)
+    assert typed_rows(reader, text) == dict_reader_rows(reader, text)
+
+
+def assert_same_error(text, **options):
+    reader = DataReader(**options)
+    with pytest.raises(Exception) as expected:
+        dict_reader_rows(reader, text)
+    with pytest.raises(type(expected.value)) as actual:
+        typed_rows(reader, text)
+    assert str(actual.value) == str(expected.value)
+
+
+class TestTypedRowParser:
+    @pytest.mark.parametrize(
+        "text",
+        [
+            HEADER + "".join(ROWS),
+            HEADER + "".join(ROWS).rstrip("\n"),
+            HEADER + '"Korea, Republic of",2014,1,1,1,1,1,Asia\n' + ROWS[0],
+            HEADER + '"Multi\nline",2014,1,1,1,1,1,Asia\n' + ROWS[1],
+            HEADER + ROWS[0].replace("\n", "\r\n") + ROWS[1],
+            HEADER + ROWS[0] + "\n" + ROWS[1],
+            HEADER + ROWS[0] + "Spain,2015,1,1,1,1,1,Europe,extra\n",
+            EXTRA_HEADER + "Spain,2014,1,,,,,Europe,\n",
+            HEADER,
+            "",
+        ],
+    )
+    def test_matches_dict_reader(self, text):
+        assert_same(text)
+
+    @pytest.mark.parametrize("fields", [["gdp"], ["population", "continent"], []])
+    def test_projection(self, fields):
+        text = "country,year,gdp,population,continent\n" + "Spain,2014,1,,Europe\n"
+        assert_same(text, fields=fields)
+
+    @pytest.mark.parametrize(
+        "row_filter",
+        [
+            RowFilter((2015, None)),
+            RowFilter(countries=["Chile"]),
+            RowFilter(continents=["Asia"]),
+        ],
+    )
+    def test_filter(self, row_filter):
+        assert_same(HEADER + "".join(ROWS), row_filter=row_filter)
+
+    def test_batches_match_single_pass(self):
+        text = HEADER + "".join(ROWS * 10)
+        with patch("src.row_parser.BATCH_SIZE", 4):
+            assert_same(text)
+            assert_same(text + '"Multi\nline",1,1,1,1,1,1,A\n' + "".join(ROWS * 3))
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            HEADER + ROWS[0] + "Spain,20x4,1,1,1,1,1,Europe\n",
+            HEADER + ROWS[0] + "Spain,2014,abc,1,1,1,1,Europe\n",
+            HEADER + ROWS[0] + "Spain,2014,1,1,1,1,1.5,Europe\n",
+            HEADER + ROWS[0] + "Spain,2014\n",
+            "country,year,gdp\n" + "Spain,2014,1\n",
+        ],
+    )
+    def test_same_errors(self, text):
+        assert_same_error(text)
+
+    @pytest.mark.parametrize(
+        "row_filter", [RowFilter(), RowFilter((2014, 2016)), RowFilter(countries=["A"])]
+    )
+    def test_empty_year_is_an_error(self, row_filter):
+        text = HEADER + ROWS[0] + "A,,1.0,1,1,1,10,Europe\n"
+
+        assert_same_error(text, row_filter=row_filter)
+        with pytest.raises(ValueError, match="Ошибка преобразования данных"):
+            typed_rows(DataReader(row_filter=row_filter), text)
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {},
+            {"fields": ["gdp"]},
+            {"fields": ["gdp"], "row_filter": RowFilter((2000, 2010))},
+            {"fields": ["gdp"], "use_mmap": True},
+        ],
+    )
+    def test_truncated_row_is_an_error(self, tmp_path, write_csv, options):
+        file_path = write_csv(tmp_path / "a.csv", [ROWS[0], "Italy,2001\n"])
+
+        with pytest.raises(ValueError, match="Italy"):
+            DataReader(**options).read_all_files([file_path])
+
+    def test_filtered_out_rows_are_not_validated(self):
+        text = HEADER + ROWS[0] + "Chile,2014,abc,1,1,1,1,South America\n"
+
+        assert typed_rows(DataReader(row_filter=RowFilter(countries=["Spain"])), text)
+
+
+class TestInterning:
+    @pytest.mark.parametrize("options", [{}, {"use_mmap": True}, {"on_error": "skip"}])
+    def test_names_are_shared_between_records(self, tmp_path, options):
+        paths = []
+        for name in ("a.csv", "b.csv"):
+            path = tmp_path / name
+            path.write_text(HEADER + "".join(ROWS * 2), encoding="utf-8")
+            paths.append(str(path))
+
+        rows = list(DataReader(**options).iter_rows(paths))
+
+        spain = [record for country, record in rows if country == "Spain"]
+        assert len(spain) == 4
+        assert len({id(country) for country, _ in rows if country == "Spain"}) == 1
+        assert len({id(record["continent"]) for record in spain}) == 1
+        assert rows[2][1]["continent"] == "Asia"
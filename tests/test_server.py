@@ -0,0 +1,330 @@
+import gzip
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from src.columnar import ColumnarData
+from src.data_reader import DataReader
+from src.filters import RowFilter
+from src.reports.average_gdp import AverageGdpReport
+from src.server import (
+    Dataset,
+    ReportServer,
+    UnixReportServer,
+    _filter_mask,
+    run_query,
+)
+from tests.helpers import HEADER
+
+ROWS = [
+    "Spain,2020,100,1,1,1,10,Europe\n",
+    "Spain,2021,300,1,1,1,10,Europe\n",
+    "Chile,2021,50,1,1,1,40,South America\n",
+    "Peru,2022,500,1,1,1,50,South America\n",
+]
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text(HEADER + "".join(ROWS), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def dataset(data_file):
+    dataset = Dataset([str(data_file)], DataReader)
+    dataset.load()
+    return dataset
+
+
+@pytest.fixture
+def server(dataset):
+    server = ReportServer(("127.0.0.1", 0), dataset)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get(server, path):
+    url = f"http://127.0.0.1:{server.server_port}{path}"
+    try:
+        with urlopen(url, timeout=10) as response:
+            return response.status, response.headers, json.load(response)
+    except HTTPError as e:
+        return e.code, e.headers, json.load(e)
+
+
+def rows(body):
+    return body["reports"][0]["rows"]
+
+
+class TestDataset:
+    def test_load(self, dataset):
+        assert len(dataset.store) == 4
+        assert dataset.version == 1
+
+    def test_unchanged_files_are_not_reloaded(self, dataset):
+        store = dataset.store
+
+        assert dataset.refresh() == []
+        assert dataset.store is store
+        assert dataset.version == 1
+
+    def test_append_reads_only_new_lines(self, dataset, data_file):
+        store = dataset.store
+        with open(data_file, "a", encoding="utf-8") as f:
+            f.write("Chile,2022,150,1,1,1,40,South America\nPeru,2023")
+
+        assert dataset.refresh() == [str(data_file)]
+        assert dataset.store is store
+        assert len(dataset.store) == 5
+        assert dataset.version == 2
+
+        with open(data_file, "a", encoding="utf-8") as f:
+            f.write(",700,1,1,1,50,South America\n")
+        dataset.refresh()
+
+        result = rows(run_query(dataset, {"report": ["average-gdp"]}))
+        assert result[0] == {"country": "Peru", "avg_gdp": 600.0}
+        assert len(dataset.store) == 6
+
+    def test_file_without_trailing_newline(self, tmp_path):
+        path = tmp_path / "nonl.csv"
+        path.write_text(HEADER + "".join(ROWS).rstrip("\n"), encoding="utf-8")
+        dataset = Dataset([str(path)], DataReader)
+
+        def full():
+            data = DataReader().read_all_files([str(path)])
+            return AverageGdpReport().generate(data)
+
+        dataset.load()
+        assert len(dataset.store) == 4
+        assert rows(run_query(dataset, {"report": ["average-gdp"]})) == full()
+
+        for text in ("\nSpain,2022,200,1,1,1,10,Eu", "rope\n"):
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(text)
+            dataset.refresh()
+
+            assert len(dataset.store) == 5
+            assert rows(run_query(dataset, {"report": ["average-gdp"]})) == full()
+        assert dataset.files[str(path)].tail == 0
+
+    def test_rewritten_file_is_read_again(self, dataset, data_file):
+        data_file.write_text(HEADER + ROWS[0], encoding="utf-8")
+
+        dataset.refresh()
+
+        assert len(dataset.store) == 1
+
+    def test_append_waits_for_running_queries(self, dataset, data_file):
+        with open(data_file, "a", encoding="utf-8") as f:
+            f.write("Chile,2022,150,1,1,1,40,South America\n")
+        refresh = threading.Thread(target=dataset.refresh)
+
+        with dataset.lock.reading():
+            refresh.start()
+            refresh.join(0.2)
+            assert refresh.is_alive()
+            assert len(dataset.store) == 4
+        refresh.join()
+
+        assert len(dataset.store) == 5
+
+    def test_rows_of_other_files_are_kept(self, tmp_path, data_file):
+        other = tmp_path / "other.csv"
+        other.write_text(HEADER + ROWS[3], encoding="utf-8")
+        dataset = Dataset([str(data_file), str(other)], DataReader)
+        dataset.load()
+        with open(other, "a", encoding="utf-8") as f:
+            f.write("Peru,2023,700,1,1,1,50,South America\n")
+        dataset.refresh()
+
+        data_file.write_text(HEADER + ROWS[2], encoding="utf-8")
+        dataset.refresh()
+
+        result = rows(run_query(dataset, {"report": ["average-gdp"]}))
+        assert result == [
+            {"country": "Peru", "avg_gdp": 600.0},
+            {"country": "Chile", "avg_gdp": 50.0},
+        ]
+        assert list(dataset.sources) == [1, 1, 0]
+
+    def test_error_keeps_previous_data(self, dataset, data_file):
+        data_file.write_text(HEADER + "Spain,abc,1,1,1,1,1,Europe\n", encoding="utf-8")
+
+        dataset.refresh()
+
+        assert "Ошибка преобразования данных" in dataset.last_error
+        assert len(dataset.store) == 4
+
+    def test_bad_appended_row_leaves_no_partial_rows(self, dataset, data_file):
+        with open(data_file, "a", encoding="utf-8") as f:
+            f.write("Spain,2030,1,1,1,1,1,Europe\n" * 5000)
+            f.write("Spain,abc,1,1,1,1,1,Europe\n")
+
+        for _ in range(3):
+            dataset.refresh()
+
+        assert dataset.last_error
+        assert len(dataset.store) == 4
+        assert dataset.version == 1
+
+    def test_compressed_file(self, tmp_path):
+        path = tmp_path / "data.csv.gz"
+        path.write_bytes(gzip.compress((HEADER + "".join(ROWS)).encode("utf-8")))
+        dataset = Dataset([str(path)], DataReader)
+        dataset.load()
+
+        path.write_bytes(gzip.compress((HEADER + ROWS[0]).encode("utf-8")))
+        dataset.refresh()
+
+        assert dataset.files[str(path)].marker is None
+        assert len(dataset.store) == 1
+
+
+class TestRunQuery:
+    def test_options_and_filters(self, dataset):
+        query = {"report": ["average-gdp"], "continents": ["South America"]}
+
+        assert rows(run_query(dataset, query)) == [
+            {"country": "Peru", "avg_gdp": 500.0},
+            {"country": "Chile", "avg_gdp": 50.0},
+        ]
+        query = {"report": ["average-gdp"], "years": ["2021-"], "bottom": ["1"]}
+        assert rows(run_query(dataset, query)) == [
+            {"country": "Chile", "avg_gdp": 50.0}
+        ]
+
+    @pytest.mark.parametrize(
+        "row_filter",
+        [
+            RowFilter((2021, None)),
+            RowFilter((None, 2021), countries=["Spain", "Peru"]),
+            RowFilter(countries=["Chile", "Unknown"], continents=["South America"]),
+            RowFilter(continents=["Asia"]),
+        ],
+    )
+    def test_filter_mask_matches_row_filter(self, dataset, row_filter):
+        store = dataset.store
+
+        mask = _filter_mask(store, row_filter)
+
+        expected = [
+            row_filter.accepts_record(country, record)
+            for country, record in store.iter_rows()
+        ]
+        assert mask == expected
+
+    def test_filtered_query_does_not_decode_rows(self, dataset):
+        query = {"report": ["average-gdp"], "countries": ["Spain"]}
+
+        with patch.object(ColumnarData, "iter_rows") as mock_iter:
+            assert rows(run_query(dataset, query)) == [
+                {"country": "Spain", "avg_gdp": 200.0}
+            ]
+            mock_iter.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            {},
+            {"report": ["unknown"]},
+            {"report": ["average-gdp"], "top": ["0"]},
+            {"report": ["average-gdp"], "top": ["1"], "bottom": ["1"]},
+        ],
+    )
+    def test_invalid_queries(self, dataset, query):
+        with pytest.raises(ValueError):
+            run_query(dataset, query)
+
+
+class TestReportServer:
+    def test_report(self, server):
+        status, headers, body = get(server, "/reports?report=average-gdp&top=1")
+
+        assert status == 200
+        assert rows(body) == [{"country": "Peru", "avg_gdp": 500.0}]
+        assert body["latency_ms"] >= 0
+        assert float(headers["X-Latency-Ms"]) == body["latency_ms"]
+
+    def test_filters_in_query(self, server):
+        _, _, body = get(server, "/reports?report=average-gdp&countries=Spain,Chile")
+
+        assert [row["country"] for row in rows(body)] == ["Spain", "Chile"]
+
+    def test_errors(self, server):
+        status, _, body = get(server, "/reports?report=unknown")
+        assert status == 400
+        assert body["error"] == "Неизвестный тип отчёта: unknown"
+
+        status, _, body = get(server, "/reports?report=average-gdp&years=abc")
+        assert status == 400
+
+        status, _, body = get(server, "/missing")
+        assert status == 404
+
+    def test_status(self, server, data_file):
+        _, _, body = get(server, "/status")
+
+        assert body["files"] == [str(data_file)]
+        assert body["rows"] == 4
+        assert body["last_error"] is None
+        assert "average-gdp" in body["reports"]
+
+    def test_concurrent_requests_during_reloads(self, server, dataset, data_file):
+        def request(_):
+            return get(server, "/reports?report=average-gdp")
+
+        def append():
+            for year in range(2030, 2050):
+                with open(data_file, "a", encoding="utf-8") as f:
+                    f.write(f"Spain,{year},200,1,1,1,10,Europe\n")
+                dataset.refresh()
+
+        writer = threading.Thread(target=append)
+        writer.start()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(request, range(64)))
+        writer.join()
+
+        for status, _, body in responses:
+            assert status == 200
+            assert {row["country"] for row in rows(body)} == {"Spain", "Chile", "Peru"}
+        assert len(dataset.store) == 24
+        _, _, body = get(server, "/reports?report=average-gdp")
+        assert body["version"] == 21
+
+
+@pytest.mark.skipif(UnixReportServer is None, reason="нет Unix-сокетов")
+class TestUnixReportServer:
+    def test_report_over_socket(self, tmp_path, dataset):
+        path = str(tmp_path / "reports.sock")
+        server = UnixReportServer(path, dataset)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(path)
+                client.sendall(
+                    b"GET /reports?report=average-gdp&top=1 HTTP/1.0\r\n\r\n"
+                )
+                response = b""
+                while chunk := client.recv(65536):
+                    response += chunk
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        head, _, payload = response.partition(b"\r\n\r\n")
+        assert head.startswith(b"HTTP/1.0 200")
+        assert rows(json.loads(payload)) == [{"country": "Peru", "avg_gdp": 500.0}]
@@ -0,0 +1,76 @@
+from src.columnar import ColumnarData
+from src.engines import PythonEngine
+from src.planner import run_reports
+from src.reports.average_gdp import AverageGdpReport
+from src.reports.base import BaseReport, EconomicData, ReportResult
+from src.shared import SharedColumnarData, attach, run_parallel
+from tests.helpers import make_record
+
+DATA = {
+    "Spain": [
+        make_record(10.0, gdp_growth=1.0, unemployment=2.0, population=5),
+        make_record(year=2021),
+    ],
+    "Italy": [make_record(50.0, population=7)],
+}
+
+
+class RowCountReport(BaseReport):
+    def generate(self, data: EconomicData) -> ReportResult:
+        return [
+            {"country": country, "rows": len(rows)} for country, rows in data.items()
+        ]
+
+
+class BrokenReport(BaseReport):
+    def generate(self, data: EconomicData) -> ReportResult:
+        raise RuntimeError("boom")
+
+
+class TestSharedColumnarData:
+    def test_attach_reads_same_data(self):
+        store = ColumnarData.from_records(DATA)
+
+        with SharedColumnarData(store) as shared:
+            memory, attached, views = attach(shared.layout)
+            try:
+                assert attached.to_records() == DATA
+            finally:
+                del attached
+                for view in views:
+                    view.release()
+                memory.close()
+
+    def test_empty_store(self):
+        with SharedColumnarData(ColumnarData()) as shared:
+            memory, attached, views = attach(shared.layout)
+            assert len(attached) == 0
+            for view in views:
+                view.release()
+            memory.close()
+
+
+class TestRunParallel:
+    def test_matches_sequential_results(self):
+        store = ColumnarData.from_records(DATA)
+        report_classes = [AverageGdpReport, RowCountReport]
+
+        results = run_parallel(store, report_classes, PythonEngine())
+
+        assert results[AverageGdpReport] == AverageGdpReport().generate(DATA)
+        assert results[RowCountReport] == RowCountReport().generate(DATA)
+
+    def test_failing_report_is_isolated_and_order_kept(self):
+        store = ColumnarData.from_records(DATA)
+
+        outcomes = run_reports(
+            store, [RowCountReport, BrokenReport, AverageGdpReport], parallel=True
+        )
+
+        assert [cls for cls, _ in outcomes] == [
+            RowCountReport,
+            BrokenReport,
+            AverageGdpReport,
+        ]
+        assert isinstance(outcomes[1][1], RuntimeError)
+        assert outcomes[2][1] == AverageGdpReport().generate(DATA)
@@ -0,0 +1,100 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.data_reader import DataReader
+from src.reports.average_gdp import AverageGdpReport
+from src.spill import SpillingAggregator
+from src.streaming import run_streaming
+from tests.helpers import HEADER
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text(
+        HEADER
+        + "".join(
+            f"Country{index % 300},{2000 + index % 20},{index * 1.5},1,2,3,{index},Europe\n"
+            for index in range(3000)
+        ),
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def rows(data_file):
+    return DataReader(fields=["gdp"]).iter_rows([data_file])
+
+
+def by_country(outcomes):
+    return [sorted(result, key=lambda row: row["country"]) for _, result in outcomes]
+
+
+class TestSpillingAggregator:
+    def test_fits_in_memory_without_runs(self, tmp_path, data_file):
+        aggregator = SpillingAggregator(1024**3, str(tmp_path))
+
+        outcomes = aggregator.run(rows(data_file), [AverageGdpReport])
+
+        assert outcomes == run_streaming(rows(data_file), [AverageGdpReport])
+        assert aggregator.runs == 0
+
+    @pytest.mark.parametrize("fanin", [64, 3])
+    def test_spills_and_merges_partial_states(self, tmp_path, data_file, fanin):
+        aggregator = SpillingAggregator(4096, str(tmp_path))
+
+        with patch("src.spill.MERGE_FANIN", fanin), patch("src.spill.CHECK_ROWS", 100):
+            outcomes = aggregator.run(rows(data_file), [AverageGdpReport])
+
+        expected = run_streaming(rows(data_file), [AverageGdpReport])
+        assert by_country(outcomes) == by_country(expected)
+        assert len(outcomes[0][1]) == 300
+        assert aggregator.runs > 3
+        assert os.listdir(tmp_path) == ["data.csv"]
+
+    @pytest.mark.parametrize("options", [{"top": 5}, {"bottom": 3}])
+    def test_top_and_bottom(self, tmp_path, data_file, options):
+        aggregator = SpillingAggregator(4096, str(tmp_path))
+
+        with patch("src.spill.CHECK_ROWS", 100):
+            outcomes = aggregator.run(rows(data_file), [AverageGdpReport], options)
+
+        assert outcomes == run_streaming(rows(data_file), [AverageGdpReport], options)
+        assert aggregator.runs > 1
+
+    @pytest.mark.parametrize("options", [{}, {"top": 5}, {"bottom": 5}])
+    def test_ties_keep_first_seen_order(self, tmp_path, options):
+        path = tmp_path / "ties.csv"
+        path.write_text(
+            HEADER
+            + "".join(
+                f"C{299 - index % 300:03},2000,5,1,1,1,1,Europe\n"
+                for index in range(3000)
+            ),
+            encoding="utf-8",
+        )
+        aggregator = SpillingAggregator(4096, str(tmp_path))
+
+        with patch("src.spill.CHECK_ROWS", 100):
+            outcomes = aggregator.run(rows(str(path)), [AverageGdpReport], options)
+
+        expected = run_streaming(rows(str(path)), [AverageGdpReport], options)
+        assert outcomes == expected
+        assert expected[0][1][0]["country"] == "C299"
+        assert aggregator.runs > 1
+
+    def test_report_errors_are_kept(self, tmp_path, data_file):
+        aggregator = SpillingAggregator(4096, str(tmp_path))
+
+        with (
+            patch("src.spill.CHECK_ROWS", 100),
+            patch.object(
+                AverageGdpReport, "combine_states", side_effect=ValueError("сбой")
+            ),
+        ):
+            outcomes = aggregator.run(rows(data_file), [AverageGdpReport])
+
+        assert isinstance(outcomes[0][1], ValueError)
+        assert os.listdir(tmp_path) == ["data.csv"]
@@ -0,0 +1,95 @@
+from typing import List
+
+from src.profiling import Profiler
+from src.reports.average_gdp import AverageGdpReport
+from src.reports.base import BaseReport, EconomicData, ReportResult, StreamingReport
+from src.streaming import run_streaming
+from tests.helpers import make_record
+
+
+class FailingReport(StreamingReport):
+    def reset(self) -> None:
+        pass
+
+    def add(self, country, record) -> None:
+        raise RuntimeError("boom")
+
+    def finalize(self) -> ReportResult:
+        return []
+
+    def get_state(self):
+        return None
+
+    def set_state(self, state) -> None:
+        pass
+
+
+class InMemoryReport(BaseReport):
+    def generate(self, data: EconomicData) -> ReportResult:
+        return []
+
+
+class TestRunStreaming:
+    def test_run_streaming_single_pass(self):
+        rows = iter([("Spain", make_record(10.0)), ("Italy", make_record(30.0))])
+
+        outcomes = run_streaming(rows, [AverageGdpReport])
+
+        assert outcomes == [
+            (
+                AverageGdpReport,
+                [
+                    {"country": "Italy", "avg_gdp": 30.0},
+                    {"country": "Spain", "avg_gdp": 10.0},
+                ],
+            )
+        ]
+
+    def test_run_streaming_isolates_failing_report(self):
+        rows = [("Spain", make_record(10.0))]
+        report_classes: List = [FailingReport, AverageGdpReport]
+
+        outcomes = run_streaming(rows, report_classes)
+
+        assert isinstance(outcomes[0][1], RuntimeError)
+        assert outcomes[1] == (
+            AverageGdpReport,
+            [{"country": "Spain", "avg_gdp": 10.0}],
+        )
+
+    def test_run_streaming_rejects_non_streaming_report(self):
+        outcomes = run_streaming([], [InMemoryReport, AverageGdpReport])
+
+        assert isinstance(outcomes[0][1], ValueError)
+        assert outcomes[1] == (AverageGdpReport, [])
+
+    def test_run_streaming_passes_bottom_option(self):
+        rows = [
+            ("Spain", make_record(10.0)),
+            ("Italy", make_record(30.0)),
+            ("France", make_record(20.0)),
+        ]
+
+        outcomes = run_streaming(rows, [AverageGdpReport], {"bottom": 2})
+
+        assert outcomes == [
+            (
+                AverageGdpReport,
+                [
+                    {"country": "Spain", "avg_gdp": 10.0},
+                    {"country": "France", "avg_gdp": 20.0},
+                ],
+            )
+        ]
+
+    def test_run_streaming_times_reading_and_each_report(self):
+        rows = [("Spain", make_record(10.0))] * 10_000
+        profiler = Profiler()
+
+        run_streaming(iter(rows), [FailingReport, AverageGdpReport], None, profiler)
+
+        assert set(profiler.timings) == {
+            "read",
+            "generate:FailingReport",
+            "generate:AverageGdpReport",
+        }